@@ -0,0 +1,102 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+from propertys.cache import property_response_cache
+from rest_framework.test import APIClient
+
+from ...runner import build_endpoints, measure_endpoint
+from ...seed import seed_data
+
+
+class Command(BaseCommand):
+    """Benchmark API endpoints against seeded data.
+
+    A separate test database is created, seeded and destroyed, so the
+    configured database is never modified. Postcode lookups are resolved from
+    seeded postcodes in the local geocoding index.
+
+    Usage: ./manage.py benchmark_api [--properties N] [--iterations N]
+    """
+
+    help = (
+        "Record query counts, p50/p95 latency and response size for each "
+        "API endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sellers", type=int, default=200)
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--properties", type=int, default=5000)
+        parser.add_argument("--bookmarks-per-user", type=int, default=20)
+        parser.add_argument("--follows-per-user", type=int, default=5)
+        parser.add_argument("--notes-per-user", type=int, default=5)
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Number of timed requests per endpoint.",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_database_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write("Seeding data...")
+            data = seed_data(
+                sellers=options["sellers"],
+                users=options["users"],
+                properties=options["properties"],
+                bookmarks_per_user=options["bookmarks_per_user"],
+                follows_per_user=options["follows_per_user"],
+                notes_per_user=options["notes_per_user"],
+            )
+            self.run_benchmarks(data, options["iterations"])
+        finally:
+            connection.creation.destroy_test_db(old_database_name, verbosity=0)
+            teardown_test_environment()
+
+    def run_benchmarks(self, data, iterations):
+        anonymous_client = APIClient()
+        authenticated_client = APIClient()
+        authenticated_client.force_authenticate(data["users"][0])
+        property_response_cache.reset_stats()
+
+        row_format = "{:<32}{:>8}{:>10}{:>10}{:>10}{:>10}"
+        self.stdout.write(
+            row_format.format(
+                "endpoint", "status", "queries", "p50 ms", "p95 ms", "bytes"
+            )
+        )
+        for endpoint in build_endpoints(data):
+            client = (
+                authenticated_client
+                if endpoint["authenticated"]
+                else anonymous_client
+            )
+            result = measure_endpoint(
+                client, endpoint["url"], iterations, endpoint["cached"]
+            )
+            self.stdout.write(
+                row_format.format(
+                    endpoint["name"],
+                    result["status"],
+                    result["queries"],
+                    f"{result['p50_ms']:.1f}",
+                    f"{result['p95_ms']:.1f}",
+                    result["bytes"],
+                )
+            )
+
+        stats = property_response_cache.stats()
+        if stats["hits"] and stats["misses"]:
+            self.stdout.write(
+                f"Property response cache: {stats['hits']} hits, "
+                f"{stats['misses']} misses (hit ratio "
+                f"{stats['hit_ratio']:.2f}), mean hit "
+                f"{stats['mean_hit_ms']:.1f} ms, mean miss "
+                f"{stats['mean_miss_ms']:.1f} ms"
+            )
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from ...query_plans import analyze, explain_filter_combinations
+from ...seed import seed_data
+
+
+class Command(BaseCommand):
+    """Record the query plans of the standard property filter combinations
+    against seeded data.
+
+    A separate test database is created, seeded and destroyed, so the
+    configured database is never modified. Fails if any plan scans the whole
+    property table rather than using an index.
+
+    Usage: ./manage.py benchmark_query_plans [--properties N]
+    """
+
+    help = (
+        "Record the query plans (and indexes used) of the standard property "
+        "filter combinations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sellers", type=int, default=200)
+        parser.add_argument("--properties", type=int, default=100000)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_database_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write("Seeding data...")
+            seed_data(
+                sellers=options["sellers"],
+                users=0,
+                properties=options["properties"],
+            )
+            analyze()
+            results = explain_filter_combinations()
+        finally:
+            connection.creation.destroy_test_db(old_database_name, verbosity=0)
+            teardown_test_environment()
+
+        for result in results:
+            params = "&".join(
+                f"{key}={value}" for key, value in result["params"].items()
+            )
+            self.stdout.write(f"{result['name']} ({params or 'no filters'})")
+            self.stdout.write(
+                "  indexes: " + (", ".join(result["indexes"]) or "none")
+            )
+            for line in result["plan"].splitlines():
+                self.stdout.write(f"  | {line}")
+
+        table_scans = [
+            result["name"] for result in results if result["table_scan"]
+        ]
+        if table_scans:
+            raise CommandError(
+                "Filter combinations scanning the property table: "
+                + ", ".join(table_scans)
+            )
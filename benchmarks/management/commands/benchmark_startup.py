@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...startup import measure_startup
+
+
+class Command(BaseCommand):
+    """Benchmark startup, importing the URLconf in a new Python process.
+
+    Fails if importing the URLconf queries the database, as this slows every
+    worker start and requires the database tables to exist.
+
+    Usage: ./manage.py benchmark_startup
+    """
+
+    help = "Record the time and queries made importing the URLconf."
+
+    def handle(self, *args, **options):
+        result = measure_startup()
+        self.stdout.write(f"django.setup(): {result['setup_ms']:.1f} ms")
+        self.stdout.write(f"URLconf import: {result['urlconf_ms']:.1f} ms")
+        self.stdout.write(f"Queries: {len(result['queries'])}")
+        for sql in result["queries"]:
+            self.stdout.write(f"  {sql}")
+        if result["error"]:
+            raise CommandError(
+                f"Importing the URLconf failed: {result['error']}"
+            )
+        if result["queries"]:
+            raise CommandError("Importing the URLconf queried the database.")
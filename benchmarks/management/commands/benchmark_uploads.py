@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...uploads import MAX_VALIDATION_MEMORY_KB, measure_uploads
+
+
+class Command(BaseCommand):
+    """Benchmark image upload validation, recording the peak memory and time
+    per upload for typical photos, images at the size limits and files that
+    must be rejected (including a decompression bomb). Decoding each upload
+    is measured for comparison.
+
+    Fails if validating any upload needs more than MAX_VALIDATION_MEMORY_KB,
+    as validation must not decode images.
+
+    Usage: ./manage.py benchmark_uploads [--iterations N]
+    """
+
+    help = "Record the peak memory and time to validate image uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Uploads processed per sample, to time.",
+        )
+
+    def handle(self, *args, **options):
+        results = measure_uploads(iterations=options["iterations"])
+        self.stdout.write(
+            f"{'sample':<30} {'mode':<9} {'size':>9} {'peak':>10} "
+            f"{'time':>10}  result"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['name']:<30} {result['mode']:<9} "
+                f"{result['size'] / 1024:>7.0f}KB "
+                f"{result['peak_kb'] / 1024:>8.1f}MB "
+                f"{result['mean_ms']:>8.1f}ms  {result['result']}"
+            )
+
+        failures = [
+            result["name"]
+            for result in results
+            if result["mode"] == "validate"
+            and result["peak_kb"] > MAX_VALIDATION_MEMORY_KB
+        ]
+        if failures:
+            raise CommandError(
+                "Validating these uploads needed more than "
+                f"{MAX_VALIDATION_MEMORY_KB // 1024}MB: {', '.join(failures)}"
+            )
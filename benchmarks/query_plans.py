@@ -0,0 +1,103 @@
+import re
+
+from django.db import connection
+from propertys.filters import CustomPropertyFilters
+from propertys.models import Property
+from rest_framework.settings import api_settings
+
+# Standard filter combinations of the property list (query parameters of
+# CustomPropertyFilters), each ordered newest first as in PropertyListView.
+FILTER_COMBINATIONS = [
+    ("newest", {}),
+    ("active", {"is_sold_stc": "false"}),
+    ("price range", {"price_min": "200000", "price_max": "300000"}),
+    (
+        "active price range",
+        {
+            "is_sold_stc": "false",
+            "price_min": "200000",
+            "price_max": "300000",
+        },
+    ),
+    ("property type", {"property_type": "cottage"}),
+    (
+        "active property type",
+        {"property_type": "cottage", "is_sold_stc": "false"},
+    ),
+    (
+        "bedrooms and price",
+        {
+            "bedrooms_min": "3",
+            "bedrooms_max": "3",
+            "price_min": "200000",
+            "price_max": "300000",
+        },
+    ),
+    (
+        "active with garden and parking",
+        {"is_sold_stc": "false", "has_garden": "true", "has_parking": "true"},
+    ),
+]
+
+
+def get_property_indexes():
+    """Return the names of the indexes on the property table."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Property._meta.db_table
+        )
+    return {
+        name
+        for name, constraint in constraints.items()
+        if constraint["index"] and not constraint["primary_key"]
+    }
+
+
+def is_table_scan(plan):
+    """Return whether a query plan reads the whole property table, rather
+    than using an index.
+    """
+    table_scan = re.compile(
+        rf"\b(SCAN|Seq Scan on) {Property._meta.db_table}\b(?! USING)"
+    )
+    return any(table_scan.search(line) for line in plan.splitlines())
+
+
+def analyze():
+    """Update the database statistics used by the query planner, e.g. after
+    seeding data.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def explain_filter_combinations():
+    """Record the query plan of a page of properties for each standard filter
+    combination.
+
+    Returns:
+        list: A dict per combination of 'name', 'params', 'plan' (as
+        returned by the database), 'indexes' (names of the property indexes
+        in the plan) and 'table_scan' (whether the plan scans the table).
+    """
+    property_indexes = get_property_indexes()
+    page_size = api_settings.PAGE_SIZE
+    results = []
+    for name, params in FILTER_COMBINATIONS:
+        queryset = CustomPropertyFilters(
+            params, queryset=Property.objects.order_by("-created_at")
+        ).qs
+        # The page fetched by CountOptionalPagination
+        plan = queryset[: page_size + 1].explain()
+        results.append(
+            {
+                "name": name,
+                "params": params,
+                "plan": plan,
+                "indexes": sorted(
+                    index for index in property_indexes if index in plan
+                ),
+                "table_scan": is_table_scan(plan),
+            }
+        )
+    return results
@@ -0,0 +1,175 @@
+import time
+from math import ceil
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from propertys.cache import property_response_cache
+from rest_framework.settings import api_settings
+
+
+def build_endpoints(data):
+    """Return the endpoints benchmarked for seeded data.
+
+    Each endpoint is a dict of 'name', 'url', 'authenticated' (request made
+    as a seeded non-seller user), 'paginated' and 'cached' (responses served
+    from the response cache).
+    """
+    property_id = data["properties"][0].id
+    seller_profile_id = data["sellers"][0].profile.id
+    search_postcode = data["postcodes"][0].postcode
+    # A page half way through the property list
+    deep_page = max(1, len(data["properties"]) // (2 * api_settings.PAGE_SIZE))
+    return [
+        {
+            "name": "property list",
+            "url": "/property/",
+            "authenticated": False,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "property list (authenticated)",
+            "url": "/property/",
+            "authenticated": True,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "property list (deep page)",
+            "url": f"/property/?page={deep_page}",
+            "authenticated": False,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "property list (cursor)",
+            "url": "/property/?pagination=cursor",
+            "authenticated": False,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "property list (cached)",
+            "url": "/property/",
+            "authenticated": False,
+            "paginated": True,
+            "cached": True,
+        },
+        {
+            "name": "property search",
+            "url": f"/property/?postcode={search_postcode}&radius=5",
+            "authenticated": True,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "property keyword search",
+            "url": "/property/?q=benchmark+cottage+garden",
+            "authenticated": True,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "property search (cached)",
+            "url": f"/property/?postcode={search_postcode}&radius=5",
+            "authenticated": False,
+            "paginated": True,
+            "cached": True,
+        },
+        {
+            "name": "property detail",
+            "url": f"/property/{property_id}/",
+            "authenticated": True,
+            "paginated": False,
+            "cached": False,
+        },
+        {
+            "name": "property feed",
+            "url": (
+                "/property/?property_feed_for_profile="
+                f"{data['users'][0].profile.id}"
+            ),
+            "authenticated": True,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "profile list",
+            "url": "/profiles/",
+            "authenticated": False,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "profile list (authenticated)",
+            "url": "/profiles/",
+            "authenticated": True,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "profile detail",
+            "url": f"/profiles/{seller_profile_id}/",
+            "authenticated": True,
+            "paginated": False,
+            "cached": False,
+        },
+        {
+            "name": "bookmark list",
+            "url": "/bookmarks/",
+            "authenticated": True,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "follower list",
+            "url": "/followers/",
+            "authenticated": True,
+            "paginated": True,
+            "cached": False,
+        },
+        {
+            "name": "note list",
+            "url": "/notes/",
+            "authenticated": True,
+            "paginated": True,
+            "cached": False,
+        },
+    ]
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    rank = max(ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def measure_endpoint(client, url, iterations=20, cached=False):
+    """Request an endpoint repeatedly, after a warm up request.
+
+    Unless 'cached', the property response cache is invalidated before each
+    request, so the view is measured rather than the cache.
+
+    Returns:
+        dict: Response 'status', number of 'queries' (per request), 'p50_ms'
+        and 'p95_ms' latency and serialized response size in 'bytes'.
+    """
+    client.get(url)
+
+    durations = []
+    for _ in range(iterations):
+        if not cached:
+            property_response_cache.bump_generation()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.get(url)
+            durations.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "status": response.status_code,
+        "queries": len(queries),
+        "p50_ms": percentile(durations, 50),
+        "p95_ms": percentile(durations, 95),
+        "bytes": len(response.content),
+    }
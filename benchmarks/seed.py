@@ -0,0 +1,164 @@
+import random
+
+from bookmarks.models import Bookmark
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from feeds.models import FeedEntry
+from followers.models import Follower
+from notes.models import Note
+from profiles.models import Profile
+from propertys.geohash import encode
+from propertys.models import Postcode, Property
+from propertys.search import rebuild_search_index
+
+BENCHMARK_PASSWORD = "benchmarkPa$$w0rd!"
+
+# Centre of the area properties are seeded around (central London).
+ORIGIN_LATITUDE = 51.5074
+ORIGIN_LONGITUDE = -0.1278
+
+
+def seed_postcodes(count=90, rng=None):
+    """Create postcodes ('BM10AA' to 'BM99AA') in the local geocoding index,
+    so postcode lookups never reach the external API.
+
+    Returns:
+        list: Postcode model instances.
+    """
+    rng = rng or random.Random(0)
+    postcodes = [
+        Postcode(
+            postcode=f"BM{area}{sector}AA",
+            latitude=ORIGIN_LATITUDE + rng.uniform(-0.2, 0.2),
+            longitude=ORIGIN_LONGITUDE + rng.uniform(-0.3, 0.3),
+        )
+        for area in range(1, 10)
+        for sector in range(10)
+    ][:count]
+    Postcode.objects.bulk_create(postcodes, ignore_conflicts=True)
+    return postcodes
+
+
+def seed_data(
+    sellers=200,
+    users=2000,
+    properties=5000,
+    bookmarks_per_user=20,
+    follows_per_user=5,
+    notes_per_user=5,
+    postcodes=90,
+    seed=0,
+):
+    """Seed the database with benchmark data.
+
+    Objects are created with bulk_create, so model signals are not sent
+    (bookmark counts are recounted once the bookmarks are created, and the
+    search index and feeds rebuilt once the properties and followers are
+    created).
+    Users are created with profiles and share the password
+    BENCHMARK_PASSWORD.
+
+    Returns:
+        dict: The seeded 'sellers', 'users', 'properties' and 'postcodes'.
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+    password = make_password(BENCHMARK_PASSWORD)
+
+    User.objects.bulk_create(
+        [
+            User(
+                username=f"benchmark_seller_{i}",
+                password=password,
+                is_seller=True,
+            )
+            for i in range(sellers)
+        ]
+        + [
+            User(username=f"benchmark_user_{i}", password=password)
+            for i in range(users)
+        ],
+        batch_size=1000,
+    )
+    Profile.objects.bulk_create(
+        [
+            Profile(owner=user)
+            for user in User.objects.filter(username__startswith="benchmark_")
+        ],
+        batch_size=1000,
+    )
+    seller_objs = list(
+        User.objects.filter(
+            username__startswith="benchmark_seller_"
+        ).select_related("profile")
+    )
+    user_objs = list(
+        User.objects.filter(
+            username__startswith="benchmark_user_"
+        ).select_related("profile")
+    )
+
+    postcodes = seed_postcodes(count=postcodes, rng=rng)
+    property_objs = []
+    for i in range(properties):
+        postcode = rng.choice(postcodes)
+        latitude = postcode.latitude + rng.uniform(-0.005, 0.005)
+        longitude = postcode.longitude + rng.uniform(-0.005, 0.005)
+        property_objs.append(
+            Property(
+                owner=rng.choice(seller_objs),
+                property_number=i,
+                street_name="Benchmark Street",
+                locality="Benchmark Locality",
+                city="London",
+                postcode=postcode.postcode,
+                description="Benchmark property description. " * 20,
+                price=rng.randrange(100000, 1000000, 5000),
+                property_type=rng.choice(Property.property_type_choices)[0],
+                num_bedrooms=rng.randint(1, 6),
+                num_bathrooms=rng.randint(1, 3),
+                has_garden=rng.random() < 0.5,
+                has_parking=rng.random() < 0.5,
+                is_sold_stc=rng.random() < 0.1,
+                latitude=latitude,
+                longitude=longitude,
+                geohash=encode(latitude, longitude),
+                geocode_status=Property.GEOCODED,
+            )
+        )
+    Property.objects.bulk_create(property_objs, batch_size=1000)
+    rebuild_search_index()
+    property_objs = list(
+        Property.objects.filter(street_name="Benchmark Street")
+    )
+
+    bookmarks = []
+    follows = []
+    notes = []
+    for user in user_objs:
+        for property in rng.sample(
+            property_objs, min(bookmarks_per_user, len(property_objs))
+        ):
+            bookmarks.append(Bookmark(owner=user, property=property))
+        for seller in rng.sample(
+            seller_objs, min(follows_per_user, len(seller_objs))
+        ):
+            follows.append(Follower(owner=user, followed=seller))
+        for property in rng.sample(
+            property_objs, min(notes_per_user, len(property_objs))
+        ):
+            notes.append(
+                Note(owner=user, property=property, content="Benchmark note")
+            )
+    Bookmark.objects.bulk_create(bookmarks, batch_size=1000)
+    Property.objects.recount_bookmarks()
+    Follower.objects.bulk_create(follows, batch_size=1000)
+    FeedEntry.objects.rebuild()
+    Note.objects.bulk_create(notes, batch_size=1000)
+
+    return {
+        "sellers": seller_objs,
+        "users": user_objs,
+        "properties": property_objs,
+        "postcodes": postcodes,
+    }
@@ -0,0 +1,73 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+
+# Run in a new Python process, so modules are imported from scratch. SQLite
+# databases are replaced with an empty in-memory database so that queries
+# made while importing are recorded without touching the configured database.
+STARTUP_SCRIPT = """
+import json
+import time
+
+start = time.perf_counter()
+
+import django
+
+django.setup()
+
+from django.db import connections
+from django.urls import get_resolver
+
+queries = []
+
+
+def record_query(execute, sql, params, many, context):
+    queries.append(sql)
+    return execute(sql, params, many, context)
+
+
+for connection in connections.all():
+    if connection.vendor == "sqlite":
+        connection.settings_dict["NAME"] = ":memory:"
+    connection.execute_wrappers.append(record_query)
+
+setup_ms = (time.perf_counter() - start) * 1000
+error = None
+try:
+    # Imports the URLconf and the views (and their filters and serializers)
+    get_resolver().url_patterns
+except Exception as exc:
+    error = repr(exc)
+urlconf_ms = (time.perf_counter() - start) * 1000 - setup_ms
+
+print(
+    json.dumps(
+        {
+            "setup_ms": setup_ms,
+            "urlconf_ms": urlconf_ms,
+            "queries": queries,
+            "error": error,
+        }
+    )
+)
+"""
+
+
+def measure_startup():
+    """Import the URLconf in a new Python process.
+
+    Returns:
+        dict: Time taken by django.setup() ('setup_ms') and importing the
+        URLconf ('urlconf_ms'), the SQL of any queries made ('queries') and
+        any error raised importing the URLconf ('error').
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT],
+        capture_output=True,
+        check=True,
+        cwd=settings.BASE_DIR,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
@@ -0,0 +1,109 @@
+import unittest.mock as mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from propertys.cache import property_response_cache
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..runner import build_endpoints
+from ..seed import seed_data
+
+
+class EndpointQueryCountTests(APITestCase):
+    """Endpoint Query Count Regression Tests
+
+    Each list endpoint is requested with a small and a large page size. The
+    number of queries must not grow with the page size, which catches
+    serializers querying the database for each object (N+1 queries).
+    """
+
+    small_page_size = 2
+    large_page_size = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_data(
+            sellers=12,
+            users=2,
+            properties=24,
+            bookmarks_per_user=12,
+            follows_per_user=12,
+            notes_per_user=12,
+            postcodes=1,
+        )
+        cls.endpoints = {
+            endpoint["name"]: endpoint
+            for endpoint in build_endpoints(cls.data)
+        }
+
+    def count_queries(self, endpoint, page_size):
+        """Return the number of queries made requesting an endpoint with the
+        given page size.
+        """
+        view_class = resolve(endpoint["url"].split("?")[0]).func.view_class
+        if endpoint["authenticated"]:
+            self.client.force_authenticate(self.data["users"][0])
+        else:
+            self.client.force_authenticate(None)
+
+        with mock.patch.object(
+            view_class.pagination_class, "page_size", page_size
+        ):
+            # Warm up request (e.g. caches the search postcode lookup)
+            self.client.get(endpoint["url"])
+            property_response_cache.bump_generation()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(endpoint["url"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), page_size)
+        return len(queries)
+
+    def assertQueryCountIndependentOfPageSize(self, endpoint_name):
+        endpoint = self.endpoints[endpoint_name]
+        small_page_queries = self.count_queries(endpoint, self.small_page_size)
+        large_page_queries = self.count_queries(endpoint, self.large_page_size)
+        self.assertEqual(
+            large_page_queries,
+            small_page_queries,
+            f"{endpoint_name}: {small_page_queries} queries for "
+            f"{self.small_page_size} results, {large_page_queries} queries "
+            f"for {self.large_page_size} results",
+        )
+
+    def test_property_list_query_count(self):
+        self.assertQueryCountIndependentOfPageSize("property list")
+
+    def test_authenticated_property_list_query_count(self):
+        self.assertQueryCountIndependentOfPageSize(
+            "property list (authenticated)"
+        )
+
+    def test_property_search_query_count(self):
+        self.assertQueryCountIndependentOfPageSize("property search")
+
+    def test_profile_list_query_count(self):
+        self.assertQueryCountIndependentOfPageSize("profile list")
+
+    def test_authenticated_profile_list_query_count(self):
+        self.assertQueryCountIndependentOfPageSize(
+            "profile list (authenticated)"
+        )
+
+    def test_bookmark_list_query_count(self):
+        self.assertQueryCountIndependentOfPageSize("bookmark list")
+
+    def test_follower_list_query_count(self):
+        self.assertQueryCountIndependentOfPageSize("follower list")
+
+    def test_note_list_query_count(self):
+        self.assertQueryCountIndependentOfPageSize("note list")
+
+    def test_detail_endpoints_respond(self):
+        """Test the detail endpoints benchmarked respond successfully"""
+        self.client.force_authenticate(self.data["users"][0])
+        for name in ("property detail", "profile detail"):
+            response = self.client.get(self.endpoints[name]["url"])
+            self.assertEqual(response.status_code, status.HTTP_200_OK, name)
@@ -0,0 +1,52 @@
+from django.test import TestCase
+
+from ..query_plans import (
+    FILTER_COMBINATIONS,
+    analyze,
+    explain_filter_combinations,
+    is_table_scan,
+)
+from ..seed import seed_data
+
+
+class FilterQueryPlanTests(TestCase):
+    """Property Filter Query Plan Tests
+
+    The standard filter combinations must be planned using the property
+    indexes rather than scanning the table.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_data(sellers=2, users=0, properties=2000, postcodes=1)
+
+    def test_filter_combinations_use_indexes(self):
+        """Test no standard filter combination scans the property table"""
+        analyze()
+        results = explain_filter_combinations()
+        self.assertEqual(len(results), len(FILTER_COMBINATIONS))
+        for result in results:
+            with self.subTest(result["name"]):
+                self.assertFalse(result["table_scan"], result["plan"])
+                self.assertTrue(result["indexes"], result["plan"])
+
+    def test_active_listings_use_partial_index(self):
+        """Test active listings (not sold STC) use the partial index"""
+        results = {
+            result["name"]: result for result in explain_filter_combinations()
+        }
+        self.assertEqual(
+            results["active"]["indexes"], ["property_active_created_idx"]
+        )
+
+    def test_is_table_scan(self):
+        """Test SQLite and PostgreSQL table scans are recognised"""
+        self.assertTrue(is_table_scan("2 0 0 SCAN propertys_property"))
+        self.assertTrue(
+            is_table_scan("Limit\n  ->  Seq Scan on propertys_property")
+        )
+        self.assertFalse(
+            is_table_scan(
+                "SCAN propertys_property USING INDEX property_price_id_idx"
+            )
+        )
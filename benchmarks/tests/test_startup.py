@@ -0,0 +1,15 @@
+from django.test import SimpleTestCase
+
+from ..startup import measure_startup
+
+
+class StartupTests(SimpleTestCase):
+    """Startup Benchmark Tests"""
+
+    def test_importing_urlconf_makes_no_queries(self):
+        """Test importing the URLconf (including views, filters and
+        serializers) does not query the database
+        """
+        result = measure_startup()
+        self.assertIsNone(result["error"])
+        self.assertEqual(result["queries"], [])
@@ -0,0 +1,20 @@
+from django.test import SimpleTestCase
+
+from ..uploads import MAX_VALIDATION_MEMORY_KB, measure_uploads, png_bomb
+
+
+class UploadBenchmarkTests(SimpleTestCase):
+    """Upload Validation Benchmark Tests"""
+
+    def test_validating_decompression_bomb_needs_little_memory(self):
+        """Test a decompression bomb is rejected without the memory needed
+        to decode it
+        """
+        results = measure_uploads(
+            samples=[("PNG bomb", png_bomb(12000, 12000))], iterations=1
+        )
+        validate, decode = results
+        self.assertIn("Image width should be less than", validate["result"])
+        self.assertLess(validate["peak_kb"], MAX_VALIDATION_MEMORY_KB)
+        # Decoding the 144 megapixel image would need over 100MB
+        self.assertGreater(decode["peak_kb"], 100 * 1024)
@@ -0,0 +1,195 @@
+import json
+import struct
+import subprocess
+import sys
+import tempfile
+import zlib
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image
+
+# Peak memory allowed to validate one upload (KB). Validation reads only the
+# image header, so should never need memory in proportion to the pixels.
+MAX_VALIDATION_MEMORY_KB = 16 * 1024
+
+# Run in a new Python process for each sample and mode, so the peak memory
+# (maximum resident set size) is not raised by an earlier measurement. The
+# peak is the increase over the peak before the upload is processed.
+UPLOAD_SCRIPT = """
+import gc
+import json
+import resource
+import sys
+import time
+import warnings
+
+import django
+
+django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from property_direct_api.utils import validate_image_util
+from rest_framework.serializers import ValidationError
+
+path, mode, iterations = sys.argv[1], sys.argv[2], int(sys.argv[3])
+with open(path, "rb") as file:
+    content = file.read()
+warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+
+
+def run():
+    upload = SimpleUploadedFile(path, content)
+    if mode == "validate":
+        validate_image_util(upload)
+    else:
+        with Image.open(upload) as image:
+            image.load()
+
+
+def peak_kb():
+    # On Linux, ru_maxrss includes the peak of the parent process (it is
+    # kept across exec), so the process's own peak (VmHWM) is read instead
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+gc.collect()
+baseline_kb = peak_kb()
+durations = []
+for iteration in range(iterations):
+    start = time.perf_counter()
+    try:
+        run()
+        result = "accepted"
+    except ValidationError as exc:
+        result = str(exc.detail[0])
+    except Exception as exc:
+        result = repr(exc)
+    durations.append((time.perf_counter() - start) * 1000)
+    if iteration == 0:
+        first_peak_kb = peak_kb() - baseline_kb
+
+print(
+    json.dumps(
+        {
+            "result": result,
+            "peak_kb": first_peak_kb,
+            "mean_ms": sum(durations) / len(durations),
+        }
+    )
+)
+"""
+
+
+def png_bomb(width, height):
+    """Return a valid grayscale PNG of blank pixels. The pixel data
+    compresses roughly a thousand times, so the file is small however large
+    the image.
+    """
+
+    def chunk(chunk_type, data):
+        return (
+            struct.pack(">I", len(data))
+            + chunk_type
+            + data
+            + struct.pack(">I", zlib.crc32(chunk_type + data))
+        )
+
+    compressor = zlib.compressobj(9)
+    # Each row is a filter type byte followed by the pixels
+    row = bytes(width + 1)
+    pixel_data = b"".join(compressor.compress(row) for _ in range(height))
+    pixel_data += compressor.flush()
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+        + chunk(b"IDAT", pixel_data)
+        + chunk(b"IEND", b"")
+    )
+
+
+def encode_image(image, image_format, **options):
+    file = BytesIO()
+    image.save(file, image_format, **options)
+    return file.getvalue()
+
+
+def get_upload_samples():
+    """Return sample uploads, as (name, content) pairs: typical photos and
+    images at the size limits, and files that must be rejected.
+    """
+    gradient = Image.linear_gradient("L").convert("RGB")
+    return [
+        (
+            "JPEG photo 4000x3000",
+            encode_image(gradient.resize((4000, 3000)), "JPEG", quality=85),
+        ),
+        (
+            "PNG 4096x4096",
+            encode_image(Image.new("RGB", (4096, 4096), "white"), "PNG"),
+        ),
+        ("PNG bomb 12000x12000", png_bomb(12000, 12000)),
+        (
+            "TIFF 500x500 (unsupported)",
+            encode_image(Image.new("RGB", (500, 500)), "TIFF"),
+        ),
+        ("Text file", b"Hello world!"),
+    ]
+
+
+def measure_uploads(samples=None, modes=("validate", "decode"), iterations=5):
+    """Measure the peak memory and time to process each sample upload, each
+    in a new Python process.
+
+    Modes:
+    - validate - Validate the upload (validate_image_util).
+    - decode - Decode the upload's pixels, as generating image derivatives
+      (or a validator decoding the image) would, for comparison.
+
+    Returns:
+        list: A dict per sample and mode of 'name', 'mode', 'size' (bytes),
+        'result' ('accepted' or the error), 'peak_kb' (increase in peak
+        memory processing the upload) and 'mean_ms' (time per upload).
+    """
+    if samples is None:
+        samples = get_upload_samples()
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (name, content) in enumerate(samples):
+            path = Path(directory) / f"upload_{index}"
+            path.write_bytes(content)
+            for mode in modes:
+                result = subprocess.run(
+                    [
+                        sys.executable,
+                        "-c",
+                        UPLOAD_SCRIPT,
+                        str(path),
+                        mode,
+                        str(iterations),
+                    ],
+                    capture_output=True,
+                    check=True,
+                    cwd=settings.BASE_DIR,
+                    text=True,
+                )
+                results.append(
+                    {
+                        "name": name,
+                        "mode": mode,
+                        "size": len(content),
+                        **json.loads(result.stdout.splitlines()[-1]),
+                    }
+                )
+    return results
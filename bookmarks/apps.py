@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BookmarksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bookmarks'
+
+    def ready(self):
+        import bookmarks.signals  # noqa
@@ -1,8 +1,96 @@
 from django.conf import settings
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import F
+from django.utils import timezone
+from propertys.cache import property_response_cache
 from propertys.models import Property
 
 
+class BookmarkQuerySet(models.QuerySet):
+    """Bookmark QuerySet."""
+
+    def bulk_sync(self, owner, add=(), remove=()):
+        """Add and remove a user's bookmarks of many properties in one
+        transaction, e.g. to sync bookmarks made offline.
+
+        Bookmarks are created with one INSERT, ignoring properties already
+        bookmarked (ON CONFLICT DO NOTHING), and removed with one filtered
+        DELETE, each returning the properties whose bookmarks were actually
+        created or deleted (RETURNING, PostgreSQL and SQLite 3.35+). Neither
+        sends model signals, so the bookmark counts of those properties are
+        incremented and decremented together (with F(), so concurrent
+        changes are kept), and cached property responses are invalidated
+        once. The number of queries does not depend on the number of ids.
+
+        Args:
+            owner (User): Owner of the bookmarks.
+            add (iterable): Ids of properties to bookmark (properties that do
+                not exist are ignored).
+            remove (iterable): Ids of properties to remove the bookmarks of.
+
+        Returns:
+            dict: Id of the owner's bookmark of each given property (None if
+            not bookmarked), by property id.
+        """
+        add, remove = sorted(set(add)), sorted(set(remove))
+        if not add and not remove:
+            return {}
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        table = quote_name(self.model._meta.db_table)
+        owner_column, property_column, created_at_column = (
+            quote_name(self.model._meta.get_field(name).column)
+            for name in ("owner", "property", "created_at")
+        )
+
+        added = removed = []
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            if add:
+                cursor.execute(
+                    f"INSERT INTO {table} ({owner_column}, {property_column}, "
+                    f"{created_at_column}) SELECT %s, id, %s FROM "
+                    f"{quote_name(Property._meta.db_table)} WHERE id IN "
+                    f"({', '.join(['%s'] * len(add))}) ON CONFLICT "
+                    f"({owner_column}, {property_column}) DO NOTHING "
+                    f"RETURNING {property_column}",
+                    [
+                        owner.pk,
+                        connection.ops.adapt_datetimefield_value(
+                            timezone.now()
+                        ),
+                        *add,
+                    ],
+                )
+                added = [row[0] for row in cursor.fetchall()]
+            if remove:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE {owner_column} = %s AND "
+                    f"{property_column} IN "
+                    f"({', '.join(['%s'] * len(remove))}) "
+                    f"RETURNING {property_column}",
+                    [owner.pk, *remove],
+                )
+                removed = [row[0] for row in cursor.fetchall()]
+            if added:
+                Property.objects.filter(pk__in=added).update(
+                    bookmarks_count=F("bookmarks_count") + 1
+                )
+            if removed:
+                Property.objects.filter(
+                    pk__in=removed, bookmarks_count__gt=0
+                ).update(bookmarks_count=F("bookmarks_count") - 1)
+        property_response_cache.bump_generation()
+
+        bookmark_ids = dict.fromkeys(sorted({*add, *remove}))
+        if add:
+            bookmark_ids.update(
+                self.filter(owner=owner, property_id__in=add).values_list(
+                    "property_id", "pk"
+                )
+            )
+        return bookmark_ids
+
+
 # CREDIT: Class from Code Institute DRF Tutorial Project with minor adaptations
 # URL:    https://github.com/Code-Institute-Solutions/drf-api
 class Bookmark(models.Model):
@@ -22,6 +110,8 @@ class Bookmark(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = BookmarkQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         unique_together = ["owner", "property"]
@@ -1,4 +1,6 @@
 from django.db import IntegrityError
+from property_direct_api.instrumentation import TimedSerializerMixin
+from property_direct_api.serializers import SparseFieldsetSerializerMixin
 from rest_framework import serializers
 
 from .models import Bookmark
@@ -6,7 +8,11 @@ from .models import Bookmark
 
 # CREDIT: Adapted from the Code Institute DRF Tutorial Project
 # URL:    https://github.com/Code-Institute-Solutions/drf-api
-class BookmarkSerializer(serializers.ModelSerializer):
+class BookmarkSerializer(
+    TimedSerializerMixin,
+    SparseFieldsetSerializerMixin,
+    serializers.ModelSerializer,
+):
     """Bookmark Serializer
 
     Used with list and detail view.
@@ -32,3 +38,38 @@ class BookmarkSerializer(serializers.ModelSerializer):
             return super().create(validated_data)
         except IntegrityError:
             raise serializers.ValidationError({"detail": "possible duplicate"})
+
+
+class BookmarkBulkSerializer(serializers.Serializer):
+    """Bookmark Bulk Serializer
+
+    Used with the bulk view, to add and remove bookmarks of lists of property
+    ids.
+    """
+
+    # Maximum number of property ids in each list
+    max_property_ids = 500
+
+    add = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=max_property_ids,
+        default=list,
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=max_property_ids,
+        default=list,
+    )
+
+    def validate(self, data):
+        conflicting_ids = set(data["add"]) & set(data["remove"])
+        if conflicting_ids:
+            raise serializers.ValidationError(
+                {
+                    "detail": (
+                        "Properties cannot be both added and removed: "
+                        f"{', '.join(map(str, sorted(conflicting_ids)))}."
+                    )
+                }
+            )
+        return data
@@ -0,0 +1,28 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from propertys.models import Property
+
+from .models import Bookmark
+
+
+@receiver(post_save, sender=Bookmark)
+def increment_bookmarks_count(sender, instance, created, **kwargs):
+    """Signal to increment the bookmarked property's 'bookmarks_count' when a
+    Bookmark object is created.
+    """
+    if created:
+        Property.objects.filter(pk=instance.property_id).update(
+            bookmarks_count=F("bookmarks_count") + 1
+        )
+
+
+@receiver(post_delete, sender=Bookmark)
+def decrement_bookmarks_count(sender, instance, **kwargs):
+    """Signal to decrement the bookmarked property's 'bookmarks_count' when a
+    Bookmark object is deleted (including deletes cascaded from the owner or
+    property).
+    """
+    Property.objects.filter(
+        pk=instance.property_id, bookmarks_count__gt=0
+    ).update(bookmarks_count=F("bookmarks_count") - 1)
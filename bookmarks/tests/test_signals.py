@@ -0,0 +1,93 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from propertys.models import Property
+from rest_framework.test import APITestCase
+
+from ..models import Bookmark
+
+
+class BookmarksCountTests(APITestCase):
+    """Property Bookmarks Count Tests"""
+
+    def setUp(self):
+
+        # Create Users
+        self.shared_password = "testingPa$$w0rd!"
+
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+
+        self.test_user = get_user_model().objects.create_user(
+            username="test_user",
+            password=self.shared_password,
+        )
+
+        # Create Property
+        self.property = Property.objects.create(
+            owner=self.test_seller,
+            street_name="test street name",
+            locality="test locality",
+            city="test city",
+            postcode="test postcode",
+            description="test description",
+            price=100000,
+            property_type="apartment",
+            num_bedrooms=1,
+            num_bathrooms=1,
+        )
+
+    def get_bookmarks_count(self):
+        self.property.refresh_from_db(fields=["bookmarks_count"])
+        return self.property.bookmarks_count
+
+    def test_creating_bookmark_increments_count(self):
+        """Test creating a bookmark increments the property's count"""
+        Bookmark.objects.create(owner=self.test_user, property=self.property)
+        Bookmark.objects.create(owner=self.test_seller, property=self.property)
+        self.assertEqual(self.get_bookmarks_count(), 2)
+
+    def test_deleting_bookmark_decrements_count(self):
+        """Test deleting a bookmark decrements the property's count"""
+        bookmark = Bookmark.objects.create(
+            owner=self.test_user, property=self.property
+        )
+        bookmark.delete()
+        self.assertEqual(self.get_bookmarks_count(), 0)
+
+    def test_deleting_bookmark_owner_decrements_count(self):
+        """Test bookmarks deleted by cascade (deleting the bookmark owner)
+        decrement the property's count
+        """
+        Bookmark.objects.create(owner=self.test_user, property=self.property)
+        self.test_user.delete()
+        self.assertEqual(self.get_bookmarks_count(), 0)
+
+    def test_count_is_returned_by_property_views(self):
+        """Test the stored count is returned when retrieving a property"""
+        Bookmark.objects.create(owner=self.test_user, property=self.property)
+        response = self.client.get(f"/property/{self.property.id}/")
+        self.assertEqual(response.data["bookmarks_count"], 1)
+
+    def test_recount_bookmarks_command_repairs_counts(self):
+        """Test the recount_bookmarks command corrects counts that drifted"""
+        Bookmark.objects.bulk_create(
+            [
+                Bookmark(owner=self.test_user, property=self.property),
+                Bookmark(owner=self.test_seller, property=self.property),
+            ]
+        )
+        self.assertEqual(self.get_bookmarks_count(), 0)
+
+        out = StringIO()
+        call_command("recount_bookmarks", stdout=out)
+        self.assertEqual(self.get_bookmarks_count(), 2)
+        self.assertIn("1 properties", out.getvalue())
+
+        out = StringIO()
+        call_command("recount_bookmarks", stdout=out)
+        self.assertIn("0 properties", out.getvalue())
@@ -1,4 +1,9 @@
+import unittest.mock as mock
+
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from propertys.cache import property_response_cache
 from propertys.models import Property
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -109,6 +114,18 @@ class BookmarkListViewTests(APITestCase):
         self.assertEqual(response.data["detail"], "possible duplicate")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_sparse_fieldsets(self):
+        """Test only the requested fields of bookmarks are returned, without
+        joining the owner
+        """
+        self.client.login(username="test_user", password=self.shared_password)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/bookmarks/", {"fields": "property"})
+        self.assertEqual(
+            response.data["results"], [{"property": self.property.id}]
+        )
+        self.assertNotIn("JOIN", queries.captured_queries[-1]["sql"])
+
 
 class BookmarkDetailViewTests(APITestCase):
     """Bookmark Retrieve, Update and Deletion Tests"""
@@ -181,3 +198,198 @@ class BookmarkDetailViewTests(APITestCase):
         count = Bookmark.objects.count()
         self.assertEqual(count, initial_count - 1)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class BookmarkBulkViewTests(APITestCase):
+    """Bookmark Bulk (Add and Remove) View Tests"""
+
+    def setUp(self):
+
+        # Create Users
+        self.shared_password = "testingPa$$w0rd!"
+
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+
+        self.test_user = get_user_model().objects.create_user(
+            username="test_user",
+            password=self.shared_password,
+        )
+
+        # Create Properties
+        self.properties = [
+            Property.objects.create(
+                owner=self.test_seller,
+                street_name=f"test street name {number}",
+                locality="test locality",
+                city="test city",
+                postcode="test postcode",
+                description="test description",
+                price=100000,
+                property_type="apartment",
+                num_bedrooms=1,
+                num_bathrooms=1,
+            )
+            for number in range(4)
+        ]
+        self.property_ids = [property.id for property in self.properties]
+
+        # Bookmark the first property, by both users
+        self.test_user_bookmark = Bookmark.objects.create(
+            owner=self.test_user, property=self.properties[0]
+        )
+        Bookmark.objects.create(
+            owner=self.test_seller, property=self.properties[0]
+        )
+
+    def get_bookmarks_counts(self):
+        return list(
+            Property.objects.filter(pk__in=self.property_ids)
+            .order_by("pk")
+            .values_list("bookmarks_count", flat=True)
+        )
+
+    def test_anonymous_users_cannot_bulk_bookmark(self):
+        """Test an anonymous user cannot add or remove bookmarks in bulk"""
+        response = self.client.post(
+            "/bookmarks/bulk/", {"add": self.property_ids}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bookmarks_are_added_and_removed(self):
+        """Test bookmarks are added and removed, returning the id of the
+        user's bookmark of each property, and counts are updated
+        """
+        self.client.login(username="test_user", password=self.shared_password)
+        response = self.client.post(
+            "/bookmarks/bulk/",
+            {
+                "add": self.property_ids[1:3],
+                "remove": [self.property_ids[0], self.property_ids[3]],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        bookmarks = {
+            bookmark.property_id: bookmark.id
+            for bookmark in Bookmark.objects.filter(owner=self.test_user)
+        }
+        self.assertEqual(set(bookmarks), set(self.property_ids[1:3]))
+        self.assertEqual(
+            response.data["bookmarks"],
+            {
+                self.property_ids[0]: None,
+                self.property_ids[1]: bookmarks[self.property_ids[1]],
+                self.property_ids[2]: bookmarks[self.property_ids[2]],
+                self.property_ids[3]: None,
+            },
+        )
+        self.assertEqual(self.get_bookmarks_counts(), [1, 1, 1, 0])
+
+    def test_bulk_requests_are_idempotent(self):
+        """Test existing bookmarks are kept (not duplicated) and repeating a
+        request makes no further changes
+        """
+        self.client.login(username="test_user", password=self.shared_password)
+        request = {"add": self.property_ids, "remove": []}
+        first = self.client.post("/bookmarks/bulk/", request, format="json")
+        second = self.client.post("/bookmarks/bulk/", request, format="json")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(
+            first.data["bookmarks"][self.property_ids[0]],
+            self.test_user_bookmark.id,
+        )
+        self.assertEqual(self.get_bookmarks_counts(), [2, 1, 1, 1])
+
+    def test_missing_properties_are_ignored(self):
+        """Test ids of properties that do not exist are not bookmarked"""
+        self.client.login(username="test_user", password=self.shared_password)
+        response = self.client.post(
+            "/bookmarks/bulk/", {"add": [999999]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["bookmarks"], {999999: None})
+
+    def test_conflicting_ids_are_rejected(self):
+        """Test a property cannot be both added and removed"""
+        self.client.login(username="test_user", password=self.shared_password)
+        response = self.client.post(
+            "/bookmarks/bulk/",
+            {"add": self.property_ids[:2], "remove": self.property_ids[1:]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            Bookmark.objects.filter(owner=self.test_user).count(), 1
+        )
+
+    def test_query_count_does_not_grow_with_ids(self):
+        """Test a bulk request makes the same number of queries however many
+        properties are added or removed
+        """
+        self.client.login(username="test_user", password=self.shared_password)
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(
+                "/bookmarks/bulk/",
+                {"add": [self.property_ids[1]]},
+                format="json",
+            )
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(
+                "/bookmarks/bulk/",
+                {"add": self.property_ids[2:]},
+                format="json",
+            )
+        self.assertEqual(len(few), len(many))
+
+        with mock.patch.object(
+            property_response_cache,
+            "bump_generation",
+            wraps=property_response_cache.bump_generation,
+        ) as bump_generation:
+            with CaptureQueriesContext(connection) as few:
+                self.client.post(
+                    "/bookmarks/bulk/",
+                    {"remove": [self.property_ids[1]]},
+                    format="json",
+                )
+            with CaptureQueriesContext(connection) as many:
+                self.client.post(
+                    "/bookmarks/bulk/",
+                    {"remove": self.property_ids[:3]},
+                    format="json",
+                )
+        self.assertEqual(len(few), len(many))
+        # Once per request, not once per bookmark removed
+        self.assertEqual(bump_generation.call_count, 2)
+        self.assertEqual(self.get_bookmarks_counts(), [1, 0, 0, 1])
+
+    def test_counts_are_incremented_and_decremented(self):
+        """Test bookmark counts are changed relative to their current value
+        (not recounted), so concurrent changes are kept
+        """
+        # e.g. a concurrent bookmark's increment
+        Property.objects.filter(pk__in=self.property_ids[:2]).update(
+            bookmarks_count=5
+        )
+        self.client.login(username="test_user", password=self.shared_password)
+        self.client.post(
+            "/bookmarks/bulk/",
+            {"add": [self.property_ids[1]], "remove": [self.property_ids[0]]},
+            format="json",
+        )
+        self.assertEqual(self.get_bookmarks_counts(), [4, 6, 0, 0])
+
+    def test_bulk_changes_invalidate_cached_responses(self):
+        """Test cached property responses are invalidated by bulk changes"""
+        generation = property_response_cache.get_generation()
+        self.client.login(username="test_user", password=self.shared_password)
+        self.client.post(
+            "/bookmarks/bulk/", {"add": self.property_ids}, format="json"
+        )
+        self.assertNotEqual(
+            property_response_cache.get_generation(), generation
+        )
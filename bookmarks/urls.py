@@ -1,8 +1,9 @@
 from django.urls import path
 
-from .views import BookmarkDetailView, BookmarkListView
+from .views import BookmarkBulkView, BookmarkDetailView, BookmarkListView
 
 urlpatterns = [
     path("bookmarks/", BookmarkListView.as_view()),
     path("bookmarks/<int:pk>/", BookmarkDetailView.as_view()),
+    path("bookmarks/bulk/", BookmarkBulkView.as_view()),
 ]
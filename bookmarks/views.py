@@ -1,38 +1,79 @@
-from property_direct_api.mixins import IsOwnerQuerysetFilter
+from property_direct_api.mixins import (
+    IsOwnerQuerysetFilter,
+    SparseFieldsetsMixin,
+)
 from property_direct_api.permissions import IsOwnerOrReadOnly
 from rest_framework import permissions
-from rest_framework.generics import ListCreateAPIView, RetrieveDestroyAPIView
+from rest_framework.generics import (
+    GenericAPIView,
+    ListCreateAPIView,
+    RetrieveDestroyAPIView,
+)
+from rest_framework.response import Response
 
 from .models import Bookmark
-from .serializers import BookmarkSerializer
+from .serializers import BookmarkBulkSerializer, BookmarkSerializer
 
 
-class BookmarkListView(IsOwnerQuerysetFilter, ListCreateAPIView):
+class BookmarkListView(
+    SparseFieldsetsMixin, IsOwnerQuerysetFilter, ListCreateAPIView
+):
     """Bookmark List/Create View.
 
     - List or Create a bookmark (latter if authenticated).
     - Use IsOwnerQuerysetFilter Mixin to only display bookmarks to their owners
       to keep bookmarks private.
     - Create a bookmark if authenticated.
+    - Supports sparse fieldsets (see SparseFieldsetsMixin).
     """
 
     model = Bookmark
     serializer_class = BookmarkSerializer
     permission_classes = [permissions.IsAuthenticated]
+    queryset_select_related = ["owner"]
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
 
-class BookmarkDetailView(IsOwnerQuerysetFilter, RetrieveDestroyAPIView):
+class BookmarkDetailView(
+    SparseFieldsetsMixin, IsOwnerQuerysetFilter, RetrieveDestroyAPIView
+):
     """Bookmark Detail (Retrieve, Update and Destroy) View
 
     - Retrieve a Bookmark by id and allow the owner to view and delete the
     object.
     - Use IsOwnerQuerysetFilter Mixin to only display bookmarks to their owners
       to keep bookmarks private.
+    - Supports sparse fieldsets (see SparseFieldsetsMixin).
     """
 
     model = Bookmark
     serializer_class = BookmarkSerializer
     permission_classes = [IsOwnerOrReadOnly]
+
+
+class BookmarkBulkView(GenericAPIView):
+    """Bookmark Bulk (Add and Remove) View
+
+    - Add and remove the authenticated user's bookmarks of lists of property
+      ids ('add' and 'remove') in one request and transaction, e.g. to sync
+      bookmarks made offline.
+    - Adding a property already bookmarked, or removing one not bookmarked,
+      is not an error, so requests can be safely retried.
+    - Returns the id of the user's bookmark of each given property (null if
+      not bookmarked) by property id ('bookmarks').
+    """
+
+    serializer_class = BookmarkBulkSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        bookmark_ids = Bookmark.objects.bulk_sync(
+            request.user,
+            add=serializer.validated_data["add"],
+            remove=serializer.validated_data["remove"],
+        )
+        return Response({"bookmarks": bookmark_ids})
@@ -0,0 +1,17 @@
+from django.contrib import admin
+from django.contrib.admin import ModelAdmin
+
+from .models import FeedEntry
+
+
+class CustomFeedEntryAdmin(ModelAdmin):
+    """Customize admin list view fields."""
+
+    model = FeedEntry
+
+    list_display = ("id", "owner", "property", "created_at")
+
+    ordering = ("id",)
+
+
+admin.site.register(FeedEntry, CustomFeedEntryAdmin)
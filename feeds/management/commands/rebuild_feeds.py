@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from propertys.cache import property_response_cache
+
+from ...models import FeedEntry
+
+
+class Command(BaseCommand):
+    """Rebuild the property feeds of all users, e.g. after followers or
+    properties were created or deleted without model signals (bulk_create,
+    raw SQL).
+
+    Usage: ./manage.py rebuild_feeds
+    """
+
+    help = "Rebuild the property feed entries of all users."
+
+    def handle(self, *args, **options):
+        created_count = FeedEntry.objects.rebuild()
+        property_response_cache.bump_generation()
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {created_count} feed entries.")
+        )
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.16 on 2026-10-17 20:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_feeds(apps, schema_editor):
+    """Add the properties of followed users to existing followers' feeds."""
+    FeedEntry = apps.get_model("feeds", "FeedEntry")
+    Property = apps.get_model("propertys", "Property")
+    entries = Property.objects.filter(
+        owner__followed__isnull=False
+    ).values_list("pk", "created_at", "owner__followed__owner_id")
+    batch = []
+    for property_id, created_at, follower_id in entries.iterator():
+        batch.append(
+            FeedEntry(
+                owner_id=follower_id,
+                property_id=property_id,
+                created_at=created_at,
+            )
+        )
+        if len(batch) == 1000:
+            FeedEntry.objects.bulk_create(batch)
+            batch = []
+    FeedEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('followers', '0001_initial'),
+        ('propertys', '0010_property_filter_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='propertys.property')),
+            ],
+            options={
+                'verbose_name_plural': 'feed entries',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['owner', 'created_at', 'property'], name='feed_owner_created_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='feedentry',
+            unique_together={('owner', 'property')},
+        ),
+        migrations.RunPython(build_feeds, migrations.RunPython.noop),
+    ]
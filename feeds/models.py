@@ -0,0 +1,133 @@
+from itertools import islice
+
+from django.conf import settings
+from django.db import models
+from followers.models import Follower
+from propertys.models import Property
+
+
+class FeedEntryQuerySet(models.QuerySet):
+    """Feed Entry QuerySet.
+
+    Feeds are written when properties are created and users follow or
+    unfollow sellers (fan-out on write, see feeds.signals), so reading a feed
+    is a single range scan of the owner's entries.
+    """
+
+    batch_size = 1000
+
+    def create_entries(self, entries):
+        """Create feed entries from an iterable in batches, ignoring entries
+        already in a feed.
+
+        Returns:
+            int: Number of entries given.
+        """
+        entries = iter(entries)
+        count = 0
+        while True:
+            batch = list(islice(entries, self.batch_size))
+            if not batch:
+                return count
+            self.bulk_create(batch, ignore_conflicts=True)
+            count += len(batch)
+
+    def fan_out(self, property):
+        """Add a property to the feed of each follower of its owner."""
+        follower_ids = Follower.objects.filter(
+            followed_id=property.owner_id
+        ).values_list("owner_id", flat=True)
+        self.create_entries(
+            (
+                FeedEntry(
+                    owner_id=follower_id,
+                    property_id=property.pk,
+                    created_at=property.created_at,
+                )
+                for follower_id in follower_ids.iterator()
+            )
+        )
+
+    def backfill(self, follower):
+        """Add the properties of a followed user to the follower's feed."""
+        properties = Property.objects.filter(
+            owner_id=follower.followed_id
+        ).values_list("pk", "created_at")
+        self.create_entries(
+            (
+                FeedEntry(
+                    owner_id=follower.owner_id,
+                    property_id=property_id,
+                    created_at=created_at,
+                )
+                for property_id, created_at in properties.iterator()
+            )
+        )
+
+    def prune(self, follower):
+        """Remove the properties of an unfollowed user from the follower's
+        feed.
+        """
+        return self.filter(
+            owner_id=follower.owner_id,
+            property__owner_id=follower.followed_id,
+        ).delete()[0]
+
+    def rebuild(self):
+        """Rebuild every feed from the followers and properties, e.g. after
+        they were created or deleted without model signals.
+
+        Returns:
+            int: Number of feed entries created.
+        """
+        self.all().delete()
+        entries = Property.objects.filter(
+            owner__followed__isnull=False
+        ).values_list("pk", "created_at", "owner__followed__owner_id")
+        return self.create_entries(
+            (
+                FeedEntry(
+                    owner_id=follower_id,
+                    property_id=property_id,
+                    created_at=created_at,
+                )
+                for property_id, created_at, follower_id in entries.iterator()
+            )
+        )
+
+
+class FeedEntry(models.Model):
+    """Feed Entry Model.
+
+    - A property listed by a user 'owner' follows, in the owner's property
+      feed.
+    - 'created_at' is copied from the property, so a page of the feed is read
+      from the ('owner', 'created_at') index alone.
+    - Properties appear in a feed once ('unique_together' in Meta class).
+    """
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="feed_entries",
+    )
+    property = models.ForeignKey(
+        Property, on_delete=models.CASCADE, related_name="feed_entries"
+    )
+    created_at = models.DateTimeField()
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-created_at"]
+        unique_together = ["owner", "property"]
+        indexes = [
+            models.Index(
+                fields=["owner", "created_at", "property"],
+                name="feed_owner_created_idx",
+            ),
+        ]
+        verbose_name_plural = "feed entries"
+
+    def __str__(self):
+        return f"{self.owner.username, self.property}"
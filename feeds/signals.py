@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from followers.models import Follower
+from propertys.models import Property
+
+from .models import FeedEntry
+
+
+@receiver(post_save, sender=Property)
+def fan_out_property(sender, instance, created, **kwargs):
+    """Signal to add a Property to the feeds of its owner's followers when
+    created.
+    """
+    if created:
+        FeedEntry.objects.fan_out(instance)
+
+
+@receiver(post_save, sender=Follower)
+def backfill_feed(sender, instance, created, **kwargs):
+    """Signal to add the followed user's properties to the follower's feed
+    when a Follower object is created.
+    """
+    if created:
+        FeedEntry.objects.backfill(instance)
+
+
+@receiver(post_delete, sender=Follower)
+def prune_feed(sender, instance, **kwargs):
+    """Signal to remove the followed user's properties from the follower's
+    feed when a Follower object is deleted.
+    """
+    FeedEntry.objects.prune(instance)
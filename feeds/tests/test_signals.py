@@ -0,0 +1,134 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from followers.models import Follower
+from propertys.models import Property
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import FeedEntry
+
+
+class FeedEntryTests(APITestCase):
+    """Property Feed (Fan-out on Write) Tests"""
+
+    def setUp(self):
+
+        # Create Users
+        self.shared_password = "testingPa$$w0rd!"
+
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+        self.test_other_seller = get_user_model().objects.create_user(
+            username="test_other_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+        self.test_user = get_user_model().objects.create_user(
+            username="test_user",
+            password=self.shared_password,
+        )
+
+        # Create Properties
+        self.property = self.create_property(self.test_seller, "first")
+        self.create_property(self.test_other_seller, "other")
+
+    def create_property(self, owner, street_name):
+        return Property.objects.create(
+            owner=owner,
+            street_name=street_name,
+            locality="test locality",
+            city="test city",
+            postcode="test postcode",
+            description="test description",
+            price=100000,
+            property_type="apartment",
+            num_bedrooms=1,
+            num_bathrooms=1,
+        )
+
+    def get_feed(self):
+        response = self.client.get(
+            "/property/",
+            {"property_feed_for_profile": self.test_user.profile.id},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [result["street_name"] for result in response.data["results"]]
+
+    def follow(self, seller):
+        self.client.login(username="test_user", password=self.shared_password)
+        response = self.client.post("/followers/", {"followed": seller.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def test_following_backfills_feed(self):
+        """Test following a seller adds their existing properties to the
+        feed
+        """
+        self.assertEqual(self.get_feed(), [])
+        self.follow(self.test_seller)
+        self.assertEqual(self.get_feed(), ["first"])
+
+    def test_new_properties_fan_out_to_followers(self):
+        """Test properties created by a followed seller are added to the
+        feed, newest first
+        """
+        self.follow(self.test_seller)
+        self.create_property(self.test_seller, "second")
+        self.create_property(self.test_other_seller, "not followed")
+        self.assertEqual(self.get_feed(), ["second", "first"])
+
+    def test_unfollowing_prunes_feed(self):
+        """Test unfollowing a seller removes their properties from the feed,
+        leaving other sellers' properties
+        """
+        follower_id = self.follow(self.test_seller)
+        self.follow(self.test_other_seller)
+        response = self.client.delete(f"/followers/{follower_id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.get_feed(), ["other"])
+
+    def test_deleted_properties_leave_feed(self):
+        """Test deleting a property removes it from feeds"""
+        self.follow(self.test_seller)
+        self.property.delete()
+        self.assertEqual(self.get_feed(), [])
+
+    def test_feed_is_read_from_feed_entries(self):
+        """Test reading a feed filters feed entries by owner, rather than
+        joining followers and profiles
+        """
+        self.follow(self.test_seller)
+        with CaptureQueriesContext(connection) as queries:
+            self.get_feed()
+        feed_queries = [
+            query["sql"]
+            for query in queries
+            if "feeds_feedentry" in query["sql"]
+        ]
+        self.assertTrue(feed_queries)
+        for sql in feed_queries:
+            self.assertNotIn("followers_follower", sql)
+
+    def test_rebuild_feeds_command(self):
+        """Test the rebuild_feeds command recreates feeds from followers
+        created without model signals
+        """
+        Follower.objects.bulk_create(
+            [Follower(owner=self.test_user, followed=self.test_seller)]
+        )
+        self.assertEqual(FeedEntry.objects.count(), 0)
+
+        out = StringIO()
+        call_command("rebuild_feeds", stdout=out)
+        self.assertIn("Created 1 feed entries", out.getvalue())
+        entry = FeedEntry.objects.get()
+        self.assertEqual(entry.owner, self.test_user)
+        self.assertEqual(entry.property, self.property)
+        self.assertEqual(entry.created_at, self.property.created_at)
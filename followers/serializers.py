@@ -1,4 +1,5 @@
 from django.db import IntegrityError
+from property_direct_api.instrumentation import TimedSerializerMixin
 from rest_framework import serializers
 
 from .models import Follower
@@ -6,7 +7,7 @@ from .models import Follower
 
 # CREDIT: Adapted from the Code Institute DRF Tutorial Project
 # URL:    https://github.com/Code-Institute-Solutions/drf-api
-class FollowerSerializer(serializers.ModelSerializer):
+class FollowerSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Follower Serializer
 
     Used with list and detail view.
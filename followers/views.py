@@ -20,6 +20,7 @@ class FollowerListView(IsOwnerQuerysetFilter, ListCreateAPIView):
     model = Follower
     serializer_class = FollowerSerializer
     permission_classes = [permissions.IsAuthenticated]
+    queryset_select_related = ["owner", "followed"]
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from django.contrib.admin import ModelAdmin
+
+from .models import Job
+
+
+class CustomJobAdmin(ModelAdmin):
+    """Customize admin list view fields."""
+
+    model = Job
+
+    list_display = ("id", "name", "status", "attempts", "run_at")
+    list_filter = ("status", "name")
+
+    ordering = ("run_at",)
+
+
+admin.site.register(Job, CustomJobAdmin)
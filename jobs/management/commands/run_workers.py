@@ -0,0 +1,73 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from ...worker import run_worker
+
+
+class Command(BaseCommand):
+    """Run background job workers (see the jobs app).
+
+    Workers poll the database for jobs, so no external broker is needed. Each
+    worker runs in its own thread, with its own database connection. Stop
+    with SIGINT or SIGTERM; workers finish their current batch first.
+
+    Usage: ./manage.py run_workers [--workers N] [--once]
+    """
+
+    help = "Run background job workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker threads.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Stop once no jobs are ready, rather than polling.",
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        previous_handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                previous_handlers[signum] = signal.signal(
+                    signum, lambda *args: stop.set()
+                )
+
+        run_counts = []
+
+        def work():
+            try:
+                run_counts.append(
+                    run_worker(once=options["once"], should_stop=stop.is_set)
+                )
+            finally:
+                # Each thread has its own database connections
+                connections.close_all()
+
+        try:
+            if options["workers"] == 1:
+                run_counts.append(
+                    run_worker(once=options["once"], should_stop=stop.is_set)
+                )
+            else:
+                threads = [
+                    threading.Thread(target=work, daemon=True)
+                    for _ in range(options["workers"])
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {sum(run_counts)} jobs."))
@@ -0,0 +1,136 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class JobQuerySet(models.QuerySet):
+    """Job QuerySet.
+
+    Jobs are claimed with a conditional UPDATE (of jobs still ready to run),
+    so concurrent workers never claim the same job, without relying on row
+    locking (which SQLite does not support).
+    """
+
+    def ready(self):
+        """Filter to jobs ready to run: queued jobs due to run, and jobs
+        claimed by a worker that has not finished them within
+        JOBS_LOCK_TIMEOUT (e.g. the worker was stopped).
+        """
+        now = timezone.now()
+        return self.filter(
+            models.Q(status=Job.QUEUED, run_at__lte=now)
+            | models.Q(
+                status=Job.RUNNING,
+                locked_at__lt=now
+                - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT),
+            )
+        )
+
+    def claim(self, name, limit):
+        """Claim up to 'limit' ready jobs of a task for a worker, oldest
+        first.
+
+        Returns:
+            list: The claimed jobs.
+        """
+        candidate_ids = list(
+            self.ready()
+            .filter(name=name)
+            .order_by("run_at", "pk")
+            .values_list("pk", flat=True)[:limit]
+        )
+        if not candidate_ids:
+            return []
+        worker_id = uuid.uuid4().hex
+        self.ready().filter(pk__in=candidate_ids).update(
+            status=Job.RUNNING,
+            locked_at=timezone.now(),
+            locked_by=worker_id,
+            attempts=models.F("attempts") + 1,
+        )
+        return list(
+            self.filter(locked_by=worker_id, status=Job.RUNNING).order_by(
+                "run_at", "pk"
+            )
+        )
+
+    def next_task_name(self):
+        """Return the task name of the oldest ready job, or None if no jobs
+        are ready.
+        """
+        return (
+            self.ready()
+            .order_by("run_at", "pk")
+            .values_list("name", flat=True)
+            .first()
+        )
+
+
+class Job(models.Model):
+    """Job Model.
+
+    - A queued call of a registered task (see jobs.registry), run by the
+      background workers (see the run_workers command).
+    - Jobs are deleted once they succeed, so the table only holds queued,
+      running and failed jobs.
+    - Failed attempts are retried with exponential backoff ('run_at') until
+      'max_attempts' is reached, when the job is marked as failed.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    status_choices = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=7, choices=status_choices, default=QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["run_at"]
+        indexes = [
+            # Jobs ready to run (see JobQuerySet.ready)
+            models.Index(
+                fields=["status", "run_at"], name="job_status_run_at_idx"
+            ),
+            models.Index(fields=["locked_by"], name="job_locked_by_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name, self.status, self.payload}"
+
+    def retry_or_fail(self, error):
+        """Record a failed attempt, queueing the job to run again after an
+        exponential backoff, or marking it as failed after 'max_attempts'.
+        """
+        self.last_error = error
+        self.locked_at = None
+        self.locked_by = ""
+        if self.attempts >= self.max_attempts:
+            self.status = Job.FAILED
+        else:
+            self.status = Job.QUEUED
+            delay = min(
+                settings.JOBS_RETRY_DELAY * 2 ** (self.attempts - 1),
+                settings.JOBS_MAX_RETRY_DELAY,
+            )
+            self.run_at = timezone.now() + timedelta(seconds=delay)
+        self.save()
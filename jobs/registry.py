@@ -0,0 +1,53 @@
+from .models import Job
+
+# Registered tasks, by name
+tasks = {}
+
+
+class Task:
+    """A function run by the background workers (see jobs.worker).
+
+    - The function is called with a list of job payloads (dicts), of up to
+      'batch_size' jobs, so work can be batched (e.g. one bulk API request).
+    - An exception fails every job in the batch. Failed jobs are retried
+      with exponential backoff, up to 'max_attempts' attempts.
+    """
+
+    def __init__(self, name, func, batch_size=1, max_attempts=5):
+        self.name = name
+        self.func = func
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+
+    def __call__(self, payloads):
+        return self.func(payloads)
+
+    def enqueue(self, **payload):
+        """Queue a job to run the task with a payload (JSON serializable
+        keyword arguments).
+
+        Returns:
+            Job: The queued job.
+        """
+        return Job.objects.create(
+            name=self.name, payload=payload, max_attempts=self.max_attempts
+        )
+
+
+def task(name, batch_size=1, max_attempts=5):
+    """Register a function as a background task.
+
+    Args:
+        name (string): Unique name of the task, stored with each job.
+        batch_size (int): Maximum number of jobs run by one call.
+        max_attempts (int): Attempts before a job is marked as failed.
+
+    Returns:
+        function: Decorator returning the registered Task.
+    """
+
+    def register(func):
+        tasks[name] = Task(name, func, batch_size, max_attempts)
+        return tasks[name]
+
+    return register
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import Job
+from ..registry import task, tasks
+from ..worker import run_next_batch, run_worker
+
+
+@override_settings(
+    JOBS_RETRY_DELAY=10, JOBS_MAX_RETRY_DELAY=30, JOBS_LOCK_TIMEOUT=60
+)
+class WorkerTests(TestCase):
+    """Background Job Worker Tests"""
+
+    def setUp(self):
+        self.calls = []
+        self.fail = False
+
+        def record(payloads):
+            if self.fail:
+                raise ValueError("test failure")
+            self.calls.append(payloads)
+
+        self.task = task("tests.record", batch_size=2, max_attempts=3)(record)
+
+    def tearDown(self):
+        tasks.pop("tests.record", None)
+
+    def test_jobs_are_run_in_batches_and_deleted(self):
+        """Test ready jobs are run in batches of up to the task batch size,
+        oldest first, and deleted once they succeed
+        """
+        for number in range(3):
+            self.task.enqueue(number=number)
+        self.assertEqual(run_worker(once=True), 3)
+        self.assertEqual(
+            self.calls, [[{"number": 0}, {"number": 1}], [{"number": 2}]]
+        )
+        self.assertFalse(Job.objects.exists())
+
+    def test_claimed_jobs_are_not_claimed_again(self):
+        """Test a job claimed by one worker cannot be claimed by another"""
+        self.task.enqueue()
+        first = Job.objects.claim("tests.record", 10)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(first[0].status, Job.RUNNING)
+        self.assertEqual(first[0].attempts, 1)
+        self.assertEqual(Job.objects.claim("tests.record", 10), [])
+        self.assertEqual(run_next_batch(), 0)
+
+    def test_jobs_claimed_by_a_stopped_worker_are_reclaimed(self):
+        """Test a running job whose lock has expired is run again"""
+        self.task.enqueue()
+        Job.objects.claim("tests.record", 10)
+        Job.objects.update(locked_at=timezone.now() - timedelta(seconds=61))
+        self.assertEqual(run_worker(once=True), 1)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_failed_jobs_are_retried_with_backoff(self):
+        """Test a failed job is queued again with an exponential backoff,
+        and marked as failed after the task's max attempts
+        """
+        self.fail = True
+        job = self.task.enqueue()
+
+        for attempt, delay in [(1, 10), (2, 20)]:
+            before = timezone.now()
+            with self.assertLogs("jobs.worker", "WARNING"):
+                run_next_batch()
+            job.refresh_from_db()
+            self.assertEqual(job.status, Job.QUEUED)
+            self.assertEqual(job.attempts, attempt)
+            self.assertIn("test failure", job.last_error)
+            self.assertGreaterEqual(
+                job.run_at, before + timedelta(seconds=delay)
+            )
+            # Not ready until the backoff has passed
+            self.assertEqual(run_next_batch(), 0)
+            Job.objects.update(run_at=timezone.now())
+
+        with self.assertLogs("jobs.worker", "WARNING"):
+            run_next_batch()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(run_next_batch(), 0)
+
+    def test_jobs_of_unregistered_tasks_fail(self):
+        """Test jobs of a task that is not registered are not run"""
+        Job.objects.create(name="tests.unknown", max_attempts=1)
+        self.assertEqual(run_worker(once=True), 1)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("not registered", job.last_error)
+
+    def test_run_workers_command(self):
+        """Test the run_workers command runs queued jobs"""
+        for number in range(5):
+            self.task.enqueue(number=number)
+        call_command("run_workers", "--once", stdout=StringIO())
+        self.assertEqual(
+            sorted(
+                payload["number"]
+                for payloads in self.calls
+                for payload in payloads
+            ),
+            [0, 1, 2, 3, 4],
+        )
+        self.assertFalse(Job.objects.exists())
@@ -0,0 +1,83 @@
+import logging
+import time
+import traceback
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import Job
+from .registry import tasks
+
+logger = logging.getLogger(__name__)
+
+
+def run_next_batch():
+    """Claim and run a batch of ready jobs of the task with the oldest ready
+    job.
+
+    Returns:
+        int: Number of jobs run (0 if no jobs were ready).
+    """
+    name = Job.objects.next_task_name()
+    if name is None:
+        return 0
+
+    jobs = Job.objects.claim(
+        name, tasks[name].batch_size if name in tasks else 1
+    )
+    if not jobs:
+        # Claimed by another worker first
+        return 0
+
+    if name not in tasks:
+        for job in jobs:
+            job.retry_or_fail(f"Task '{name}' is not registered.")
+        return len(jobs)
+
+    start = time.perf_counter()
+    try:
+        tasks[name]([job.payload for job in jobs])
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning(
+            "job_failed name=%s jobs=%s\n%s", name, len(jobs), error
+        )
+        for job in jobs:
+            job.retry_or_fail(error)
+    else:
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).delete()
+        logger.info(
+            "jobs_done name=%s jobs=%s ms=%.1f",
+            name,
+            len(jobs),
+            (time.perf_counter() - start) * 1000,
+        )
+    return len(jobs)
+
+
+def run_worker(once=False, poll_interval=None, should_stop=None):
+    """Run ready jobs until stopped, sleeping while no jobs are ready.
+
+    Args:
+        once (bool): Stop once no jobs are ready, rather than polling.
+        poll_interval (float): Seconds between polls (JOBS_POLL_INTERVAL by
+            default).
+        should_stop (function): Called between batches, stopping the worker
+            when it returns True.
+
+    Returns:
+        int: Number of jobs run.
+    """
+    if poll_interval is None:
+        poll_interval = settings.JOBS_POLL_INTERVAL
+    run_count = 0
+    while should_stop is None or not should_stop():
+        batch_count = run_next_batch()
+        run_count += batch_count
+        if not batch_count:
+            if once:
+                break
+            # Recycle database connections while idle, as after a request
+            close_old_connections()
+            time.sleep(poll_interval)
+    return run_count
@@ -1,4 +1,6 @@
 from django.contrib.humanize.templatetags.humanize import naturaltime
+from property_direct_api.instrumentation import TimedSerializerMixin
+from property_direct_api.serializers import SparseFieldsetSerializerMixin
 from rest_framework import serializers
 
 from .models import Note
@@ -6,7 +8,11 @@ from .models import Note
 
 # CREDIT: Adapted from the Code Institute DRF Tutorial Project
 # URL:    https://github.com/Code-Institute-Solutions/drf-api
-class NoteSerializer(serializers.ModelSerializer):
+class NoteSerializer(
+    TimedSerializerMixin,
+    SparseFieldsetSerializerMixin,
+    serializers.ModelSerializer,
+):
     """Note Serializer
 
     Used with list view.
@@ -19,9 +25,17 @@ class NoteSerializer(serializers.ModelSerializer):
     created_at = serializers.SerializerMethodField()
     updated_at = serializers.SerializerMethodField()
 
+    # Model attributes read by fields without a model field source (see
+    # SparseFieldsetSerializerMixin)
+    sparse_field_sources = {
+        "is_owner": ["owner_id"],
+        "created_at": ["created_at"],
+        "updated_at": ["updated_at"],
+    }
+
     def get_is_owner(self, obj):
         request = self.context["request"]
-        return request.user == obj.owner
+        return request.user.id == obj.owner_id
 
     def get_created_at(self, obj):
         return naturaltime(obj.created_at)
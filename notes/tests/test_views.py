@@ -85,6 +85,21 @@ class NoteListViewTests(APITestCase):
         self.assertEqual(count, initial_count + 1)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_sparse_fieldsets(self):
+        """Test only the requested fields of notes are returned"""
+        self.client.login(username="test_user", password=self.shared_password)
+        response = self.client.get("/notes/", {"fields": "id,is_owner"})
+        self.assertEqual(
+            response.data["results"][0],
+            {"id": self.test_user_note.id, "is_owner": True},
+        )
+        response = self.client.get(
+            f"/notes/{self.test_user_note.id}/",
+            {"omit": "profile_image,created_at,updated_at"},
+        )
+        self.assertEqual(response.data["property"], self.property.id)
+        self.assertNotIn("created_at", response.data)
+
 
 class NoteDetailViewTests(APITestCase):
     """Note Retrieve, Update and Deletion Tests"""
@@ -4,7 +4,10 @@ from rest_framework.generics import (
     RetrieveUpdateDestroyAPIView,
 )
 
-from property_direct_api.mixins import IsOwnerQuerysetFilter
+from property_direct_api.mixins import (
+    IsOwnerQuerysetFilter,
+    SparseFieldsetsMixin,
+)
 from property_direct_api.permissions import (
     AnonSafeMethodsOnly,
     IsOwnerOrReadOnly,
@@ -14,17 +17,21 @@ from .models import Note
 from .serializers import NoteDetailSerializer, NoteSerializer
 
 
-class NoteListView(IsOwnerQuerysetFilter, ListCreateAPIView):
+class NoteListView(
+    SparseFieldsetsMixin, IsOwnerQuerysetFilter, ListCreateAPIView
+):
     """Note List/Create View
 
     - Use IsOwnerQuerysetFilter Mixin to only display notes to their owners
       to keep notes private.
     - Create a note if authenticated.
+    - Supports sparse fieldsets (see SparseFieldsetsMixin).
     """
 
     model = Note
     serializer_class = NoteSerializer
     permission_classes = [AnonSafeMethodsOnly]
+    queryset_select_related = ["owner__profile"]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["property"]
 
@@ -32,13 +39,18 @@ class NoteListView(IsOwnerQuerysetFilter, ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class NoteDetailView(IsOwnerQuerysetFilter, RetrieveUpdateDestroyAPIView):
+class NoteDetailView(
+    SparseFieldsetsMixin,
+    IsOwnerQuerysetFilter,
+    RetrieveUpdateDestroyAPIView,
+):
     """Note Detail (Retrieve, Update and Destroy) View
 
     - Retrieve a Note by id and allow the owner to update or delete the
       object.
     - Use IsOwnerQuerysetFilter Mixin to only display notes to their owners
       to keep notes private.
+    - Supports sparse fieldsets (see SparseFieldsetsMixin).
     """
 
     model = Note
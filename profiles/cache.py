@@ -0,0 +1,5 @@
+from propertys.cache import ResponseCache
+
+# Only the generation is used, to invalidate profile response validators
+# (see ConditionalGetMixin) when property or follower counts change.
+profile_response_cache = ResponseCache("responses", "profile-responses")
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_alter_profile_telephone_landline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
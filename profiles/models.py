@@ -1,5 +1,71 @@
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Coalesce
+from followers.models import Follower
+from propertys.models import Property
+
+
+class ProfileQuerySet(models.QuerySet):
+    """Profile QuerySet.
+
+    Prefetch the information the profile serializers need, so serializing a
+    page of profiles does not query the database for each row.
+    """
+
+    def with_owner(self):
+        """Join the owner (owner, owner_id and is_seller fields)."""
+        return self.select_related("owner")
+
+    def with_counts(self, *names):
+        """Annotate 'property_count', 'followers_count' and 'following_count'
+        for each profile owner, or only the counts named.
+
+        Each count is a correlated subquery, rather than joining all three
+        relations in one GROUP BY (which produces the product of the three
+        row counts per profile before being collapsed).
+        """
+        counts = {
+            "property_count": (Property.objects, "owner"),
+            "followers_count": (Follower.objects, "followed"),
+            "following_count": (Follower.objects, "owner"),
+        }
+        return self.annotate(
+            **{name: self._count(*counts[name]) for name in names or counts}
+        )
+
+    @staticmethod
+    def _count(queryset, field):
+        """Count the objects in 'queryset' where 'field' is the profile
+        owner.
+        """
+        return Coalesce(
+            models.Subquery(
+                queryset.filter(**{field: models.OuterRef("owner")})
+                .order_by()
+                .values(field)
+                .annotate(count=models.Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+
+    def with_following_id(self, user):
+        """Annotate 'following_id', the id of the user's follower object for
+        each profile owner (None if not followed or the user is anonymous).
+        """
+        if user.is_anonymous:
+            return self.annotate(
+                following_id=models.Value(
+                    None, output_field=models.BigIntegerField()
+                )
+            )
+        return self.annotate(
+            following_id=models.Subquery(
+                Follower.objects.filter(
+                    owner=user, followed=models.OuterRef("owner")
+                ).values("pk")[:1]
+            )
+        )
 
 
 # CREDIT: Adapted from the Code Institute DRF Tutorial Project
@@ -21,9 +87,19 @@ class Profile(models.Model):
     image = models.ImageField(
         upload_to="images/", default="../default_profile_hthtjb.jpg"
     )
+    # Resized copies of the image (see property_direct_api.images),
+    # generated by a background job when an image is uploaded.
+    image_derivatives = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProfileQuerySet.as_manager()
+
+    # Image fields with derivatives
+    image_fields = ("image",)
+
     class Meta:
         ordering = ["-created_at"]
 
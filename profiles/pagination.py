@@ -0,0 +1,11 @@
+from property_direct_api.pagination import CountOptionalPagination
+
+
+class ProfilePagination(CountOptionalPagination):
+    """Page number pagination for the seller profile list.
+
+    Large result set counts are cached briefly, as the number of sellers
+    changes rarely.
+    """
+
+    count_mode = "cached"
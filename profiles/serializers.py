@@ -1,7 +1,12 @@
 import re
 
-from followers.models import Follower
-from property_direct_api.utils import validate_image_util
+from django.db import models
+from property_direct_api.instrumentation import TimedSerializerMixin
+from property_direct_api.serializers import (
+    ImageDerivativesField,
+    SparseFieldsetSerializerMixin,
+    ValidatedImageField,
+)
 from rest_framework import serializers
 
 from .models import Profile
@@ -9,7 +14,11 @@ from .models import Profile
 
 # CREDIT: Adapted from the Code Institute DRF Tutorial Project
 # URL:    https://github.com/Code-Institute-Solutions/drf-api
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(
+    TimedSerializerMixin,
+    SparseFieldsetSerializerMixin,
+    serializers.ModelSerializer,
+):
     """Serializer used for anonymous user requests.
 
     Hide contact information.
@@ -23,25 +32,33 @@ class ProfileSerializer(serializers.ModelSerializer):
     followers_count = serializers.ReadOnlyField()
     following_count = serializers.ReadOnlyField()
     is_seller = serializers.ReadOnlyField(source="owner.is_seller")
+    image_derivatives = ImageDerivativesField("image")
+
+    # Uploaded images are validated from their header only (see
+    # ValidatedImageField)
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: ValidatedImageField,
+    }
+
+    # Model attributes read by fields without a model field source (see
+    # SparseFieldsetSerializerMixin)
+    sparse_field_sources = {
+        "is_owner": ["owner_id"],
+        "following_id": [],
+        "image_derivatives": ["image", "image_derivatives"],
+    }
 
     def get_is_owner(self, obj):
-        return self.context["request"].user == obj.owner
+        return self.context["request"].user.id == obj.owner_id
 
     def get_following_id(self, obj):
         """Returns the id of the follower object, for each Profile being
         followed by currently authenticated User.
+
+        Annotated by the views (ProfileQuerySet.with_following_id).
         """
-        user = self.context["request"].user
-        if user.is_authenticated:
-            following = Follower.objects.filter(
-                owner=user, followed=obj.owner
-            ).first()
-            return following.id if following else None
-        return None
-
-    def validate_image(self, value):
-        valid_image = validate_image_util(value)
-        return valid_image
+        return getattr(obj, "following_id", None)
 
     def validate_email(self, value):
         # CREDIT: Basic regular expression for email address
@@ -79,6 +96,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             "name",
             "description",
             "image",
+            "image_derivatives",
             "following_id",
             "property_count",
             "followers_count",
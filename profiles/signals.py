@@ -1,8 +1,13 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from followers.models import Follower
+from property_direct_api.images import get_stale_image_fields
+from propertys.models import Property
 
+from .cache import profile_response_cache
 from .models import Profile
+from .tasks import generate_image_derivatives
 
 
 @receiver(post_save, sender=get_user_model())
@@ -10,3 +15,34 @@ def create_profile(sender, instance, created, **kwargs):
     """Signal to create a Profile object when a User object is created."""
     if created:
         Profile.objects.create(owner=instance)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=Follower)
+@receiver(post_delete, sender=Follower)
+@receiver(post_delete, sender=Property)
+def invalidate_profile_responses(sender, **kwargs):
+    """Signal to invalidate profile response validators when a Profile, or
+    an object counted in profile responses (Follower, Property), is saved or
+    deleted.
+    """
+    profile_response_cache.bump_generation()
+
+
+@receiver(post_save, sender=Property)
+def invalidate_profile_responses_on_create(sender, created, **kwargs):
+    """Signal to invalidate profile response validators when a Property is
+    created (changing its owner's property count).
+    """
+    if created:
+        profile_response_cache.bump_generation()
+
+
+@receiver(post_save, sender=Profile)
+def queue_image_derivatives(sender, instance, **kwargs):
+    """Signal to queue the generation of derivatives of a Profile's image
+    when saved with a new (or cleared) image.
+    """
+    if get_stale_image_fields(instance, Profile.image_fields):
+        generate_image_derivatives.enqueue(profile_id=instance.pk)
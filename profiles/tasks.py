@@ -0,0 +1,18 @@
+from jobs.registry import task
+from property_direct_api.images import update_image_derivatives
+
+from .cache import profile_response_cache
+from .models import Profile
+
+
+@task("profiles.generate_image_derivatives")
+def generate_image_derivatives(payloads):
+    """Generate the derivatives of a profile's uploaded image (payload:
+    'profile_id'), see property_direct_api.images.
+    """
+    for payload in payloads:
+        profile = Profile.objects.filter(pk=payload["profile_id"]).first()
+        if profile is not None and update_image_derivatives(
+            profile, Profile.image_fields
+        ):
+            profile_response_cache.bump_generation()
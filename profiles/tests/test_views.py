@@ -1,4 +1,8 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from followers.models import Follower
+from propertys.models import Property
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -37,6 +41,73 @@ class ProfileListViewTests(APITestCase):
         self.assertEqual(response.data["count"], 1)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_following_id_is_the_current_users_follower_object(self):
+        """Test following_id is the id of the authenticated user's follower
+        object for followed profiles, and None otherwise
+        """
+        other_user = get_user_model().objects.create_user(
+            username="other_user", password=self.shared_password
+        )
+        Follower.objects.create(owner=other_user, followed=self.test_seller)
+
+        self.client.login(username="test_user", password=self.shared_password)
+        response = self.client.get("/profiles/")
+        self.assertIsNone(response.data["results"][0]["following_id"])
+
+        follower = Follower.objects.create(
+            owner=self.test_user, followed=self.test_seller
+        )
+        response = self.client.get("/profiles/")
+        self.assertEqual(
+            response.data["results"][0]["following_id"], follower.id
+        )
+
+        self.client.logout()
+        response = self.client.get("/profiles/")
+        self.assertIsNone(response.data["results"][0]["following_id"])
+
+    def test_profile_counts(self):
+        """Test property, followers and following counts are correct when a
+        profile owner has several of each, and profiles can be ordered by
+        them
+        """
+        other_seller = get_user_model().objects.create_user(
+            username="other_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+        for _ in range(3):
+            Property.objects.create(
+                owner=self.test_seller,
+                street_name="test street name",
+                locality="test locality",
+                city="test city",
+                postcode="test postcode",
+                description="test description",
+                price=100000,
+                property_type="apartment",
+                num_bedrooms=1,
+                num_bathrooms=1,
+            )
+        Follower.objects.create(
+            owner=self.test_user, followed=self.test_seller
+        )
+        Follower.objects.create(owner=other_seller, followed=self.test_seller)
+        Follower.objects.create(owner=self.test_seller, followed=other_seller)
+
+        response = self.client.get("/profiles/?ordering=-followers_count")
+        seller_profile, other_seller_profile = response.data["results"]
+        self.assertEqual(seller_profile["owner"], "test_seller")
+        self.assertEqual(seller_profile["property_count"], 3)
+        self.assertEqual(seller_profile["followers_count"], 2)
+        self.assertEqual(seller_profile["following_count"], 1)
+        self.assertEqual(other_seller_profile["property_count"], 0)
+        self.assertEqual(other_seller_profile["followers_count"], 1)
+        self.assertEqual(other_seller_profile["following_count"], 1)
+
+        response = self.client.get("/profiles/?ordering=followers_count")
+        self.assertEqual(response.data["results"][0]["owner"], "other_seller")
+
 
 class ProfileDetailViewTests(APITestCase):
     """Profile Retrieve and Update Tests"""
@@ -104,3 +175,123 @@ class ProfileDetailViewTests(APITestCase):
         self.assertEqual(profile_count, initial_profile_count - 1)
         self.assertEqual(user_count, initial_user_count - 1)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class ProfileConditionalGetTests(APITestCase):
+    """Profile List and Detail View Conditional GET Tests"""
+
+    def setUp(self):
+
+        # Create Users / Profiles
+        self.shared_password = "testingPa$$w0rd!"
+
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+
+        self.test_user = get_user_model().objects.create_user(
+            username="test_user",
+            password=self.shared_password,
+        )
+        self.urls = ("/profiles/", f"/profiles/{self.test_seller.id}/")
+
+    def test_matching_etag_returns_not_modified(self):
+        """Test a request with a matching If-None-Match header returns 304
+        Not Modified
+        """
+        for url in self.urls:
+            etag = self.client.get(url)["ETag"]
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(
+                response.status_code, status.HTTP_304_NOT_MODIFIED
+            )
+
+    def test_etag_changes_when_followed(self):
+        """Test the ETag changes when a profile is followed (which changes
+        the followers count but not the profile)
+        """
+        self.client.login(username="test_user", password=self.shared_password)
+        for url in self.urls:
+            etag = self.client.get(url)["ETag"]
+            follower = Follower.objects.create(
+                owner=self.test_user, followed=self.test_seller
+            )
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            follower.delete()
+
+    def test_private_profiles_are_never_not_modified(self):
+        """Test conditional requests for a profile the user cannot view, or
+        that does not exist, are not answered with 304 Not Modified
+        """
+        last_modified = self.client.get("/profiles/")["Last-Modified"]
+        response = self.client.get(
+            f"/profiles/{self.test_user.id}/",
+            HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(
+            "/profiles/999/", HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ProfileSparseFieldsetTests(APITestCase):
+    """Profile List and Detail View Sparse Fieldset Tests"""
+
+    def setUp(self):
+
+        # Create Users / Profiles
+        self.shared_password = "testingPa$$w0rd!"
+
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+        self.profile = Profile.objects.get(owner=self.test_seller)
+
+    def test_only_requested_counts_are_annotated(self):
+        """Test only the requested fields are returned, and the counts are
+        only calculated when requested or used for ordering
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/profiles/", {"fields": "id,name,is_seller"}
+            )
+        self.assertEqual(
+            response.data["results"][0],
+            {"id": self.profile.id, "name": "", "is_seller": True},
+        )
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertNotIn("COUNT", sql)
+        self.assertNotIn('"profiles_profile"."description"', sql)
+
+        response = self.client.get(
+            "/profiles/",
+            {"fields": "id,followers_count", "ordering": "-property_count"},
+        )
+        self.assertEqual(
+            response.data["results"][0],
+            {"id": self.profile.id, "followers_count": 0},
+        )
+
+    def test_detail_omit_and_unknown_fields(self):
+        """Test omitted fields are not returned by the detail view, and
+        unknown fields are rejected
+        """
+        response = self.client.get(
+            f"/profiles/{self.profile.id}/",
+            {"omit": "description,image,image_derivatives"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("image", response.data)
+        self.assertEqual(response.data["owner"], "test_seller")
+
+        response = self.client.get(
+            f"/profiles/{self.profile.id}/", {"fields": "email"}
+        )
+        # Contact information is only available to authenticated users
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,4 +1,8 @@
-from django.db.models import Count
+from django.db.models import Q
+from property_direct_api.mixins import (
+    ConditionalGetMixin,
+    SparseFieldsetsMixin,
+)
 from property_direct_api.permissions import (
     IsOwner,
     IsProfileOwnerOrViewingSellerProfile,
@@ -10,27 +14,59 @@ from rest_framework.generics import (
     RetrieveUpdateAPIView,
 )
 
+from .cache import profile_response_cache
 from .models import Profile
+from .pagination import ProfilePagination
 from .serializers import ProfileSerializer, ProfileSerializerAuthenticated
 
 
-class ProfileListView(ListAPIView):
+class ProfileQuerysetMixin(SparseFieldsetsMixin):
+    """Prepare the queryset of the profile views.
+
+    - Supports sparse fieldsets (see SparseFieldsetsMixin).
+    - Annotate only the counts and following id returned, or used to order
+      the profiles.
+    """
+
+    count_fields = ["property_count", "followers_count", "following_count"]
+
+    def get_queryset(self):
+        """Join the profile owner and annotate the counts and the id of the
+        current user's follower object for each profile.
+        """
+        ordering_param = self.request.query_params.get("ordering", "")
+        ordering = {
+            term.strip().lstrip("-") for term in ordering_param.split(",")
+        }
+        queryset = self.queryset.with_owner()
+        counts = [
+            name
+            for name in self.count_fields
+            if self.is_field_requested(name) or name in ordering
+        ]
+        if counts:
+            queryset = queryset.with_counts(*counts)
+        if self.is_field_requested("following_id"):
+            queryset = queryset.with_following_id(self.request.user)
+        return queryset
+
+
+class ProfileListView(ProfileQuerysetMixin, ConditionalGetMixin, ListAPIView):
     """Profile List View
 
     - Only display seller profiles to keep standard user profiles private.
     - Return different Serializer content based on authentication state.
+    - Supports conditional requests (see ConditionalGetMixin).
+    - Supports sparse fieldsets (see ProfileQuerysetMixin).
     """
 
     queryset = (
         Profile.objects.all()
         .filter(owner__is_seller=True)
-        .annotate(
-            property_count=Count("owner__property", distinct=True),
-            followers_count=Count("owner__followed", distinct=True),
-            following_count=Count("owner__following", distinct=True),
-        )
         .order_by("-created_at")
     )
+    pagination_class = ProfilePagination
+    response_cache = profile_response_cache
     filter_backends = [OrderingFilter]
     ordering_fields = [
         "property_count",
@@ -38,6 +74,12 @@ class ProfileListView(ListAPIView):
         "following_count",
     ]
 
+    def get_validator_queryset(self):
+        """Return the seller profiles listed (the ordering, which does not
+        change which profiles are listed, is not applied).
+        """
+        return Profile.objects.filter(owner__is_seller=True)
+
     def get_serializer_class(self):
         """Return different serializers based on authentication status
 
@@ -49,19 +91,29 @@ class ProfileListView(ListAPIView):
             return ProfileSerializer
 
 
-class ProfileDetailView(RetrieveUpdateAPIView):
+class ProfileDetailView(
+    ProfileQuerysetMixin, ConditionalGetMixin, RetrieveUpdateAPIView
+):
     """Profile Detail (Retrieve and Update) View
 
     - Custom permissions class to control profile privacy (and permissions).
     - Return different Serializer content based on authentication state.
+    - Supports conditional requests (see ConditionalGetMixin).
+    - Supports sparse fieldsets (see ProfileQuerysetMixin).
     """
 
-    queryset = Profile.objects.annotate(
-        property_count=Count("owner__property", distinct=True),
-        followers_count=Count("owner__followed", distinct=True),
-        following_count=Count("owner__following", distinct=True),
-    ).order_by("-created_at")
+    queryset = Profile.objects.order_by("-created_at")
     permission_classes = [IsProfileOwnerOrViewingSellerProfile]
+    response_cache = profile_response_cache
+
+    def get_validator_queryset(self):
+        """Return the profile, if it can be viewed by the current user (see
+        IsProfileOwnerOrViewingSellerProfile).
+        """
+        visible = Q(owner__is_seller=True)
+        if self.request.user.is_authenticated:
+            visible |= Q(owner=self.request.user)
+        return Profile.objects.filter(visible, pk=self.kwargs["pk"])
 
     def get_serializer_class(self):
         """Return different serializers based on authentication status.
@@ -0,0 +1,210 @@
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .utils import MAX_IMAGE_PIXELS
+
+# Resized copies (derivatives) of uploaded images, so clients can download an
+# image at the size it is displayed (e.g. a list card) rather than the full
+# upload (up to 4096px and 2MB, see validate_image_util).
+#
+# Derivatives are generated out-of-band by the background workers (see the
+# propertys and profiles tasks), and saved in the file storage alongside the
+# original. Their names are recorded in the model's 'image_derivatives'
+# field, keyed by image field, along with the name of the original they were
+# generated from (so derivatives of a replaced image are never returned).
+
+# Bounding box (width, height) of each derivative. Images are scaled down to
+# fit, keeping their aspect ratio (floorplans and EPCs must not be cropped),
+# and are never scaled up. Ordered largest first, so each derivative is
+# resized from the previous one.
+IMAGE_DERIVATIVE_SIZES = {
+    "full": (1600, 1600),
+    "card": (640, 480),
+    "thumbnail": (160, 160),
+}
+
+# Pillow format and save options of each derivative file type. WebP for
+# clients supporting it, and JPEG as a fallback.
+IMAGE_DERIVATIVE_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def has_uploaded_image(instance, field_name):
+    """Return whether an image field holds an uploaded image, rather than
+    being empty or the field's default image.
+    """
+    field_file = getattr(instance, field_name)
+    default = instance._meta.get_field(field_name).get_default()
+    return bool(field_file) and field_file.name != default
+
+
+def get_stale_image_fields(instance, field_names):
+    """Return the image fields of a model instance whose derivatives are
+    missing or out of date (including cleared images with derivatives).
+    """
+    stale_field_names = []
+    for field_name in field_names:
+        derivatives = instance.image_derivatives.get(field_name)
+        if has_uploaded_image(instance, field_name):
+            name = getattr(instance, field_name).name
+            if (derivatives or {}).get("name") != name:
+                stale_field_names.append(field_name)
+        elif derivatives:
+            stale_field_names.append(field_name)
+    return stale_field_names
+
+
+def render_image_derivatives(image):
+    """Resize an image to each derivative size and encode it in each file
+    type.
+
+    Args:
+        image (Image): Source image (Pillow).
+
+    Returns:
+        dict: Encoded image (bytes) by size and file type.
+    """
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    rendered = {}
+    for size, bounding_box in IMAGE_DERIVATIVE_SIZES.items():
+        image = image.copy()
+        image.thumbnail(bounding_box, Image.Resampling.LANCZOS)
+        # JPEG has no transparency, so flatten onto a white background
+        flattened = image
+        if image.mode == "RGBA":
+            flattened = Image.new("RGB", image.size, "white")
+            flattened.paste(image, mask=image.getchannel("A"))
+
+        rendered[size] = {}
+        for file_type, format_options in IMAGE_DERIVATIVE_FORMATS.items():
+            image_format, options = format_options
+            output = BytesIO()
+            (image if image_format == "WEBP" else flattened).save(
+                output, image_format, **options
+            )
+            rendered[size][file_type] = output.getvalue()
+    return rendered
+
+
+def generate_image_derivatives(field_file):
+    """Generate and store the derivatives of an uploaded image.
+
+    Args:
+        field_file (ImageFieldFile): The uploaded image.
+
+    Returns:
+        dict: Name of the original ('name'), and stored file names of the
+        derivatives by size and file type.
+    """
+    with field_file.open("rb") as file:
+        with Image.open(file) as image:
+            # Images uploaded before the pixel limit was enforced are not
+            # decoded, as they could need gigabytes of memory
+            if image.width * image.height > MAX_IMAGE_PIXELS:
+                raise ValueError(
+                    f"{field_file.name} has more than {MAX_IMAGE_PIXELS} "
+                    "pixels."
+                )
+            # Decode JPEGs at a reduced scale close to the largest
+            # derivative, rather than at full size
+            image.draft("RGB", IMAGE_DERIVATIVE_SIZES["full"])
+            rendered = render_image_derivatives(image)
+
+    root = posixpath.splitext(field_file.name)[0]
+    derivatives = {"name": field_file.name}
+    for size, files in rendered.items():
+        derivatives[size] = {
+            file_type: field_file.storage.save(
+                f"{root}_{size}.{file_type}", ContentFile(content)
+            )
+            for file_type, content in files.items()
+        }
+    return derivatives
+
+
+def update_image_derivatives(instance, field_names):
+    """Generate the missing derivatives of the image fields of a model
+    instance, and remove those of images that were cleared.
+
+    The instance is updated only if its images have not changed since it was
+    loaded, as a job is queued for the new images when they change. The
+    'updated_at' timestamp is set, so conditional GET validators change.
+    The files of the derivatives replaced (or, if the instance was not
+    updated, of those generated) are deleted from storage.
+
+    Args:
+        instance (Model): Instance with an 'image_derivatives' field.
+        field_names (iterable): Names of the image fields.
+
+    Returns:
+        bool: Whether the instance was updated.
+    """
+    stale_field_names = get_stale_image_fields(instance, field_names)
+    if not stale_field_names:
+        return False
+    derivatives = dict(instance.image_derivatives)
+    for field_name in stale_field_names:
+        if has_uploaded_image(instance, field_name):
+            derivatives[field_name] = generate_image_derivatives(
+                getattr(instance, field_name)
+            )
+        else:
+            del derivatives[field_name]
+    updated = bool(
+        type(instance)
+        .objects.filter(
+            pk=instance.pk,
+            **{
+                field_name: getattr(instance, field_name).name
+                for field_name in field_names
+            },
+        )
+        .update(image_derivatives=derivatives, updated_at=timezone.now())
+    )
+
+    unused = instance.image_derivatives if updated else derivatives
+    for field_name in stale_field_names:
+        if unused.get(field_name):
+            delete_image_derivatives(
+                unused[field_name], getattr(instance, field_name).storage
+            )
+    return updated
+
+
+def delete_image_derivatives(derivatives, storage):
+    """Delete the files of an image's derivatives from storage.
+
+    Args:
+        derivatives (dict): Derivatives, as recorded in 'image_derivatives'.
+        storage (Storage): Storage holding the files.
+    """
+    for size in IMAGE_DERIVATIVE_SIZES:
+        for name in derivatives.get(size, {}).values():
+            storage.delete(name)
+
+
+def get_image_derivative_urls(instance, field_name):
+    """Return the URLs of the derivatives of an image field, by size and file
+    type, or None if they have not been generated for the current image.
+    """
+    derivatives = instance.image_derivatives.get(field_name)
+    field_file = getattr(instance, field_name)
+    if not derivatives or derivatives.get("name") != field_file.name:
+        return None
+    return {
+        size: {
+            file_type: field_file.storage.url(name)
+            for file_type, name in derivatives[size].items()
+        }
+        for size in IMAGE_DERIVATIVE_SIZES
+    }
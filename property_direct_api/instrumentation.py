@@ -0,0 +1,170 @@
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Metrics for the request being handled, None outside of instrumented requests
+# so that timers are a no-op.
+current_metrics = ContextVar("current_metrics", default=None)
+
+
+class RequestMetrics:
+    """Timings collected while handling a single request.
+
+    - Durations are kept in milliseconds.
+    - Executed SQL is captured (up to max_captured_queries statements, without
+      parameters) so it can be logged if the request turns out to be slow.
+    """
+
+    def __init__(self, max_captured_queries):
+        self.max_captured_queries = max_captured_queries
+        self.queries = 0
+        self.db_ms = 0.0
+        self.postcode_ms = 0.0
+        self.serializer_ms = 0.0
+        self.captured_sql = []
+        self.timer_depth = {}
+
+    def record_query(self, sql, duration_ms):
+        self.queries += 1
+        self.db_ms += duration_ms
+        if len(self.captured_sql) < self.max_captured_queries:
+            self.captured_sql.append((sql, duration_ms))
+
+    def add(self, name, duration_ms):
+        setattr(self, f"{name}_ms", getattr(self, f"{name}_ms") + duration_ms)
+
+
+@contextmanager
+def timer(name):
+    """Add the time spent in the block to the current request's metrics.
+
+    Nested timers of the same name (e.g. a nested serializer) are only timed
+    by the outermost block, so time is not counted twice.
+
+    Args:
+        name (string): Metric to add to ('postcode' or 'serializer').
+    """
+    metrics = current_metrics.get()
+    if metrics is None or metrics.timer_depth.get(name):
+        yield
+        return
+
+    metrics.timer_depth[name] = 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, (time.perf_counter() - start) * 1000)
+        metrics.timer_depth[name] = 0
+
+
+class TimedSerializerMixin:
+    """Record time spent serializing objects in the request's metrics."""
+
+    def to_representation(self, instance):
+        with timer("serializer"):
+            return super().to_representation(instance)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting and timing each query."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, (time.perf_counter() - start) * 1000)
+
+
+def server_timing(metrics, total_ms):
+    """Format metrics as a Server-Timing header value."""
+    return ", ".join(
+        [
+            f'db;dur={metrics.db_ms:.1f};desc="{metrics.queries} queries"',
+            f"postcode;dur={metrics.postcode_ms:.1f}",
+            f"serializer;dur={metrics.serializer_ms:.1f}",
+            f"total;dur={total_ms:.1f}",
+        ]
+    )
+
+
+class InstrumentationMiddleware:
+    """Record SQL, postcode lookup, serializer and total time per request.
+
+    - Enabled with the INSTRUMENTATION_ENABLED setting.
+    - Timings are returned in the Server-Timing header and logged as a
+      single structured line per request.
+    - Requests slower than INSTRUMENTATION_SLOW_REQUEST_MS are logged as a
+      warning, including the SQL captured.
+    """
+
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_request_ms = settings.INSTRUMENTATION_SLOW_REQUEST_MS
+        self.max_captured_queries = (
+            settings.INSTRUMENTATION_MAX_CAPTURED_QUERIES
+        )
+
+    def __call__(self, request):
+        metrics = RequestMetrics(self.max_captured_queries)
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(record_query)
+                    )
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        response["Server-Timing"] = server_timing(metrics, total_ms)
+        self.log(request, response, metrics, total_ms)
+        return response
+
+    def log(self, request, response, metrics, total_ms):
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 1),
+            "queries": metrics.queries,
+            "db_ms": round(metrics.db_ms, 1),
+            "postcode_ms": round(metrics.postcode_ms, 1),
+            "serializer_ms": round(metrics.serializer_ms, 1),
+        }
+        message = " ".join(f"{key}={value}" for key, value in fields.items())
+
+        if total_ms < self.slow_request_ms:
+            logger.info(message, extra={"metrics": fields})
+            return
+
+        sql = "\n".join(
+            f"  [{duration_ms:.1f}ms] {statement}"
+            for statement, duration_ms in metrics.captured_sql
+        )
+        if metrics.queries > len(metrics.captured_sql):
+            sql += (
+                f"\n  ... {metrics.queries - len(metrics.captured_sql)} more"
+                " queries not captured"
+            )
+        logger.warning(
+            "slow_request %s\n%s",
+            message,
+            sql,
+            extra={"metrics": fields},
+        )
@@ -1,4 +1,21 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
 class IsOwnerQuerysetFilter:
+    # Related objects fetched with the queryset (using select_related), to
+    # avoid a query per object when serialized.
+    queryset_select_related = []
+
     def get_queryset(self):
         """Filter queryset to only objects where the currently authenticated
         user is the owner."""
@@ -6,5 +23,305 @@ class IsOwnerQuerysetFilter:
         if current_user.is_anonymous:
             queryset = self.model.objects.none()
         else:
-            queryset = self.model.objects.filter(owner=current_user)
+            queryset = self.model.objects.filter(
+                owner=current_user
+            ).select_related(*self.queryset_select_related)
         return queryset
+
+
+class AnonymousResponseCacheMixin:
+    """Serve GET requests from anonymous users from a response cache.
+
+    - 'response_cache' is a ResponseCache (see propertys.cache), which is
+      invalidated when the objects the view returns are written.
+    - Responses to authenticated users are never cached, as they include
+      per-user fields (e.g. 'is_owner').
+    - Only successful responses are cached. The response data is cached and
+      rendered for each request, so any renderer can be used.
+    - The 'X-Cache' header reports whether the response was a hit or miss.
+    """
+
+    response_cache = None
+
+    def get_response_cache_params(self):
+        """Return the query parameters identifying a cached response, in a
+        consistent order.
+        """
+        return sorted(self.request.query_params.lists())
+
+    def get_response_cache_key(self, request):
+        return self.response_cache.make_key(
+            request.build_absolute_uri(request.path),
+            self.get_response_cache_params(),
+        )
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+
+        start = time.perf_counter()
+        key = self.get_response_cache_key(request)
+        data = self.response_cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+        else:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                self.response_cache.set(key, response.data)
+            response["X-Cache"] = "MISS"
+        self.response_cache.record(
+            data is not None, (time.perf_counter() - start) * 1000
+        )
+        return response
+
+
+class ConditionalGetMixin:
+    """Return ETag and Last-Modified validators, and 304 Not Modified
+    responses to conditional GET requests, without serializing the response.
+
+    - Validators are calculated from MAX(updated_at) and the number of rows in
+      'get_validator_queryset()' (the objects the response is made from, in a
+      single aggregate query), and the generation of 'response_cache', which
+      is bumped on writes to the objects in the response (including related
+      objects that do not change 'updated_at', e.g. bookmarks).
+    - Responses to anonymous users of views with an anonymous response cache
+      (see AnonymousResponseCacheMixin) are only as fresh as its generation,
+      so their validators are calculated from the generation alone. No query
+      is made when the response is in the cache.
+    - Detail views with no object in 'get_validator_queryset()' return no
+      validators, so missing (or hidden) objects are never 'Not Modified'.
+    - The ETag also depends on the request path and query string, the user
+      (for per-user fields) and the response media type.
+    - Last-Modified is the later of MAX(updated_at) and the time the
+      generation was bumped.
+    """
+
+    response_cache = None
+
+    def get_validator_queryset(self):
+        raise NotImplementedError(
+            "ConditionalGetMixin requires get_validator_queryset()."
+        )
+
+    def uses_response_cache(self, request):
+        """Return whether the response to the request is served from the
+        anonymous response cache (see AnonymousResponseCacheMixin).
+        """
+        return not request.user.is_authenticated and isinstance(
+            self, AnonymousResponseCacheMixin
+        )
+
+    def get_validators(self, request):
+        """Return the ETag and Last-Modified (datetime) of the response, or
+        None if it has no validators.
+        """
+        generation = self.response_cache.get_generation()
+        updated_at = count = None
+        uses_response_cache = self.uses_response_cache(request)
+        if not uses_response_cache or (
+            self.response_cache.get(self.get_response_cache_key(request))
+            is None
+        ):
+            aggregate = (
+                self.get_validator_queryset()
+                .order_by()
+                .aggregate(updated_at=Max("updated_at"), count=Count("pk"))
+            )
+            if not aggregate["count"] and self.lookup_field in self.kwargs:
+                return None
+            # Anonymous validators must match those of responses later
+            # served from the cache, so the query only checks objects exist
+            if not uses_response_cache:
+                updated_at, count = aggregate["updated_at"], aggregate["count"]
+        etag = hashlib.md5(
+            repr(
+                (
+                    request.get_full_path(),
+                    request.user.pk,
+                    request.accepted_media_type,
+                    count,
+                    updated_at,
+                    generation,
+                )
+            ).encode()
+        ).hexdigest()
+        generation_time = datetime.fromtimestamp(
+            generation / 1e9, tz=timezone.utc
+        )
+        last_modified = max(updated_at or generation_time, generation_time)
+        return f'"{etag}"', last_modified
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators(request)
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+        etag, last_modified = validators
+        last_modified_timestamp = int(last_modified.timestamp())
+        not_modified_response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified_timestamp
+        )
+        if not_modified_response is not None:
+            response = not_modified_response
+        else:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified_timestamp)
+        return response
+
+
+class SparseFieldsetsMixin:
+    """Return only the fields requested with the 'fields' query parameter,
+    or all fields except those in the 'omit' parameter (comma separated
+    field names, e.g. '?fields=id,latitude,longitude' for map pins).
+
+    - Unrequested fields are not serialized (the serializer must use
+      SparseFieldsetSerializerMixin), so their SerializerMethodField methods
+      are never called.
+    - The queryset loads only the columns of the requested fields (using
+      only()), and joins only the relations they read (using
+      select_related), see get_sparse_queryset.
+    - Unknown field names are rejected (400 Bad Request).
+    - Only GET (and HEAD) requests are affected, so writes always return the
+      full object.
+    """
+
+    def get_sparse_fields(self):
+        """Return the names of the fields requested, or None if all fields
+        are returned.
+        """
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = None
+            self._sparse_field_sources = {}
+            if self.request.method in permissions.SAFE_METHODS:
+                self._sparse_fields = self._parse_sparse_fields()
+        return self._sparse_fields
+
+    def _parse_sparse_fields(self):
+        params = {
+            param: [
+                name.strip()
+                for name in self.request.query_params.get(param, "").split(",")
+                if name.strip()
+            ]
+            for param in ("fields", "omit")
+        }
+        if not params["fields"] and not params["omit"]:
+            return None
+
+        serializer = self.get_serializer_class()()
+        available = serializer.fields
+        errors = {}
+        for param, names in params.items():
+            unknown = [name for name in names if name not in available]
+            if unknown:
+                errors[param] = [
+                    f"Unknown field '{name}'." for name in unknown
+                ]
+        if errors:
+            raise ValidationError(errors)
+
+        requested = params["fields"] or list(available)
+        sparse_fields = {
+            name for name in requested if name not in params["omit"]
+        }
+        self._sparse_field_sources = {
+            name: serializer.sparse_field_sources.get(
+                name, None if field.source == "*" else [field.source]
+            )
+            for name, field in available.items()
+            if name in sparse_fields
+        }
+        return sparse_fields
+
+    def is_field_requested(self, name):
+        """Return whether a field is returned, so views can skip queryset
+        annotations only used by unrequested fields.
+        """
+        sparse_fields = self.get_sparse_fields()
+        return sparse_fields is None or name in sparse_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["sparse_fields"] = self.get_sparse_fields()
+        return context
+
+    def filter_queryset(self, queryset):
+        return self.get_sparse_queryset(super().filter_queryset(queryset))
+
+    def get_sparse_queryset(self, queryset):
+        """Load only the columns, and join only the relations, read by the
+        requested fields.
+
+        The model attributes read by each field (its 'source', or the paths
+        in the serializer's 'sparse_field_sources') are followed through
+        forward and one-to-one relations. Attributes which are not model
+        fields must be queryset annotations; otherwise what the field reads
+        is unknown, and all columns are loaded (joining only the relations
+        needed).
+        """
+        if self.get_sparse_fields() is None:
+            return queryset
+
+        model = queryset.model
+        only = {model._meta.pk.name}
+        select_related = set()
+        known_sources = True
+        for paths in self._sparse_field_sources.values():
+            if paths is None:
+                known_sources = False
+                continue
+            for path in paths:
+                if not self._add_sparse_path(
+                    queryset, path.split("."), only, select_related
+                ):
+                    known_sources = False
+
+        # select_related() with no fields would follow every foreign key
+        queryset = queryset.select_related(None)
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if known_sources:
+            queryset = queryset.only(*sorted(only))
+        return queryset
+
+    @staticmethod
+    def _add_sparse_path(queryset, attrs, only, select_related):
+        """Add the columns and relations read by a path of attributes to
+        'only' and 'select_related' (as lookups). Returns False if the path
+        does not lead to a model field or queryset annotation.
+        """
+        model = queryset.model
+        prefix = ""
+        for index, attr in enumerate(attrs):
+            try:
+                field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # A queryset annotation, or a file's attribute (e.g. 'url')
+                return index > 0 or attr in queryset.query.annotations
+            lookup = prefix + field.name
+            remaining = attrs[index + 1 :]
+            if not field.is_relation:
+                only.add(lookup)
+                return True
+            if field.many_to_many or field.one_to_many:
+                return False
+            if field.concrete:
+                only.add(lookup)
+                # The foreign key column (e.g. 'owner_id'), or the related
+                # object itself (e.g. for a PrimaryKeyRelatedField)
+                if attr == field.attname or not remaining:
+                    return True
+            elif not remaining:
+                return False
+            else:
+                # Reverse one-to-one, joined on the related model's key
+                only.add(f"{lookup}__{field.field.name}")
+            select_related.add(lookup)
+            model = field.related_model
+            prefix = f"{lookup}__"
+        return True
@@ -0,0 +1,163 @@
+import hashlib
+import json
+from math import ceil
+
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CountOptionalPagination(PageNumberPagination):
+    """Page number pagination that avoids counting the full result set where
+    possible.
+
+    - One more row than the page size is fetched to tell whether there is a
+      next page, so 'next' links are accurate without a count.
+    - The count is skipped (returned as None) when requested with the query
+      parameter 'count=false'.
+    - On the last page the count is known from the rows fetched, so the
+      COUNT(*) query is skipped.
+    - 'count_mode' configures how other counts are found (per view, by
+      subclassing):
+        - 'exact' - Always run COUNT(*).
+        - 'cached' - Counts of at least 'count_threshold' rows are cached for
+          'count_cache_timeout' seconds, so may be slightly out of date.
+        - 'estimated' - Use the database query planner's row estimate when it
+          is at least 'count_threshold' rows (PostgreSQL only, falls back to
+          'cached' on other databases).
+    """
+
+    count_query_param = "count"
+    count_mode = "exact"
+    count_threshold = 1000
+    count_cache_timeout = 60
+    template = "rest_framework/pagination/previous_and_next.html"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        self.include_count = request.query_params.get(
+            self.count_query_param, ""
+        ).lower() not in ("false", "0")
+        self.page_number = self.get_page_number(request, queryset, page_size)
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset : offset + page_size + 1])
+        if not rows and self.page_number != 1:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=self.page_number,
+                    message="That page contains no results",
+                )
+            )
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+
+        if not self.include_count:
+            self.count = None
+        elif not self.has_next:
+            self.count = offset + len(self.page)
+        else:
+            self.count = self.get_count(queryset)
+
+        self.display_page_controls = self.has_next or self.page_number > 1
+        return self.page
+
+    def get_page_number(self, request, queryset, page_size):
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if page_number in self.last_page_strings:
+            return max(1, ceil(queryset.count() / page_size))
+        try:
+            page_number = int(page_number)
+            if page_number < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number,
+                    message="That page number is not a valid integer",
+                )
+            )
+        return page_number
+
+    def get_count(self, queryset):
+        if self.count_mode == "estimated":
+            estimate = self.estimate_count(queryset)
+            if estimate is not None and estimate >= self.count_threshold:
+                return estimate
+        if self.count_mode in ("cached", "estimated"):
+            return self.get_cached_count(queryset)
+        return queryset.count()
+
+    def get_cached_count(self, queryset):
+        """Return the count of a queryset, cached if above the threshold."""
+        sql, params = queryset.query.sql_with_params()
+        query_hash = hashlib.md5(f"{queryset.db}:{sql}:{params!r}".encode())
+        key = f"pagination-count:{query_hash.hexdigest()}"
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            if count >= self.count_threshold:
+                cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    @staticmethod
+    def estimate_count(queryset):
+        """Return the query planner's estimate of the number of rows in a
+        queryset, or None if the database does not provide one.
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        return response_schema
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.page_query_param, self.page_number + 1
+        )
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.page_number - 1
+        )
+
+    def get_html_context(self):
+        return {
+            "previous_url": self.get_previous_link(),
+            "next_url": self.get_next_link(),
+        }
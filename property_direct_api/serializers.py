@@ -1,6 +1,9 @@
 from dj_rest_auth.serializers import UserDetailsSerializer
 from rest_framework import serializers
 
+from .images import get_image_derivative_urls
+from .utils import validate_image_util
+
 
 # CREDIT: Adapted from the Code Institute DRF Tutorial Project
 # URL:    https://github.com/Code-Institute-Solutions/drf-api
@@ -18,3 +21,61 @@ class CurrentUserSerializer(UserDetailsSerializer):
             "profile_image",
             "is_seller",
         )
+
+
+class ImageDerivativesField(serializers.Field):
+    """Read-only URLs of the derivatives of an image field (see
+    property_direct_api.images), by size ('thumbnail', 'card', 'full') and
+    file type ('webp', 'jpeg'). None until they have been generated, when
+    clients should use the original image.
+
+    The model instance holding the image field is the serializer's object
+    by default, or the object at 'source' (e.g. "owner.profile").
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs.setdefault("source", "*")
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        return get_image_derivative_urls(instance, self.image_field)
+
+
+class ValidatedImageField(serializers.ImageField):
+    """Image upload field validated by validate_image_util.
+
+    Replaces the default validation of ImageField (which parses the whole
+    file with Pillow), so uploads are validated from the image header only.
+    """
+
+    def to_internal_value(self, data):
+        file_object = serializers.FileField.to_internal_value(self, data)
+        return validate_image_util(file_object)
+
+
+class SparseFieldsetSerializerMixin:
+    """Serialize only the fields requested by the view (see
+    SparseFieldsetsMixin), as the 'sparse_fields' context, so unrequested
+    fields (and their SerializerMethodField methods) are never evaluated.
+
+    'sparse_field_sources' lists the model attributes read by each field
+    without a model field source (e.g. SerializerMethodField, or a source of
+    "*"), as dotted paths, so the view loads the columns and joins the
+    relations a field needs only when it is requested. Fields reading only
+    queryset annotations map to an empty list.
+    """
+
+    sparse_field_sources = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        sparse_fields = self.context.get("sparse_fields")
+        if sparse_fields is None:
+            return fields
+        return {
+            name: field
+            for name, field in fields.items()
+            if name in sparse_fields
+        }
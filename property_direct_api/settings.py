@@ -45,11 +45,129 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Cache Configuration
+# The postcode cache uses LocMemCache by default, which evicts the least
+# recently used entries once MAX_ENTRIES is reached. A CULL_FREQUENCY equal to
+# MAX_ENTRIES culls a single entry at a time.
+# The response cache (anonymous property list, search and detail responses)
+# is invalidated by a generation counter stored in the cache itself. With
+# several worker processes use a backend shared between them (e.g. file based,
+# Memcached or Redis), otherwise writes only invalidate the worker's own
+# LocMemCache and other workers serve stale responses until the TIMEOUT.
+POSTCODE_CACHE_MAX_ENTRIES = int(
+    environ.get("POSTCODE_CACHE_MAX_ENTRIES", 10000)
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "postcodes": {
+        "BACKEND": environ.get(
+            "POSTCODE_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": environ.get("POSTCODE_CACHE_LOCATION", "postcodes"),
+        "TIMEOUT": int(environ.get("POSTCODE_CACHE_TIMEOUT", 60 * 60 * 24)),
+        "OPTIONS": {
+            "MAX_ENTRIES": POSTCODE_CACHE_MAX_ENTRIES,
+            "CULL_FREQUENCY": POSTCODE_CACHE_MAX_ENTRIES,
+        },
+    },
+    "responses": {
+        "BACKEND": environ.get(
+            "RESPONSE_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": environ.get("RESPONSE_CACHE_LOCATION", "responses"),
+        "TIMEOUT": int(environ.get("RESPONSE_CACHE_TIMEOUT", 60)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(
+                environ.get("RESPONSE_CACHE_MAX_ENTRIES", 1000)
+            ),
+        },
+    },
+}
+
+# Time (in seconds) invalid postcodes are cached for.
+POSTCODE_CACHE_NEGATIVE_TIMEOUT = int(
+    environ.get("POSTCODE_CACHE_NEGATIVE_TIMEOUT", 60 * 60)
+)
+
+# Postcode API Client Configuration
+POSTCODES_API_URL = environ.get(
+    "POSTCODES_API_URL", "https://api.postcodes.io"
+)
+POSTCODES_API_CONNECT_TIMEOUT = float(
+    environ.get("POSTCODES_API_CONNECT_TIMEOUT", 2)
+)
+POSTCODES_API_READ_TIMEOUT = float(
+    environ.get("POSTCODES_API_READ_TIMEOUT", 3)
+)
+POSTCODES_API_RETRIES = int(environ.get("POSTCODES_API_RETRIES", 2))
+POSTCODES_API_RETRY_BACKOFF = float(
+    environ.get("POSTCODES_API_RETRY_BACKOFF", 0.2)
+)
+POSTCODES_API_POOL_SIZE = int(environ.get("POSTCODES_API_POOL_SIZE", 10))
+# Consecutive failed requests before the circuit breaker opens, and the time
+# (in seconds) before a trial request is allowed through an open breaker.
+POSTCODES_API_FAILURE_THRESHOLD = int(
+    environ.get("POSTCODES_API_FAILURE_THRESHOLD", 5)
+)
+POSTCODES_API_RESET_TIMEOUT = float(
+    environ.get("POSTCODES_API_RESET_TIMEOUT", 30)
+)
+
+# Background Jobs (see jobs app, run with the run_workers command)
+# Seconds between polls for jobs, seconds before a job claimed by a worker
+# that stopped responding is retried, and the base retry delay (in seconds,
+# doubled for each failed attempt up to JOBS_MAX_RETRY_DELAY).
+JOBS_POLL_INTERVAL = float(environ.get("JOBS_POLL_INTERVAL", 1))
+JOBS_LOCK_TIMEOUT = float(environ.get("JOBS_LOCK_TIMEOUT", 300))
+JOBS_RETRY_DELAY = float(environ.get("JOBS_RETRY_DELAY", 10))
+JOBS_MAX_RETRY_DELAY = float(environ.get("JOBS_MAX_RETRY_DELAY", 3600))
+
+# Request Instrumentation
+# Per request timings (SQL, postcode lookups, serialization and total time)
+# returned in the Server-Timing header and logged. Requests slower than
+# INSTRUMENTATION_SLOW_REQUEST_MS are logged with the SQL they executed.
+INSTRUMENTATION_ENABLED = bool(environ.get("INSTRUMENTATION_ENABLED"))
+INSTRUMENTATION_SLOW_REQUEST_MS = float(
+    environ.get("INSTRUMENTATION_SLOW_REQUEST_MS", 500)
+)
+INSTRUMENTATION_MAX_CAPTURED_QUERIES = int(
+    environ.get("INSTRUMENTATION_MAX_CAPTURED_QUERIES", 100)
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        "property_direct_api.instrumentation": {
+            "handlers": ["console"],
+            "level": environ.get("INSTRUMENTATION_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 # Cloudinary Configuration
 CLOUDINARY_STORAGE = {"CLOUDINARY_URL": environ.get("CLOUDINARY_URL")}
 
+# Uploads (and their derivatives, see property_direct_api.images) are stored
+# in Cloudinary, or on the local filesystem in MEDIA_ROOT when
+# LOCAL_MEDIA_STORAGE is set (served at MEDIA_URL in development).
 MEDIA_URL = "/media/"
-DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
+MEDIA_ROOT = BASE_DIR / "media"
+if environ.get("LOCAL_MEDIA_STORAGE"):
+    DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
+else:
+    DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 
 
 # Django REST Framework Configuration
@@ -61,7 +179,7 @@ REST_FRAMEWORK = {
             else "dj_rest_auth.jwt_auth.JWTCookieAuthentication"
         )
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "property_direct_api.pagination.CountOptionalPagination",
     "PAGE_SIZE": 10,
     "DATETIME_FORMAT": "%d %b %Y",
     "EXCEPTION_HANDLER": "property_direct_api.exception_handler.custom_exception_handler",
@@ -113,11 +231,15 @@ INSTALLED_APPS = [
     "notes",
     "bookmarks",
     "followers",
+    "feeds",
+    "jobs",
+    "benchmarks",
 ]
 
 SITE_ID = 1
 
 MIDDLEWARE = [
+    "property_direct_api.instrumentation.InstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -0,0 +1,244 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from jobs.models import Job
+from jobs.worker import run_worker
+from PIL import Image
+from profiles.models import Profile
+from propertys.cache import postcode_cache, property_response_cache
+from propertys.models import Postcode, Property
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..images import IMAGE_DERIVATIVE_SIZES, render_image_derivatives
+
+
+def make_image(size, mode="RGB", image_format="png", name="image.png"):
+    file = BytesIO()
+    Image.new(mode=mode, size=size).save(file, image_format)
+    return SimpleUploadedFile(
+        name, file.getvalue(), content_type=f"image/{image_format}"
+    )
+
+
+class RenderImageDerivativesTests(SimpleTestCase):
+    """Image Derivative Rendering Tests"""
+
+    def test_derivatives_fit_sizes_without_upscaling(self):
+        """Test derivatives are scaled down to fit each size, keeping the
+        aspect ratio, and small images are not scaled up
+        """
+        rendered = render_image_derivatives(Image.new("RGB", (3200, 800)))
+        expected = {
+            "full": (1600, 400),
+            "card": (640, 160),
+            "thumbnail": (160, 40),
+        }
+        for size, dimensions in expected.items():
+            for file_type, image_format in [
+                ("webp", "WEBP"),
+                ("jpeg", "JPEG"),
+            ]:
+                with Image.open(BytesIO(rendered[size][file_type])) as image:
+                    self.assertEqual(image.format, image_format)
+                    self.assertEqual(image.size, dimensions)
+
+        rendered = render_image_derivatives(Image.new("RGB", (100, 50)))
+        with Image.open(BytesIO(rendered["full"]["jpeg"])) as image:
+            self.assertEqual(image.size, (100, 50))
+
+    def test_transparent_images(self):
+        """Test transparent images keep transparency in WebP, and are
+        flattened for JPEG
+        """
+        rendered = render_image_derivatives(Image.new("LA", (800, 800)))
+        with Image.open(BytesIO(rendered["card"]["webp"])) as image:
+            self.assertEqual(image.mode, "RGBA")
+        with Image.open(BytesIO(rendered["card"]["jpeg"])) as image:
+            self.assertEqual(image.mode, "RGB")
+
+
+class ImageDerivativePipelineTests(APITestCase):
+    """Image Derivative Pipeline Tests (local filesystem storage)"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        storage_settings = override_settings(
+            DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage",
+            MEDIA_ROOT=self.media_root,
+        )
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+        postcode_cache.clear()
+        property_response_cache.clear()
+        Postcode.objects.create(
+            postcode="W1A1AA", latitude=51.518561, longitude=-0.143799
+        )
+
+        self.shared_password = "testingPa$$w0rd!"
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+        self.client.login(
+            username="test_seller", password=self.shared_password
+        )
+
+        self.property_obj = {
+            "street_name": "test street name",
+            "locality": "test locality",
+            "city": "test city",
+            "postcode": "w1a 1aa",
+            "description": "test description",
+            "price": 100000,
+            "property_type": "apartment",
+            "num_bedrooms": 1,
+            "num_bathrooms": 1,
+        }
+
+    def test_property_image_derivatives(self):
+        """Test derivatives of uploaded property images are generated by a
+        worker, stored alongside the original, and returned by the API
+        """
+        response = self.client.post(
+            "/property/create/",
+            {
+                **self.property_obj,
+                "image_hero": make_image((2000, 1000)),
+                "floorplan": make_image((1000, 2000)),
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # Generated out-of-band
+        self.assertIsNone(response.data["image_hero_derivatives"])
+        self.assertEqual(Job.objects.count(), 1)
+
+        self.assertEqual(run_worker(once=True), 1)
+        property = Property.objects.get(pk=response.data["id"])
+        self.assertEqual(
+            set(property.image_derivatives), {"image_hero", "floorplan"}
+        )
+        derivatives = property.image_derivatives["image_hero"]
+        self.assertEqual(derivatives["name"], property.image_hero.name)
+        for size in IMAGE_DERIVATIVE_SIZES:
+            for file_type in ("webp", "jpeg"):
+                name = derivatives[size][file_type]
+                self.assertTrue(name.startswith("images/image_"))
+                self.assertTrue(default_storage.exists(name))
+        with default_storage.open(derivatives["card"]["jpeg"]) as file:
+            with Image.open(file) as image:
+                self.assertEqual(image.size, (640, 320))
+
+        response = self.client.get(f"/property/{property.id}/")
+        urls = response.data["image_hero_derivatives"]
+        self.assertEqual(
+            urls["thumbnail"]["webp"],
+            f"/media/{derivatives['thumbnail']['webp']}",
+        )
+        self.assertIsNotNone(response.data["floorplan_derivatives"])
+        self.assertIsNone(response.data["epc_derivatives"])
+        # Default profile image
+        self.assertIsNone(response.data["profile_image_derivatives"])
+
+    def test_replaced_image_derivatives_are_regenerated(self):
+        """Test derivatives of a replaced image are not returned, and are
+        regenerated
+        """
+        response = self.client.post(
+            "/property/create/",
+            {**self.property_obj, "image_hero": make_image((800, 800))},
+        )
+        run_worker(once=True)
+        property_id = response.data["id"]
+        old_names = self.get_derivative_names(property_id, "image_hero")
+
+        response = self.client.patch(
+            f"/property/{property_id}/",
+            {"image_hero": make_image((900, 450))},
+        )
+        self.assertIsNone(response.data["image_hero_derivatives"])
+        run_worker(once=True)
+        property = Property.objects.get(pk=property_id)
+        self.assertEqual(
+            property.image_derivatives["image_hero"]["name"],
+            property.image_hero.name,
+        )
+        response = self.client.get(f"/property/{property_id}/")
+        self.assertIsNotNone(response.data["image_hero_derivatives"])
+
+        # Derivatives of the replaced image are deleted
+        new_names = self.get_derivative_names(property_id, "image_hero")
+        self.assertFalse(old_names & new_names)
+        for name in old_names:
+            self.assertFalse(default_storage.exists(name))
+        for name in new_names:
+            self.assertTrue(default_storage.exists(name))
+
+    def test_cleared_image_derivatives_are_deleted(self):
+        """Test derivatives of a cleared image are removed from the property
+        and deleted from storage
+        """
+        response = self.client.post(
+            "/property/create/",
+            {**self.property_obj, "floorplan": make_image((800, 800))},
+        )
+        run_worker(once=True)
+        property_id = response.data["id"]
+        names = self.get_derivative_names(property_id, "floorplan")
+        self.assertEqual(len(names), 6)
+
+        property = Property.objects.get(pk=property_id)
+        property.floorplan = None
+        property.save()
+        self.assertEqual(run_worker(once=True), 1)
+        property.refresh_from_db()
+        self.assertNotIn("floorplan", property.image_derivatives)
+        for name in names:
+            self.assertFalse(default_storage.exists(name))
+
+    def get_derivative_names(self, property_id, field_name):
+        """Return the stored file names of a property image's derivatives."""
+        derivatives = Property.objects.get(pk=property_id).image_derivatives[
+            field_name
+        ]
+        return {
+            name
+            for size in IMAGE_DERIVATIVE_SIZES
+            for name in derivatives[size].values()
+        }
+
+    def test_saves_without_new_images_queue_no_jobs(self):
+        """Test saving a property without uploading images queues no jobs"""
+        self.client.post("/property/create/", self.property_obj)
+        self.assertFalse(Job.objects.exists())
+
+    def test_profile_image_derivatives(self):
+        """Test derivatives of an uploaded profile image are generated and
+        returned by the profile and property APIs
+        """
+        profile = Profile.objects.get(owner=self.test_seller)
+        response = self.client.put(
+            f"/profiles/{profile.id}/",
+            {"image": make_image((1000, 1000))},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["image_derivatives"])
+
+        run_worker(once=True)
+        response = self.client.get(f"/profiles/{profile.id}/")
+        urls = response.data["image_derivatives"]
+        self.assertTrue(urls["thumbnail"]["jpeg"].endswith("_thumbnail.jpeg"))
+
+        Property.objects.create(owner=self.test_seller, **self.property_obj)
+        response = self.client.get("/property/")
+        self.assertEqual(
+            response.data["results"][0]["profile_image_derivatives"], urls
+        )
@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from propertys.models import Property
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..instrumentation import RequestMetrics, current_metrics, timer
+
+
+class InstrumentationMiddlewareTests(APITestCase):
+    """Request Instrumentation Middleware Tests"""
+
+    def setUp(self):
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password="testingPa$$w0rd!",
+            is_seller=True,
+        )
+        Property.objects.create(
+            owner=self.test_seller,
+            street_name="test street name",
+            locality="test locality",
+            city="test city",
+            postcode="test postcode",
+            description="test description",
+            price=100000,
+            property_type="apartment",
+            num_bedrooms=1,
+            num_bathrooms=1,
+        )
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_no_server_timing_header_when_disabled(self):
+        """Test the middleware is not used unless enabled"""
+        response = self.client.get("/property/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(INSTRUMENTATION_ENABLED=True)
+    def test_server_timing_header_and_log_line(self):
+        """Test timings are returned in the Server-Timing header and logged
+        as a single line per request
+        """
+        with self.assertLogs(
+            "property_direct_api.instrumentation", level="INFO"
+        ) as logs:
+            response = self.client.get("/property/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        server_timing = response["Server-Timing"]
+        for metric in ("db", "postcode", "serializer", "total"):
+            self.assertIn(f"{metric};dur=", server_timing)
+
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertEqual(record.levelname, "INFO")
+        self.assertEqual(record.metrics["path"], "/property/")
+        self.assertEqual(record.metrics["status"], 200)
+        self.assertGreater(record.metrics["queries"], 0)
+        self.assertIn(
+            f'desc="{record.metrics["queries"]} queries"', server_timing
+        )
+        self.assertGreater(record.metrics["serializer_ms"], 0)
+
+    @override_settings(
+        INSTRUMENTATION_ENABLED=True, INSTRUMENTATION_SLOW_REQUEST_MS=0
+    )
+    def test_slow_requests_log_captured_sql(self):
+        """Test requests over the slow request threshold are logged as a
+        warning including the SQL executed
+        """
+        with self.assertLogs(
+            "property_direct_api.instrumentation", level="INFO"
+        ) as logs:
+            self.client.get("/property/")
+
+        record = logs.records[0]
+        self.assertEqual(record.levelname, "WARNING")
+        self.assertIn("propertys_property", record.getMessage())
+
+    @override_settings(
+        INSTRUMENTATION_ENABLED=True,
+        INSTRUMENTATION_SLOW_REQUEST_MS=0,
+        INSTRUMENTATION_MAX_CAPTURED_QUERIES=1,
+    )
+    def test_captured_sql_is_limited(self):
+        """Test only the configured number of SQL statements are kept"""
+        # Authenticated requests are not served from the response cache, so
+        # query the validators (ConditionalGetMixin) and the properties
+        self.client.force_authenticate(user=self.test_seller)
+        with self.assertLogs(
+            "property_direct_api.instrumentation", level="INFO"
+        ) as logs:
+            self.client.get("/property/")
+
+        record = logs.records[0]
+        queries = record.metrics["queries"]
+        self.assertGreaterEqual(queries, 2)
+        message = record.getMessage()
+        self.assertEqual(message.count("ms] "), 1)
+        self.assertIn(f"... {queries - 1} more queries not captured", message)
+
+
+class TimerTests(APITestCase):
+    """Instrumentation Timer Tests"""
+
+    def test_timer_outside_request_is_a_no_op(self):
+        """Test timers can be used when no request is instrumented"""
+        with timer("postcode"):
+            pass
+
+    def test_nested_timers_are_counted_once(self):
+        """Test time in nested timers of the same name is not double
+        counted
+        """
+        metrics = RequestMetrics(max_captured_queries=0)
+        token = current_metrics.set(metrics)
+        try:
+            with timer("serializer"):
+                with timer("serializer"):
+                    outer_only = metrics.serializer_ms
+            self.assertEqual(outer_only, 0)
+            self.assertGreater(metrics.serializer_ms, 0)
+        finally:
+            current_metrics.reset(token)
@@ -0,0 +1,104 @@
+import unittest.mock as mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from profiles.models import Profile
+from profiles.pagination import ProfilePagination
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..pagination import CountOptionalPagination
+
+
+class CountOptionalPaginationTests(APITestCase):
+    """Count Optional Pagination Tests (using the profile list)"""
+
+    def setUp(self):
+        cache.clear()
+        for number in range(15):
+            get_user_model().objects.create_user(
+                username=f"test_seller_{number}",
+                password="testingPa$$w0rd!",
+                is_seller=True,
+            )
+
+    def get_profiles(self, params=None):
+        """Return the response and the COUNT queries made listing profiles"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/profiles/", params)
+        count_queries = [
+            query for query in queries if "COUNT(*)" in query["sql"]
+        ]
+        return response, count_queries
+
+    def test_count_and_next_link(self):
+        """Test the first page includes the count and a next link"""
+        response, count_queries = self.get_profiles()
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertIsNone(response.data["previous"])
+        self.assertTrue(response.data["next"].endswith("?page=2"))
+        self.assertEqual(len(count_queries), 1)
+
+    def test_count_can_be_skipped(self):
+        """Test count=false skips counting while keeping the next link"""
+        response, count_queries = self.get_profiles({"count": "false"})
+        self.assertIsNone(response.data["count"])
+        self.assertIn("page=2", response.data["next"])
+        self.assertEqual(count_queries, [])
+
+    def test_last_page_count_needs_no_count_query(self):
+        """Test the count on the last page is found from the rows fetched"""
+        response, count_queries = self.get_profiles({"page": 2})
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIsNone(response.data["next"])
+        self.assertFalse(response.data["previous"].endswith("page=1"))
+        self.assertEqual(count_queries, [])
+
+    def test_page_out_of_range(self):
+        """Test pages past the last page, or invalid pages, are not found"""
+        for page in (3, 0, "invalid"):
+            response, _ = self.get_profiles({"page": page})
+            self.assertEqual(
+                response.status_code, status.HTTP_404_NOT_FOUND, page
+            )
+
+    def test_last_page_string(self):
+        """Test 'last' returns the last page"""
+        response, _ = self.get_profiles({"page": "last"})
+        self.assertEqual(len(response.data["results"]), 5)
+
+    @mock.patch.object(ProfilePagination, "count_threshold", 10)
+    def test_cached_count_above_threshold(self):
+        """Test counts above the threshold are cached"""
+        response, count_queries = self.get_profiles()
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(len(count_queries), 1)
+
+        get_user_model().objects.create_user(
+            username="new_seller", password="testingPa$$w0rd!", is_seller=True
+        )
+        response, count_queries = self.get_profiles()
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(count_queries, [])
+
+    def test_counts_below_threshold_are_not_cached(self):
+        """Test counts below the threshold are always exact"""
+        self.get_profiles()
+        get_user_model().objects.create_user(
+            username="new_seller", password="testingPa$$w0rd!", is_seller=True
+        )
+        response, count_queries = self.get_profiles()
+        self.assertEqual(response.data["count"], 16)
+        self.assertEqual(len(count_queries), 1)
+
+    def test_no_estimate_without_postgresql(self):
+        """Test the planner estimate is only used with PostgreSQL"""
+        if connection.vendor == "postgresql":
+            self.skipTest("Estimates are available with PostgreSQL")
+        self.assertIsNone(
+            CountOptionalPagination.estimate_count(Profile.objects.all())
+        )
@@ -0,0 +1,86 @@
+from io import BytesIO
+from unittest import mock
+
+from benchmarks.uploads import png_bomb
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from PIL import Image
+from rest_framework.serializers import ValidationError
+
+from ..utils import INVALID_IMAGE_MESSAGE, validate_image_util
+
+
+def make_upload(content, name="image.png"):
+    return SimpleUploadedFile(name, content)
+
+
+def make_image_upload(size, image_format="PNG"):
+    file = BytesIO()
+    Image.new("RGB", size).save(file, image_format)
+    return make_upload(file.getvalue())
+
+
+class ValidateImageUtilTests(SimpleTestCase):
+    """Image Upload Validation Tests"""
+
+    def assertRejected(self, upload, message):
+        with self.assertRaises(ValidationError) as context:
+            validate_image_util(upload)
+        self.assertIn(message, str(context.exception.detail[0]))
+
+    def test_valid_images_are_accepted(self):
+        """Test images of each supported format within the limits are
+        accepted, and the file is left ready to be read
+        """
+        for image_format in ("JPEG", "PNG", "WEBP"):
+            upload = make_image_upload((4096, 100), image_format)
+            self.assertIs(validate_image_util(upload), upload)
+            self.assertEqual(upload.tell(), 0)
+
+    def test_width_and_height_are_limited(self):
+        """Test images wider or taller than the limits are rejected"""
+        self.assertRejected(
+            make_image_upload((4097, 10)), "Image width should be less than"
+        )
+        self.assertRejected(
+            make_image_upload((10, 4097)), "Image height should be less than"
+        )
+
+    def test_decompression_bombs_are_rejected_without_decoding(self):
+        """Test small files of huge images are rejected from the header,
+        without the pixel data being decoded
+        """
+        with mock.patch.object(Image.Image, "load") as load:
+            # Beyond Pillow's warning limit
+            with self.assertWarns(Image.DecompressionBombWarning):
+                self.assertRejected(
+                    make_upload(png_bomb(10000, 10000)),
+                    "Image width should be less than",
+                )
+            # Beyond Pillow's own decompression bomb limit
+            self.assertRejected(
+                make_upload(png_bomb(4000, 60000)),
+                "Image should have fewer than",
+            )
+        load.assert_not_called()
+
+    def test_unsupported_files_are_rejected(self):
+        """Test files that are not images, or are in an unsupported format,
+        are rejected
+        """
+        self.assertRejected(
+            make_upload(b"Hello world!"), INVALID_IMAGE_MESSAGE
+        )
+        self.assertRejected(
+            make_image_upload((10, 10), "TIFF"), INVALID_IMAGE_MESSAGE
+        )
+        # Truncated header
+        self.assertRejected(
+            make_upload(make_image_upload((10, 10)).read()[:20]),
+            INVALID_IMAGE_MESSAGE,
+        )
+
+    def test_file_size_is_limited(self):
+        """Test files larger than 2MB are rejected before being parsed"""
+        upload = make_upload(bytes(2 * 1024 * 1024 + 1))
+        self.assertRejected(upload, "Image size should be smaller than 2MB.")
@@ -13,14 +13,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from .views import logout_route, root_route
+from .views import cache_stats_route, logout_route, root_route
 
 urlpatterns = [
     path("", root_route),
     path("admin/", admin.site.urls),
+    path("monitoring/cache-stats/", cache_stats_route),
     path("api-auth/", include("rest_framework.urls")),
     path("dj-rest-auth/logout/", logout_route),
     path("dj-rest-auth/", include("dj_rest_auth.urls")),
@@ -33,3 +36,9 @@ urlpatterns = [
     path("", include("bookmarks.urls")),
     path("", include("followers.urls")),
 ]
+
+# Serve uploads stored on the local filesystem (development only)
+if settings.DEFAULT_FILE_STORAGE.endswith("FileSystemStorage"):
+    urlpatterns += static(
+        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
+    )
@@ -1,24 +1,70 @@
+from PIL import Image, UnidentifiedImageError
 from rest_framework import serializers
 
+# Limits of uploaded images (see validate_image_util). An image is decoded
+# (e.g. to generate its derivatives, see property_direct_api.images) into
+# up to 4 bytes per pixel, so the pixel count bounds the memory needed.
+MAX_IMAGE_FILE_SIZE = 2  # File size unit is MB
+MAX_IMAGE_WIDTH = 4096
+MAX_IMAGE_HEIGHT = 4096
+MAX_IMAGE_PIXELS = MAX_IMAGE_WIDTH * MAX_IMAGE_HEIGHT
+# Pillow formats accepted, other files are rejected without being parsed
+IMAGE_FORMATS = ("JPEG", "PNG", "WEBP")
+
+INVALID_IMAGE_MESSAGE = (
+    "Upload a valid image. The file you uploaded was either not an image or "
+    "a corrupted image."
+)
+
 
 # CREDIT: Validation logic adapted from the Code Institute DRF Tutorial Project
 # URL:    https://github.com/Code-Institute-Solutions/drf-api
 def validate_image_util(file_obj):
-    """Validate Image File based on height, width and file size."""
-    max_image_width = 4096
-    max_image_height = 4096
-    maximum_file_size = 2  # File size unit is MB
+    """Validate Image File based on file size, format, height, width and
+    pixel count.
+
+    Only the image header is read, so an image is never decoded during
+    validation, and decompression bombs (small files of huge images) are
+    rejected by their dimensions before any pixel data is read.
+
+    Args:
+        file_obj (UploadedFile): The uploaded file.
+
+    Raises:
+        ValidationError: Raised when the file is not a valid image within
+            the limits.
+
+    Returns:
+        UploadedFile: The validated file.
+    """
+    if file_obj.size > (1024 * 1024 * MAX_IMAGE_FILE_SIZE):
+        raise serializers.ValidationError(
+            f"Image size should be smaller than {MAX_IMAGE_FILE_SIZE}MB."
+        )
+
+    try:
+        # Image.open reads the header only; pixel data is read on load()
+        with Image.open(file_obj, formats=IMAGE_FORMATS) as image:
+            width, height = image.size
+    except Image.DecompressionBombError:
+        raise serializers.ValidationError(
+            f"Image should have fewer than {MAX_IMAGE_PIXELS} pixels."
+        )
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+        raise serializers.ValidationError(INVALID_IMAGE_MESSAGE)
+    finally:
+        file_obj.seek(0)
 
-    if file_obj.size > (1024 * 1024 * maximum_file_size):
+    if width > MAX_IMAGE_WIDTH:
         raise serializers.ValidationError(
-            "Image size should be smaller than 2MB."
+            f"Image width should be less than {MAX_IMAGE_WIDTH}px."
         )
-    if file_obj.image.width > max_image_width:
+    if height > MAX_IMAGE_HEIGHT:
         raise serializers.ValidationError(
-            f"Image width should be less than {max_image_width}px."
+            f"Image height should be less than {MAX_IMAGE_HEIGHT}px."
         )
-    if file_obj.image.width > max_image_height:
+    if width * height > MAX_IMAGE_PIXELS:
         raise serializers.ValidationError(
-            f"Image height should be less than {max_image_height}px."
+            f"Image should have fewer than {MAX_IMAGE_PIXELS} pixels."
         )
     return file_obj
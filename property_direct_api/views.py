@@ -1,4 +1,6 @@
-from rest_framework.decorators import api_view
+from propertys.cache import postcode_cache, property_response_cache
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
 from .settings import (
@@ -20,6 +22,18 @@ def root_route(request):
     )
 
 
+@api_view()
+@permission_classes([IsAdminUser])
+def cache_stats_route(request):
+    """Return cache counters (for this worker process) for monitoring."""
+    return Response(
+        {
+            "postcode_cache": postcode_cache.stats(),
+            "property_response_cache": property_response_cache.stats(),
+        }
+    )
+
+
 # CREDIT: Code from Code Institute DRF Tutorial Project - dj-rest-auth logout
 #         view fix
 # URL:    https://github.com/Code-Institute-Solutions/drf-api
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PropertysConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'propertys'
+
+    def ready(self):
+        import propertys.signals  # noqa
@@ -0,0 +1,218 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Value stored for postcodes known to be invalid (negative caching).
+INVALID_POSTCODE = "invalid"
+
+
+class PostcodeCache:
+    """Cache in front of postcode lookups, backed by Django's cache framework.
+
+    - Valid postcode details are cached for the cache alias 'TIMEOUT'.
+    - Invalid postcodes are cached for POSTCODE_CACHE_NEGATIVE_TIMEOUT so
+      repeated requests for them never reach the external API.
+    - Hit, miss and eviction counters are kept per process for monitoring.
+      An eviction is counted when a key this process stored is missing before
+      its timeout has passed (e.g. culled by the LocMemCache LRU policy).
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self._expiries = OrderedDict()
+        self.reset_stats()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def max_tracked_keys(self):
+        """Track more keys than the cache holds so evictions can be seen."""
+        options = settings.CACHES[self.alias].get("OPTIONS", {})
+        return 2 * options.get("MAX_ENTRIES", 300)
+
+    def make_key(self, normalized_postcode):
+        return f"postcode:{normalized_postcode}"
+
+    def get(self, normalized_postcode):
+        """Return cached postcode details, INVALID_POSTCODE or None on a
+        miss.
+        """
+        key = self.make_key(normalized_postcode)
+        value = self.cache.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                expires_at = self._expiries.pop(key, None)
+                if expires_at is not None and expires_at > time.monotonic():
+                    self.evictions += 1
+            elif value == INVALID_POSTCODE:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, normalized_postcode, postcode_details):
+        self._set(normalized_postcode, postcode_details, None)
+
+    def set_invalid(self, normalized_postcode):
+        self._set(
+            normalized_postcode,
+            INVALID_POSTCODE,
+            settings.POSTCODE_CACHE_NEGATIVE_TIMEOUT,
+        )
+
+    def _set(self, normalized_postcode, value, timeout):
+        key = self.make_key(normalized_postcode)
+        if timeout is None:
+            self.cache.set(key, value)
+            timeout = self.cache.default_timeout
+        else:
+            self.cache.set(key, value, timeout)
+        expires_at = (
+            float("inf") if timeout is None else time.monotonic() + timeout
+        )
+        with self._lock:
+            self._expiries[key] = expires_at
+            self._expiries.move_to_end(key)
+            while len(self._expiries) > self.max_tracked_keys:
+                self._expiries.popitem(last=False)
+
+    def clear(self):
+        self.cache.clear()
+        with self._lock:
+            self._expiries.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.negative_hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Return the cache counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (
+                    (self.hits + self.negative_hits) / lookups
+                    if lookups
+                    else None
+                ),
+            }
+
+
+postcode_cache = PostcodeCache("postcodes")
+
+
+class ResponseCache:
+    """Cache of API response data, backed by Django's cache framework.
+
+    - Keys include a generation counter; bumping the generation (on writes to
+      the cached objects) invalidates every cached response at once, without
+      needing to find the keys to delete.
+    - The generation is the time (in nanoseconds) it was bumped, so a lost
+      (evicted) generation is replaced with a new, unused one.
+    - Hit and miss counters, and the time taken to serve each, are kept per
+      process for monitoring.
+    """
+
+    def __init__(self, alias, prefix):
+        self.alias = alias
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def generation_key(self):
+        return f"{self.prefix}:generation"
+
+    def get_generation(self):
+        generation = self.cache.get(self.generation_key)
+        if generation is None:
+            generation = self.bump_generation()
+        return generation
+
+    def bump_generation(self):
+        """Invalidate all cached responses."""
+        generation = time.time_ns()
+        self.cache.set(self.generation_key, generation, None)
+        return generation
+
+    def make_key(self, url, params):
+        """Return the cache key for a URL and (normalised) query parameters.
+
+        Args:
+            url (string): Request URL, without the query string.
+            params (iterable): (name, value) pairs, in a consistent order.
+        """
+        digest = hashlib.md5(repr((url, list(params))).encode()).hexdigest()
+        return f"{self.prefix}:{self.get_generation()}:{digest}"
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, data):
+        self.cache.set(key, data)
+
+    def clear(self):
+        self.cache.clear()
+
+    def record(self, hit, duration_ms):
+        """Record a cache hit or miss and the time taken to respond."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.hit_ms += duration_ms
+            else:
+                self.misses += 1
+                self.miss_ms += duration_ms
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.hit_ms = 0.0
+            self.miss_ms = 0.0
+
+    def stats(self):
+        """Return the cache counters for monitoring.
+
+        'saved_ms' estimates the time saved by hits, from the mean time
+        taken to respond to a hit and a miss.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            mean_hit_ms = self.hit_ms / self.hits if self.hits else None
+            mean_miss_ms = self.miss_ms / self.misses if self.misses else None
+            saved_ms = (
+                self.hits * (mean_miss_ms - mean_hit_ms)
+                if self.hits and self.misses
+                else None
+            )
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "mean_hit_ms": mean_hit_ms,
+                "mean_miss_ms": mean_miss_ms,
+                "saved_ms": saved_ms,
+            }
+
+
+property_response_cache = ResponseCache("responses", "property-responses")
@@ -0,0 +1,225 @@
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from property_direct_api.exceptions import (
+    ExternalAPIUnavailable,
+    PostCodeInvalid,
+)
+from requests.adapters import HTTPAdapter
+
+
+class CircuitBreaker:
+    """Circuit Breaker for calls to an external service.
+
+    - Closed: requests are allowed, consecutive failures are counted.
+    - Open: once 'failure_threshold' consecutive failures are recorded,
+      requests are refused until 'reset_timeout' seconds have passed.
+    - Half-open: after the reset timeout a single trial request is allowed.
+      Success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_progress = False
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def allow_request(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if (
+                not self.trial_in_progress
+                and time.monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                self.trial_in_progress = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_progress or (
+                self.failures >= self.failure_threshold
+            ):
+                self.opened_at = time.monotonic()
+            self.trial_in_progress = False
+
+
+class PostcodeClient:
+    """Client for the postcodes.io API (https://api.postcodes.io/).
+
+    - Requests share a keep-alive session with a pooled connection adapter.
+    - Every request has connect and read timeouts.
+    - Connection errors, timeouts and 5xx / 429 responses are retried a
+      bounded number of times, with exponential backoff and full jitter.
+    - A circuit breaker fails fast with ExternalAPIUnavailable once the API is
+      clearly down, rather than blocking workers on every request.
+
+    Defaults are taken from the POSTCODES_API_* settings.
+    """
+
+    retry_status_codes = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        base_url=None,
+        connect_timeout=None,
+        read_timeout=None,
+        retries=None,
+        retry_backoff=None,
+        pool_size=None,
+        failure_threshold=None,
+        reset_timeout=None,
+    ):
+        def setting(value, name):
+            return getattr(settings, name) if value is None else value
+
+        self.base_url = setting(base_url, "POSTCODES_API_URL").rstrip("/")
+        self.timeout = (
+            setting(connect_timeout, "POSTCODES_API_CONNECT_TIMEOUT"),
+            setting(read_timeout, "POSTCODES_API_READ_TIMEOUT"),
+        )
+        self.retries = setting(retries, "POSTCODES_API_RETRIES")
+        self.retry_backoff = setting(
+            retry_backoff, "POSTCODES_API_RETRY_BACKOFF"
+        )
+        self.circuit_breaker = CircuitBreaker(
+            setting(failure_threshold, "POSTCODES_API_FAILURE_THRESHOLD"),
+            setting(reset_timeout, "POSTCODES_API_RESET_TIMEOUT"),
+        )
+
+        pool_size = setting(pool_size, "POSTCODES_API_POOL_SIZE")
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=0
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_postcode(self, postcode):
+        """Fetches postcode information (e.g. Longitude, Latitude).
+
+        Args:
+            postcode (string): Postcode information.
+
+        Raises:
+            PostCodeInvalid: Raised when postcode invalid.
+            ExternalAPIUnavailable: Raised when external API unavailable.
+
+        Returns:
+            dict: Postcode information from external API.
+        """
+        response_obj = self.request("GET", f"/postcodes/{postcode}")
+
+        if response_obj["status"] == 404 and (
+            response_obj.get("error") == "Postcode not found"
+            or response_obj.get("error") == "Invalid postcode"
+        ):
+            raise PostCodeInvalid
+        elif response_obj["status"] != 200:
+            raise ExternalAPIUnavailable
+
+        return response_obj["result"]
+
+    def get_postcodes(self, postcodes):
+        """Fetches information for up to 100 postcodes in a single request.
+
+        Args:
+            postcodes (list): Postcodes to look up.
+
+        Raises:
+            ExternalAPIUnavailable: Raised when external API unavailable.
+
+        Returns:
+            dict: Postcode information from external API keyed by the
+            postcode queried, or None for postcodes that were not found.
+        """
+        response_obj = self.request(
+            "POST", "/postcodes", json={"postcodes": list(postcodes)}
+        )
+        if response_obj["status"] != 200:
+            raise ExternalAPIUnavailable
+
+        return {
+            item["query"]: item["result"] for item in response_obj["result"]
+        }
+
+    def request(self, method, path, **kwargs):
+        """Send a request, retrying transient failures.
+
+        The outcome is recorded by the circuit breaker. Any exception is
+        recorded as a failure, so a half-open circuit's trial request always
+        completes.
+
+        Returns:
+            dict: Decoded response body. The 'status' key mirrors the HTTP
+            status code, as with all postcodes.io responses.
+        """
+        if not self.circuit_breaker.allow_request():
+            raise ExternalAPIUnavailable
+
+        try:
+            response_obj = self.request_with_retries(method, path, **kwargs)
+        except BaseException:
+            self.circuit_breaker.record_failure()
+            raise
+        self.circuit_breaker.record_success()
+        return response_obj
+
+    def request_with_retries(self, method, path, **kwargs):
+        """Send a request, retrying connection errors, timeouts, retryable
+        status codes and malformed (non JSON object) responses.
+
+        Raises:
+            ExternalAPIUnavailable: Raised when no attempt succeeds.
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                # Exponential backoff with full jitter
+                time.sleep(
+                    random.uniform(0, self.retry_backoff * 2 ** (attempt - 1))
+                )
+            try:
+                api_response = self.session.request(
+                    method,
+                    f"{self.base_url}{path}",
+                    timeout=self.timeout,
+                    **kwargs,
+                )
+                response_obj = api_response.json()
+            except (requests.RequestException, ValueError):
+                continue
+            if not isinstance(response_obj, dict):
+                continue
+
+            status = response_obj.get("status")
+            if status in self.retry_status_codes:
+                continue
+            if status == 404 and response_obj.get("error") == (
+                "Resource not found"
+            ):
+                # The API is reachable but not serving the expected resource
+                break
+
+            return response_obj
+
+        raise ExternalAPIUnavailable
+
+
+postcode_client = PostcodeClient()
@@ -1,18 +1,27 @@
-from django.contrib.auth import get_user_model
+from django import forms
 from django_filters import rest_framework as filters
+from profiles.models import Profile
 
 from .models import Property
+from .search import search
 
 
 class CustomPropertyFilters(filters.FilterSet):
     """Custom Property FilterSet
 
     - property_feed_for_profile - Properties listed by users the currently
-      authenticated user has followed.
+      authenticated user has followed, read from the user's feed (see
+      feeds.models) newest first, unless an 'ordering' is requested.
     - bookmarked_properties_for_profile - Properties bookmarked by the
       currently authenticated user.
     - properties_listed_by_profile - Property listings owned by the currently
       authenticated user.
+    - q - Keyword search of the property name, address and description
+      (see propertys.search). Results are ordered by relevance, unless an
+      'ordering' is requested.
+    - The profile filters take a profile id, validated with a single lookup
+      by primary key, and are rendered (e.g. by the browsable API) as number
+      inputs, so every profile is never loaded as choices.
     - price - Price Range (price_min=, price_max=)
     - bedrooms - Number of Bedrooms (bedrooms_min=, bedrooms_max=)
     - bathrooms - Number of Bathrooms (bedrooms_min=, bedrooms_max=)
@@ -22,30 +31,28 @@ class CustomPropertyFilters(filters.FilterSet):
     """
 
     # Properties listed by users the currently authenticated user has followed.
-    property_feed_for_profile = filters.ChoiceFilter(
+    property_feed_for_profile = filters.ModelChoiceFilter(
         label="Property feed for User (Profile)",
-        choices=get_user_model()
-        .objects.all()
-        .values_list("profile__id", "profile__owner__username"),
-        field_name="owner__followed__owner__profile",
+        widget=forms.NumberInput,
+        queryset=Profile.objects.all(),
+        method="filter_feed",
     )
 
     # Properties bookmarked by the currently authenticated user.
-    bookmarked_properties_for_profile = filters.ChoiceFilter(
+    bookmarked_properties_for_profile = filters.ModelChoiceFilter(
         label="Properties Bookmarked by User (Profile)",
-        choices=get_user_model()
-        .objects.all()
-        .values_list("profile__id", "profile__owner__username"),
+        widget=forms.NumberInput,
+        queryset=Profile.objects.all(),
         field_name="bookmarks__owner__profile",
     )
     # Property listings owned by the currently authenticated user.
-    properties_listed_by_profile = filters.ChoiceFilter(
+    properties_listed_by_profile = filters.ModelChoiceFilter(
         label="Properties owned by User (Profile)",
-        choices=get_user_model()
-        .objects.all()
-        .values_list("profile__id", "profile__owner__username"),
+        widget=forms.NumberInput,
+        queryset=Profile.objects.all(),
         field_name="owner__profile",
     )
+    q = filters.CharFilter(label="Keywords", method="filter_search")
     property_type = filters.ChoiceFilter(
         choices=Property.property_type_choices
     )
@@ -59,6 +66,7 @@ class CustomPropertyFilters(filters.FilterSet):
     class Meta:
         model = Property
         fields = [
+            "q",
             "property_feed_for_profile",
             "bookmarked_properties_for_profile",
             "properties_listed_by_profile",
@@ -70,3 +78,28 @@ class CustomPropertyFilters(filters.FilterSet):
             "has_parking",
             "is_sold_stc",
         ]
+
+    def ordering_requested(self):
+        return self.request is not None and bool(
+            self.request.query_params.get("ordering")
+        )
+
+    def filter_feed(self, queryset, name, value):
+        """Filter to properties in the profile owner's feed, ordered by the
+        feed (so a page is a range scan of the feed index).
+        """
+        queryset = queryset.filter(feed_entries__owner_id=value.owner_id)
+        if not self.ordering_requested():
+            queryset = queryset.order_by(
+                "-feed_entries__created_at", "-feed_entries__property_id"
+            )
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        """Filter to properties matching the keywords, ordered by relevance
+        (then newest first) unless an ordering was requested.
+        """
+        queryset = search(queryset, value)
+        if not self.ordering_requested():
+            queryset = queryset.order_by("-search_rank", "-created_at")
+        return queryset
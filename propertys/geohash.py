@@ -0,0 +1,125 @@
+from math import ceil, floor, isfinite
+
+# CREDIT: Geohash encoding adapted from "Geohash"
+# AUTHOR: Wikipedia
+# URL:    https://en.wikipedia.org/wiki/Geohash
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precision of the geohash stored on each property. A precision 5 cell is
+# approximately 4.9km (north to south) by 3km (east to west) in the UK.
+GEOHASH_PRECISION = 5
+
+# Searches needing more cells than this are filtered by bounding box only.
+MAX_COVERING_CELLS = 256
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode a point as a geohash.
+
+    Args:
+        latitude (float): Latitude of the point.
+        longitude (float): Longitude of the point.
+        precision (int): Number of characters in the geohash.
+
+    Returns:
+        string: Geohash of the cell containing the point.
+    """
+    latitude_range = [-90.0, 90.0]
+    longitude_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even_bit = True
+
+    while len(geohash) < precision:
+        # Bits alternate between longitude (even) and latitude (odd)
+        if even_bit:
+            value, value_range = longitude, longitude_range
+        else:
+            value, value_range = latitude, latitude_range
+        midpoint = (value_range[0] + value_range[1]) / 2
+        if value >= midpoint:
+            bits = (bits << 1) | 1
+            value_range[0] = midpoint
+        else:
+            bits = bits << 1
+            value_range[1] = midpoint
+        even_bit = not even_bit
+
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def cell_size(precision=GEOHASH_PRECISION):
+    """Return the (latitude, longitude) size of a cell in degrees."""
+    total_bits = precision * 5
+    latitude_bits = floor(total_bits / 2)
+    longitude_bits = total_bits - latitude_bits
+    return 180.0 / 2**latitude_bits, 360.0 / 2**longitude_bits
+
+
+def covering_cells(
+    min_latitude,
+    max_latitude,
+    min_longitude,
+    max_longitude,
+    precision=GEOHASH_PRECISION,
+):
+    """Return the geohashes of all cells intersecting a bounding box.
+
+    The bounding box is sampled at intervals no larger than a cell, including
+    its edges, so every intersecting cell contains at least one sample. It is
+    clamped to valid coordinates, and the number of samples is calculated
+    before sampling, so the work is bounded however large the box.
+
+    Returns:
+        set: Geohashes, or None if more than MAX_COVERING_CELLS are needed.
+    """
+    bounds = (min_latitude, max_latitude, min_longitude, max_longitude)
+    if not all(isfinite(bound) for bound in bounds):
+        return None
+    min_latitude, max_latitude = clamp(min_latitude, max_latitude, 90.0)
+    min_longitude, max_longitude = clamp(min_longitude, max_longitude, 180.0)
+
+    latitude_step, longitude_step = cell_size(precision)
+    sample_count = sample_size(
+        min_latitude, max_latitude, latitude_step
+    ) * sample_size(min_longitude, max_longitude, longitude_step)
+    if sample_count > MAX_COVERING_CELLS:
+        return None
+
+    latitudes = sample(min_latitude, max_latitude, latitude_step)
+    longitudes = sample(min_longitude, max_longitude, longitude_step)
+
+    return {
+        encode(latitude, longitude, precision)
+        for latitude in latitudes
+        for longitude in longitudes
+    }
+
+
+def clamp(start, end, limit):
+    """Return start and end clamped to the range -limit to limit."""
+    return max(start, -limit), min(end, limit)
+
+
+def sample_size(start, end, step):
+    """Return the number of values sample() returns."""
+    return max(ceil((end - start) / step), 0) + 1
+
+
+def sample(start, end, step):
+    """Return values from start to end (inclusive) at most 'step' apart."""
+    values = []
+    value = start
+    while value < end:
+        values.append(value)
+        value += step
+    values.append(end)
+    return values
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from property_direct_api.exceptions import ExternalAPIUnavailable
+
+from ...models import Property
+from ...tasks import geocode
+
+
+class Command(BaseCommand):
+    """Backfill the latitude and longitude of properties missing them, using
+    bulk postcode lookups (e.g. properties whose background geocoding job
+    failed, see propertys.tasks).
+
+    Usage: ./manage.py geocode_properties [--batch-size N]
+    """
+
+    help = "Backfill latitude and longitude for properties missing them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of properties geocoded per batch.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = (
+            Property.objects.filter(
+                Q(latitude__isnull=True) | Q(longitude__isnull=True)
+            )
+            .only("pk", "postcode")
+            .order_by("pk")
+        )
+        geocoded_count = 0
+        unresolved_count = 0
+        last_pk = 0
+
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            try:
+                geocoded, unresolved = geocode(batch)
+            except ExternalAPIUnavailable:
+                raise CommandError(
+                    "Postcode verification service unavailable, geocoded "
+                    f"{geocoded_count} properties before stopping."
+                )
+            geocoded_count += geocoded
+            unresolved_count += unresolved
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Geocoded {geocoded_count} properties "
+                f"({unresolved_count} postcodes could not be resolved)."
+            )
+        )
@@ -0,0 +1,120 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...models import Postcode
+from ...utils import normalize_postcode
+
+# ONS Postcode Directory column names, in order of preference. 'pcds' is the
+# formatted postcode, 'pcd' the fixed width version.
+POSTCODE_COLUMNS = ("pcds", "pcd", "postcode")
+LATITUDE_COLUMNS = ("lat", "latitude")
+LONGITUDE_COLUMNS = ("long", "longitude")
+
+# The ONS Postcode Directory uses this latitude for postcodes without a grid
+# reference.
+NO_GRID_REFERENCE_LATITUDE = 99.999999
+
+
+def find_column(fieldnames, candidates):
+    """Return the first candidate column name present in the CSV header."""
+    for candidate in candidates:
+        if candidate in fieldnames:
+            return candidate
+    raise CommandError(
+        f"CSV file has no column named any of: {', '.join(candidates)}"
+    )
+
+
+class Command(BaseCommand):
+    """Load the local postcode geocoding index from an ONS Postcode Directory
+    (or any CSV with postcode, latitude and longitude columns).
+
+    Usage: ./manage.py load_postcodes ONSPD.csv [--clear] [--batch-size N]
+    """
+
+    help = "Load postcode latitude and longitude data from an ONS CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_file", help="Path to the CSV file.")
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete existing postcodes before loading.",
+        )
+        parser.add_argument(
+            "--include-terminated",
+            action="store_true",
+            help="Include postcodes with a termination date ('doterm').",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        loaded_count = 0
+        skipped_count = 0
+
+        try:
+            csv_file = open(options["csv_file"], newline="", encoding="utf-8")
+        except OSError as error:
+            raise CommandError(error)
+
+        with csv_file, transaction.atomic():
+            reader = csv.DictReader(csv_file)
+            fieldnames = reader.fieldnames or []
+            postcode_column = find_column(fieldnames, POSTCODE_COLUMNS)
+            latitude_column = find_column(fieldnames, LATITUDE_COLUMNS)
+            longitude_column = find_column(fieldnames, LONGITUDE_COLUMNS)
+            check_terminated = (
+                "doterm" in fieldnames and not options["include_terminated"]
+            )
+
+            if options["clear"]:
+                Postcode.objects.all().delete()
+
+            batch = []
+            for row in reader:
+                try:
+                    latitude = float(row[latitude_column])
+                    longitude = float(row[longitude_column])
+                except (TypeError, ValueError):
+                    skipped_count += 1
+                    continue
+                postcode = normalize_postcode(row[postcode_column] or "")
+                if (
+                    not postcode
+                    or latitude == NO_GRID_REFERENCE_LATITUDE
+                    or (check_terminated and row["doterm"])
+                ):
+                    skipped_count += 1
+                    continue
+
+                batch.append(
+                    Postcode(
+                        postcode=postcode,
+                        latitude=latitude,
+                        longitude=longitude,
+                    )
+                )
+                if len(batch) >= batch_size:
+                    loaded_count += self.save_batch(batch)
+                    batch = []
+            loaded_count += self.save_batch(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {loaded_count} postcodes "
+                f"({skipped_count} rows skipped)."
+            )
+        )
+
+    def save_batch(self, batch):
+        """Insert a batch of postcodes, ignoring postcodes already loaded."""
+        Postcode.objects.bulk_create(batch, ignore_conflicts=True)
+        return len(batch)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from ...cache import property_response_cache
+from ...search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """Rebuild the property search index, e.g. after properties were created
+    or updated without model signals (bulk_create, raw SQL).
+
+    On PostgreSQL the index is maintained by the database, so nothing needs
+    to be rebuilt.
+
+    Usage: ./manage.py rebuild_search_index
+    """
+
+    help = "Rebuild the full-text search index of properties."
+
+    def handle(self, *args, **options):
+        indexed_count = rebuild_search_index()
+        if indexed_count is None:
+            self.stdout.write(
+                "The search index is maintained by the database."
+            )
+            return
+        property_response_cache.bump_generation()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {indexed_count} properties for search."
+            )
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from ...cache import property_response_cache
+from ...models import Property
+
+
+class Command(BaseCommand):
+    """Repair the stored bookmarks_count of properties, e.g. after bookmarks
+    were created or deleted without model signals (bulk_create, raw SQL).
+
+    Usage: ./manage.py recount_bookmarks
+    """
+
+    help = "Recount the number of bookmarks stored on each property."
+
+    def handle(self, *args, **options):
+        updated_count = Property.objects.recount_bookmarks()
+        if updated_count:
+            property_response_cache.bump_generation()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated the bookmarks count of {updated_count} properties."
+            )
+        )
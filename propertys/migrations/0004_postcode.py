@@ -0,0 +1,21 @@
+# Generated by Django 3.2.16 on 2026-10-17 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('propertys', '0003_alter_property_image_hero'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Postcode',
+            fields=[
+                ('postcode', models.CharField(max_length=7, primary_key=True, serialize=False)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-17 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('propertys', '0004_postcode'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['latitude', 'longitude'], name='property_lat_lon_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-17 20:05
+
+from django.db import migrations, models
+
+from propertys.geohash import encode
+
+
+def set_geohashes(apps, schema_editor):
+    """Set the geohash of existing geocoded properties."""
+    Property = apps.get_model("propertys", "Property")
+    properties = Property.objects.filter(
+        latitude__isnull=False, longitude__isnull=False
+    ).only("pk", "latitude", "longitude")
+    batch = []
+    for property in properties.iterator():
+        property.geohash = encode(property.latitude, property.longitude)
+        batch.append(property)
+        if len(batch) == 1000:
+            Property.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    Property.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('propertys', '0005_property_lat_lon_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.RunPython(set_geohashes, migrations.RunPython.noop),
+    ]
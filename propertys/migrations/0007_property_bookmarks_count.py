@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-17 20:15
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def set_bookmarks_counts(apps, schema_editor):
+    """Set the bookmarks_count of existing properties."""
+    Property = apps.get_model("propertys", "Property")
+    Bookmark = apps.get_model("bookmarks", "Bookmark")
+    Property.objects.update(
+        bookmarks_count=Coalesce(
+            models.Subquery(
+                Bookmark.objects.filter(property=models.OuterRef("pk"))
+                .order_by()
+                .values("property")
+                .annotate(count=models.Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookmarks', '0001_initial'),
+        ('propertys', '0006_property_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='bookmarks_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(set_bookmarks_counts, migrations.RunPython.noop),
+    ]
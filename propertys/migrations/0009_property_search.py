@@ -0,0 +1,75 @@
+# Generated by Django 3.2.16 on 2026-10-17 22:10
+
+from django.db import migrations
+
+# The search index is not part of the Property model (see propertys.search),
+# so is created with SQL specific to each database.
+
+POSTGRESQL_CREATE = [
+    """
+    ALTER TABLE propertys_property ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(property_name, '')), 'A')
+        || setweight(
+            to_tsvector(
+                'english', street_name || ' ' || locality || ' ' || city
+            ),
+            'B'
+        )
+        || setweight(to_tsvector('english', description), 'C')
+    ) STORED
+    """,
+    """
+    CREATE INDEX property_search_vector_idx ON propertys_property
+    USING gin (search_vector)
+    """,
+]
+POSTGRESQL_DROP = [
+    "DROP INDEX IF EXISTS property_search_vector_idx",
+    "ALTER TABLE propertys_property DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE propertys_property_fts USING fts5(
+        property_name, street_name, locality, city, description,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    INSERT INTO propertys_property_fts (
+        rowid, property_name, street_name, locality, city, description
+    )
+    SELECT
+        id, coalesce(property_name, ''), street_name, locality, city,
+        description
+    FROM propertys_property
+    """,
+]
+SQLITE_DROP = ["DROP TABLE IF EXISTS propertys_property_fts"]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('propertys', '0008_property_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(
+                {"postgresql": POSTGRESQL_CREATE, "sqlite": SQLITE_CREATE}
+            ),
+            run_for_vendor(
+                {"postgresql": POSTGRESQL_DROP, "sqlite": SQLITE_DROP}
+            ),
+        ),
+    ]
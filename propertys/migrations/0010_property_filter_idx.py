@@ -0,0 +1,29 @@
+# Generated by Django 3.2.16 on 2026-10-17 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('propertys', '0009_property_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_sold_stc', False)), fields=['created_at', 'id'], name='property_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_sold_stc', False)), fields=['price', 'id'], name='property_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['property_type', 'created_at'], name='property_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['num_bedrooms', 'price'], name='property_beds_price_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.16 on 2026-10-17 20:50
+
+from django.db import migrations, models
+
+
+def set_geocode_status(apps, schema_editor):
+    """Mark existing properties with a location as geocoded."""
+    Property = apps.get_model("propertys", "Property")
+    Property.objects.filter(
+        latitude__isnull=False, longitude__isnull=False
+    ).update(geocode_status="geocoded")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('propertys', '0010_property_filter_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='geocode_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('geocoded', 'Geocoded'), ('failed', 'Postcode not found')], default='pending', editable=False, max_length=8),
+        ),
+        migrations.RunPython(set_geocode_status, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,61 @@
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Coalesce
+
+from .geohash import encode
+
+
+class PropertyQuerySet(models.QuerySet):
+    """Property QuerySet.
+
+    Prefetch the information the property serializers need, so serializing a
+    page of properties does not query the database for each row.
+    """
+
+    def with_owner_profile(self):
+        """Join the owner and their profile (owner and profile fields)."""
+        return self.select_related("owner__profile")
+
+    def with_bookmark_id(self, user):
+        """Annotate 'bookmark_id', the id of the user's bookmark of each
+        property (None if not bookmarked or the user is anonymous).
+        """
+        if user.is_anonymous:
+            return self.annotate(
+                bookmark_id=models.Value(
+                    None, output_field=models.BigIntegerField()
+                )
+            )
+        Bookmark = self.model._meta.get_field("bookmarks").related_model
+        return self.annotate(
+            bookmark_id=models.Subquery(
+                Bookmark.objects.filter(
+                    owner=user, property=models.OuterRef("pk")
+                ).values("pk")[:1]
+            )
+        )
+
+    def recount_bookmarks(self):
+        """Set the stored 'bookmarks_count' of each property to its number of
+        bookmarks, where they differ.
+
+        Returns:
+            int: Number of properties updated.
+        """
+        Bookmark = self.model._meta.get_field("bookmarks").related_model
+        bookmark_count = Coalesce(
+            models.Subquery(
+                Bookmark.objects.filter(property=models.OuterRef("pk"))
+                .order_by()
+                .values("property")
+                .annotate(count=models.Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+        return self.exclude(bookmarks_count=bookmark_count).update(
+            bookmarks_count=bookmark_count
+        )
 
 
 class Property(models.Model):
@@ -27,6 +83,15 @@ class Property(models.Model):
         ("shared ownership", "Shared ownership"),
     ]
 
+    GEOCODE_PENDING = "pending"
+    GEOCODED = "geocoded"
+    GEOCODE_FAILED = "failed"
+    geocode_status_choices = [
+        (GEOCODE_PENDING, "Pending"),
+        (GEOCODED, "Geocoded"),
+        (GEOCODE_FAILED, "Postcode not found"),
+    ]
+
     council_tax_band_choices = [
         ("", "I don't know"),
         ("a", "A"),
@@ -57,6 +122,11 @@ class Property(models.Model):
     )
     floorplan = models.ImageField(upload_to="images/", blank=True)
     epc = models.ImageField(upload_to="images/", blank=True)
+    # Resized copies of the images (see property_direct_api.images),
+    # generated by a background job when an image is uploaded.
+    image_derivatives = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
     property_type = models.CharField(
         max_length=13, choices=property_type_choices
     )
@@ -73,11 +143,116 @@ class Property(models.Model):
     is_sold_stc = models.BooleanField(default=False)
     latitude = models.FloatField(blank=True, null=True)
     longitude = models.FloatField(blank=True, null=True)
+    # Whether the postcode has been geocoded (see propertys.tasks). Set to
+    # 'geocoded' when saved with a latitude and longitude, and back to
+    # 'pending' if these are cleared (e.g. the postcode changed), so
+    # properties without a location are never in radius searches.
+    geocode_status = models.CharField(
+        max_length=8,
+        choices=geocode_status_choices,
+        default=GEOCODE_PENDING,
+        editable=False,
+    )
+    # Geohash cell containing the property (see propertys.geohash), set from
+    # the latitude and longitude when saved.
+    geohash = models.CharField(
+        max_length=12, blank=True, db_index=True, editable=False
+    )
+    # Number of bookmarks, kept up to date by the bookmarks app signals (see
+    # bookmarks.signals) and repaired with the recount_bookmarks command.
+    bookmarks_count = models.PositiveIntegerField(
+        default=0, db_index=True, editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PropertyQuerySet.as_manager()
+
+    # Image fields with derivatives
+    image_fields = ("image_hero", "floorplan", "epc")
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Bounding box prefilter for radius searches
+            models.Index(
+                fields=["latitude", "longitude"],
+                name="property_lat_lon_idx",
+            ),
+            # Keyset (cursor) pagination orderings (see propertys.pagination)
+            models.Index(
+                fields=["created_at", "id"],
+                name="property_created_at_id_idx",
+            ),
+            models.Index(
+                fields=["price", "id"],
+                name="property_price_id_idx",
+            ),
+            # Common filter combinations (see CustomPropertyFilters), newest
+            # first. Partial indexes on active (not sold STC) listings are
+            # smaller, and match the default browsing of properties for sale.
+            # Garden and parking are not indexed, as they match too many rows
+            # for an index to be cheaper than filtering these.
+            models.Index(
+                fields=["created_at", "id"],
+                name="property_active_created_idx",
+                condition=models.Q(is_sold_stc=False),
+            ),
+            models.Index(
+                fields=["price", "id"],
+                name="property_active_price_idx",
+                condition=models.Q(is_sold_stc=False),
+            ),
+            models.Index(
+                fields=["property_type", "created_at"],
+                name="property_type_created_idx",
+            ),
+            models.Index(
+                fields=["num_bedrooms", "price"],
+                name="property_beds_price_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.street_name, self.locality, self.city, self.postcode}"
+
+    def save(self, *args, **kwargs):
+        self.geohash = self.get_geohash()
+        if self.geohash:
+            self.geocode_status = self.GEOCODED
+        elif self.geocode_status == self.GEOCODED:
+            self.geocode_status = self.GEOCODE_PENDING
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and (
+            {"latitude", "longitude"} & set(update_fields)
+        ):
+            kwargs["update_fields"] = {
+                *update_fields,
+                "geohash",
+                "geocode_status",
+            }
+        super().save(*args, **kwargs)
+
+    def get_geohash(self):
+        """Return the geohash of the property location, or an empty string if
+        the property has not been geocoded.
+        """
+        if self.latitude is None or self.longitude is None:
+            return ""
+        return encode(self.latitude, self.longitude)
+
+
+class Postcode(models.Model):
+    """Postcode Model.
+
+    Local geocoding index of UK postcodes, populated from the ONS Postcode
+    Directory with the 'load_postcodes' management command. Postcodes are
+    stored normalised (upper case with no spaces) as the primary key.
+    """
+
+    postcode = models.CharField(max_length=7, primary_key=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    def __str__(self):
+        return self.postcode
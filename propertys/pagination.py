@@ -0,0 +1,154 @@
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from property_direct_api.pagination import CountOptionalPagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import remove_query_param
+
+
+class PropertyCursorPagination(CursorPagination):
+    """Keyset (cursor) pagination for property lists.
+
+    - Pages are fetched with a WHERE clause on the ordering fields of the last
+      (or first) row of the previous page, rather than an OFFSET, so each
+      page costs the same however deep it is. No total count is returned.
+    - The 'id' is always the final ordering field, so positions are unique
+      and cursors are stable while properties are added or removed.
+    - Cursors are opaque (base64 encoded) and hold the position of a row,
+      not an offset.
+    - Only orderings on fields in 'keyset_fields' are supported; these are
+      backed by composite indexes with 'id' (other than 'distance', which is
+      calculated per search).
+    """
+
+    ordering = ("-created_at",)
+    keyset_fields = ("created_at", "price", "distance")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self.reverse_field(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+
+        if self.cursor is not None:
+            position = self.decode_position(queryset, ordering)
+            queryset = queryset.filter(self.after_position(ordering, position))
+
+        # Fetch one extra row to tell whether there are further pages
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """Return the requested ordering, followed by 'id' as a tie-breaker
+        in the same direction as the last field.
+        """
+        ordering = OrderingFilter().get_ordering(request, queryset, view)
+        ordering = tuple(ordering or self.ordering)
+        for field in ordering:
+            if field.lstrip("-") not in self.keyset_fields:
+                raise ValidationError(
+                    {
+                        "ordering": [
+                            f"Ordering by '{field.lstrip('-')}' is not "
+                            "supported with cursor pagination."
+                        ]
+                    }
+                )
+        id_field = "-id" if ordering[-1].startswith("-") else "id"
+        return ordering + (id_field,)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Paged back past the first row, so the next page is the first
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        position = self.encode_position(self.page[-1])
+        return self.encode_cursor(Cursor(0, False, position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self.encode_position(self.page[0])
+        return self.encode_cursor(Cursor(0, True, position))
+
+    @staticmethod
+    def reverse_field(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def encode_position(self, instance):
+        return json.dumps(
+            [getattr(instance, field.lstrip("-")) for field in self.ordering],
+            # str() keeps the microseconds of datetimes
+            default=str,
+        )
+
+    def decode_position(self, queryset, ordering):
+        """Return the position in the cursor, with values converted to the
+        type of each ordering field.
+        """
+        try:
+            values = json.loads(self.cursor.position)
+            if len(values) != len(ordering):
+                raise ValueError
+            return [
+                self.to_python(queryset, field.lstrip("-"), value)
+                for field, value in zip(ordering, values)
+            ]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def to_python(queryset, field_name, value):
+        if field_name in queryset.query.annotations:
+            return float(value)
+        return queryset.model._meta.get_field(field_name).to_python(value)
+
+    @staticmethod
+    def after_position(ordering, position):
+        """Build the keyset condition for rows after a position.
+
+        For an ordering (a, b, id) this is: a > A, or a = A and b > B, or
+        a = A and b = B and id > ID (with < for descending fields).
+        """
+        condition = Q()
+        equal_to_position = {}
+        for field, value in zip(ordering, position):
+            field_name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(
+                **equal_to_position, **{f"{field_name}__{lookup}": value}
+            )
+            equal_to_position[field_name] = value
+        return condition
+
+
+class PropertyPagination(CountOptionalPagination):
+    """Page number pagination for property lists.
+
+    Large result set counts use the query planner's estimate (or a cached
+    count), as counting every matching property is as costly as the page.
+    """
+
+    count_mode = "estimated"
@@ -0,0 +1,166 @@
+import re
+
+from django.db import NotSupportedError, connections
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+# Full-text keyword search of property listings. The search index depends on
+# the database:
+#
+# - PostgreSQL - A generated 'search_vector' tsvector column on the property
+#   table, with a GIN index (see migration 0009_property_search). The column
+#   is maintained by the database, so is not a field of the Property model.
+# - SQLite - An FTS5 table holding a copy of the searched fields, with the
+#   property id as the rowid. It is kept up to date by the property signals
+#   (see propertys.signals), and rebuilt with the 'rebuild_search_index'
+#   command after bulk changes.
+#
+# Keywords match any of the searched fields (OR semantics, stemmed), and
+# results are ranked by relevance. Other databases are not supported, rather
+# than falling back to a LIKE (icontains) scan.
+
+# Searched fields, in order of weight
+SEARCH_FIELDS = (
+    "property_name",
+    "street_name",
+    "locality",
+    "city",
+    "description",
+)
+FTS_TABLE = "propertys_property_fts"
+# Keywords beyond this are ignored, to bound the cost of a search
+MAX_SEARCH_TERMS = 10
+
+# Relative weights of the searched fields in the SQLite (bm25) rank, in the
+# order of SEARCH_FIELDS. PostgreSQL uses the weight labels A-C set on the
+# search_vector column.
+FTS_FIELD_WEIGHTS = (4.0, 2.0, 2.0, 2.0, 1.0)
+
+
+def search_terms(query):
+    """Split a search query into lower case keywords.
+
+    Args:
+        query (string): Search query entered by a user.
+
+    Returns:
+        list: Up to MAX_SEARCH_TERMS unique keywords (letters and digits
+        only, so they are safe to use in a full-text query).
+    """
+    terms = []
+    for term in re.findall(r"[^\W_]+", query.lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_SEARCH_TERMS]
+
+
+def search(queryset, query):
+    """Filter a property queryset to properties matching any keyword in a
+    search query, annotated with their relevance as 'search_rank' (higher is
+    more relevant).
+
+    Args:
+        queryset (QuerySet): Property queryset to filter.
+        query (string): Search query entered by a user.
+
+    Returns:
+        QuerySet: The filtered and annotated queryset (empty if the query
+        has no keywords).
+
+    Raises:
+        NotSupportedError: The database has no full-text search support.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        ).none()
+
+    table = queryset.model._meta.db_table
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        tsquery = " | ".join(terms)
+        match = RawSQL(
+            f"{table}.search_vector @@ to_tsquery('english', %s)",
+            (tsquery,),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"ts_rank({table}.search_vector, to_tsquery('english', %s))",
+            (tsquery,),
+            output_field=FloatField(),
+        )
+    elif vendor == "sqlite":
+        fts_query = " OR ".join(f'"{term}"' for term in terms)
+        weights = ", ".join(str(weight) for weight in FTS_FIELD_WEIGHTS)
+        match = RawSQL(
+            f"{table}.id IN (SELECT rowid FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s)",
+            (fts_query,),
+            output_field=BooleanField(),
+        )
+        # bm25() is lower for better matches. The rowid constraint lets FTS5
+        # seek to the row within the matches, rather than scanning them.
+        rank = RawSQL(
+            f"(SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id)",
+            (fts_query,),
+            output_field=FloatField(),
+        )
+    else:
+        raise NotSupportedError(
+            f"Property search is not supported on {vendor} databases."
+        )
+    return queryset.filter(match).annotate(search_rank=rank)
+
+
+def uses_search_table(using="default"):
+    """Return whether the search index is a table maintained by the
+    application (SQLite), rather than by the database.
+    """
+    return connections[using].vendor == "sqlite"
+
+
+def index_property(property, using="default"):
+    """Add or update the search index entry of a property (SQLite only)."""
+    if not uses_search_table(using):
+        return
+    values = [getattr(property, field) or "" for field in SEARCH_FIELDS]
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [property.pk]
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+            f"VALUES (%s, {', '.join(['%s'] * len(SEARCH_FIELDS))})",
+            [property.pk, *values],
+        )
+
+
+def unindex_property(pk, using="default"):
+    """Remove a property from the search index (SQLite only)."""
+    if not uses_search_table(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild_search_index(using="default"):
+    """Rebuild the search index from the property table (SQLite only), e.g.
+    after properties were created or updated without model signals.
+
+    Returns:
+        int: Number of properties indexed, or None if the index is maintained
+        by the database.
+    """
+    if not uses_search_table(using):
+        return None
+    columns = ", ".join(SEARCH_FIELDS)
+    coalesced = ", ".join(f"COALESCE({field}, '')" for field in SEARCH_FIELDS)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) "
+            f"SELECT id, {coalesced} FROM propertys_property"
+        )
+        return cursor.rowcount
@@ -1,27 +1,38 @@
-from bookmarks.models import Bookmark
-from haversine import Unit, haversine
-from property_direct_api.exceptions import (
-    ExternalAPIUnavailable,
-    PostCodeInvalid,
+from django.db import models
+from property_direct_api.exceptions import PostCodeInvalid
+from property_direct_api.instrumentation import TimedSerializerMixin
+from property_direct_api.serializers import (
+    ImageDerivativesField,
+    SparseFieldsetSerializerMixin,
+    ValidatedImageField,
 )
-from property_direct_api.utils import validate_image_util
 from rest_framework import serializers
 
 from .models import Property
-from .utils import get_postcode_details
+from .utils import get_known_postcode_details
 
 
-class PropertySerializer(serializers.ModelSerializer):
+class PropertySerializer(
+    TimedSerializerMixin,
+    SparseFieldsetSerializerMixin,
+    serializers.ModelSerializer,
+):
     """Property Serializer.
 
     Used with list view, as distance calculation (performed in
     PropertySearchSerializer) only required for search results.
+
+    Expects a queryset prepared with PropertyQuerySet.with_owner_profile and
+    with_bookmark_id, so no queries are made while serializing.
     """
 
     owner = serializers.ReadOnlyField(source="owner.username")
     is_owner = serializers.SerializerMethodField()
     profile_id = serializers.ReadOnlyField(source="owner.profile.id")
     profile_image = serializers.ReadOnlyField(source="owner.profile.image.url")
+    profile_image_derivatives = ImageDerivativesField(
+        "image", source="owner.profile"
+    )
     profile_telephone_mobile = serializers.ReadOnlyField(
         source="owner.profile.telephone_mobile"
     )
@@ -33,44 +44,63 @@ class PropertySerializer(serializers.ModelSerializer):
     bookmarks_count = serializers.ReadOnlyField()
     longitude = serializers.ReadOnlyField()
     latitude = serializers.ReadOnlyField()
+    image_hero_derivatives = ImageDerivativesField("image_hero")
+    floorplan_derivatives = ImageDerivativesField("floorplan")
+    epc_derivatives = ImageDerivativesField("epc")
+
+    # Uploaded images are validated from their header only (see
+    # ValidatedImageField)
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: ValidatedImageField,
+    }
+
+    # Model attributes read by fields without a model field source (see
+    # SparseFieldsetSerializerMixin)
+    sparse_field_sources = {
+        "is_owner": ["owner_id"],
+        "profile_image_derivatives": [
+            "owner.profile.image",
+            "owner.profile.image_derivatives",
+        ],
+        "bookmark_id": [],
+        "image_hero_derivatives": ["image_hero", "image_derivatives"],
+        "floorplan_derivatives": ["floorplan", "image_derivatives"],
+        "epc_derivatives": ["epc", "image_derivatives"],
+    }
+
+    # Postcode information found during validation (None if the postcode is
+    # not yet known), reused by the views to set the location without
+    # geocoding the postcode again.
+    postcode_details = None
 
     def get_is_owner(self, obj):
         request = self.context["request"]
-        return request.user == obj.owner
+        return request.user.is_authenticated and (
+            request.user.id == obj.owner_id
+        )
 
     def get_bookmark_id(self, obj):
-        user = self.context["request"].user
-        if user.is_authenticated:
-            bookmark = Bookmark.objects.filter(
-                owner=user, property=obj
-            ).first()
-            return bookmark.id if bookmark else None
-        return None
-
-    def validate_image_hero(self, value):
-        valid_image = validate_image_util(value)
-        return valid_image
-
-    def validate_floorplan(self, value):
-        valid_image = validate_image_util(value)
-        return valid_image
-
-    def validate_epc(self, value):
-        valid_image = validate_image_util(value)
-        return valid_image
+        """Return the id of the current user's bookmark of the property.
+
+        Read from the 'bookmark_id' queryset annotation (see
+        PropertyQuerySet.with_bookmark_id), so no query is made per property.
+        Properties without the annotation (e.g. newly created) return None.
+        """
+        return getattr(obj, "bookmark_id", None)
 
     def validate_postcode(self, value):
+        """Validate the postcode format, and find its location if already
+        known. The external API is not called, so a slow or unavailable
+        geocoder does not delay or fail the request; unknown postcodes are
+        geocoded in the background (see propertys.tasks).
+        """
         try:
-            get_postcode_details(value)
+            self.postcode_details = get_known_postcode_details(value)
         except PostCodeInvalid:
             raise serializers.ValidationError(
                 "Please enter a valid UK postcode"
             )
-        except ExternalAPIUnavailable:
-            raise serializers.ValidationError(
-                "Postcode verification service temporarily unavailable, "
-                "please report this and try again later."
-            )
         return value.lower()
 
     class Meta:
@@ -81,6 +111,7 @@ class PropertySerializer(serializers.ModelSerializer):
             "is_owner",
             "profile_id",
             "profile_image",
+            "profile_image_derivatives",
             "property_name",
             "profile_telephone_mobile",
             "profile_telephone_landline",
@@ -93,8 +124,11 @@ class PropertySerializer(serializers.ModelSerializer):
             "description",
             "price",
             "image_hero",
+            "image_hero_derivatives",
             "floorplan",
+            "floorplan_derivatives",
             "epc",
+            "epc_derivatives",
             "property_type",
             "tenure",
             "council_tax_band",
@@ -105,6 +139,7 @@ class PropertySerializer(serializers.ModelSerializer):
             "is_sold_stc",
             "latitude",
             "longitude",
+            "geocode_status",
             "bookmark_id",
             "bookmarks_count",
             "created_at",
@@ -116,37 +151,26 @@ class PropertySerializer(serializers.ModelSerializer):
 class PropertySearchSerializer(PropertySerializer):
     """Property Search Serializer.
 
-    Used with list view when a postcode is provided as a query parameter. Uses
-    the longitude and latitude of 2 points to calculate the distance between
-    them and adds this to the serialized data.
+    Used with list view when a postcode is provided as a query parameter. Adds
+    the distance from the search's point of origin, calculated by the
+    database as a queryset annotation (see PropertyListView), to the
+    serialized data.
     """
 
     distance = serializers.SerializerMethodField()
 
+    sparse_field_sources = {
+        **PropertySerializer.sparse_field_sources,
+        "distance": [],
+    }
+
     def get_distance(self, obj):
-        """Calculate the distance between 2 points (using longitude and
-        latitude)
+        """Return the distance (in miles) annotated by the queryset.
 
-        Make use of the Haversine Formula as implemented in the package
-        "haversine" (https://github.com/mapado/haversine).
+        Returns None if the serializer is used with a queryset that has not
+        been annotated with the distance from a point of origin.
         """
-        # Try / Except Block used defensively in the event a future maintainer
-        # calls the search serializer without also passing point of origin
-        # information to the serializer context.
-        try:
-            point_of_origin_coords = (
-                self.context["point_of_origin_lon"],
-                self.context["point_of_origin_lat"],
-            )
-
-            property_coords = (obj.longitude, obj.latitude)
-
-            distance = haversine(
-                point_of_origin_coords, property_coords, unit=Unit.MILES
-            )
-        except KeyError:
-            return None
-        return distance
+        return getattr(obj, "distance", None)
 
     class Meta:
         model = Property
@@ -0,0 +1,48 @@
+from bookmarks.models import Bookmark
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from followers.models import Follower
+from profiles.models import Profile
+from property_direct_api.images import get_stale_image_fields
+
+from .cache import property_response_cache
+from .models import Property
+from .search import index_property, unindex_property
+from .tasks import generate_image_derivatives
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+@receiver(post_save, sender=Bookmark)
+@receiver(post_delete, sender=Bookmark)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=Follower)
+@receiver(post_delete, sender=Follower)
+def invalidate_property_responses(sender, **kwargs):
+    """Signal to invalidate cached property responses when a Property, or an
+    object included in property responses (Bookmark counts, owner Profile)
+    or changing the property feeds (Follower), is saved or deleted.
+    """
+    property_response_cache.bump_generation()
+
+
+@receiver(post_save, sender=Property)
+def index_property_for_search(sender, instance, using, **kwargs):
+    """Signal to add or update a Property in the search index when saved."""
+    index_property(instance, using=using)
+
+
+@receiver(post_delete, sender=Property)
+def unindex_property_for_search(sender, instance, using, **kwargs):
+    """Signal to remove a Property from the search index when deleted."""
+    unindex_property(instance.pk, using=using)
+
+
+@receiver(post_save, sender=Property)
+def queue_image_derivatives(sender, instance, **kwargs):
+    """Signal to queue the generation of derivatives of a Property's images
+    when saved with new (or cleared) images.
+    """
+    if get_stale_image_fields(instance, Property.image_fields):
+        generate_image_derivatives.enqueue(property_id=instance.pk)
@@ -0,0 +1,87 @@
+from collections import defaultdict
+
+from jobs.registry import task
+from property_direct_api.images import update_image_derivatives
+
+from .cache import property_response_cache
+from .geohash import encode
+from .models import Property
+from .utils import get_postcode_details_bulk
+
+
+def geocode(properties):
+    """Set the location of properties without one from their postcodes,
+    using bulk postcode lookups.
+
+    Properties are updated per postcode, and only while they still have that
+    postcode and no location, so a property whose postcode changed during
+    the lookup is not given the location of its old postcode.
+
+    Args:
+        properties (iterable): Properties (only 'pk' and 'postcode' are
+            used).
+
+    Raises:
+        ExternalAPIUnavailable: Raised when external API unavailable.
+
+    Returns:
+        tuple: Number of properties geocoded, and number whose postcode
+        could not be resolved (marked as failed).
+    """
+    ids_by_postcode = defaultdict(list)
+    for property in properties:
+        ids_by_postcode[property.postcode].append(property.pk)
+    if not ids_by_postcode:
+        return 0, 0
+
+    postcode_details = get_postcode_details_bulk(ids_by_postcode)
+    geocoded_count = 0
+    failed_count = 0
+    for postcode, ids in ids_by_postcode.items():
+        queryset = Property.objects.filter(
+            pk__in=ids, postcode=postcode, latitude__isnull=True
+        )
+        details = postcode_details[postcode]
+        if details is None or details["latitude"] is None:
+            failed_count += queryset.update(
+                geocode_status=Property.GEOCODE_FAILED
+            )
+            continue
+        geocoded_count += queryset.update(
+            latitude=details["latitude"],
+            longitude=details["longitude"],
+            geohash=encode(details["latitude"], details["longitude"]),
+            geocode_status=Property.GEOCODED,
+        )
+    if geocoded_count or failed_count:
+        # update() does not send the signals that invalidate cached property
+        # responses
+        property_response_cache.bump_generation()
+    return geocoded_count, failed_count
+
+
+@task("propertys.geocode_property", batch_size=100, max_attempts=8)
+def geocode_property(payloads):
+    """Geocode properties saved with a postcode that was not yet known
+    (payload: 'property_id'). Lookups for a batch of jobs are made together,
+    and retried if the postcode API is unavailable.
+    """
+    geocode(
+        Property.objects.filter(
+            pk__in=[payload["property_id"] for payload in payloads],
+            geocode_status=Property.GEOCODE_PENDING,
+        ).only("pk", "postcode")
+    )
+
+
+@task("propertys.generate_image_derivatives")
+def generate_image_derivatives(payloads):
+    """Generate the derivatives of a property's uploaded images (payload:
+    'property_id'), see property_direct_api.images.
+    """
+    for payload in payloads:
+        property = Property.objects.filter(pk=payload["property_id"]).first()
+        if property is not None and update_image_derivatives(
+            property, Property.image_fields
+        ):
+            property_response_cache.bump_generation()
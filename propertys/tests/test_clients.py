@@ -0,0 +1,186 @@
+import json
+import threading
+import time
+import unittest.mock as mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase
+from property_direct_api.exceptions import (
+    ExternalAPIUnavailable,
+    PostCodeInvalid,
+)
+
+from ..clients import PostcodeClient
+
+
+class StubPostcodesHandler(BaseHTTPRequestHandler):
+    """Stub postcodes.io request handler.
+
+    - /postcodes/W1A1AA - Returns postcode details.
+    - /postcodes/ZZ11ZZ - Returns postcode not found.
+    - /postcodes/SLOW - Responds after the client read timeout.
+    - /postcodes/ERROR - Returns a server error.
+    - /postcodes/FLAKY - Returns a server error for the first request only.
+    - /postcodes/LIST - Returns a JSON list, rather than an object.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.request_count += 1
+        server.client_ports.add(self.client_address[1])
+        postcode = self.path.rsplit("/", 1)[-1]
+
+        if postcode == "SLOW":
+            time.sleep(0.5)
+            self.send_json(200, {"status": 200, "result": {}})
+        elif postcode == "ERROR" or (
+            postcode == "FLAKY" and server.request_count == 1
+        ):
+            self.send_json(500, {"status": 500, "error": "Server error"})
+        elif postcode == "LIST":
+            self.send_json(200, [])
+        elif postcode in ("W1A1AA", "FLAKY"):
+            self.send_json(
+                200,
+                {
+                    "status": 200,
+                    "result": {
+                        "postcode": "W1A 1AA",
+                        "longitude": -0.143799,
+                        "latitude": 51.518561,
+                    },
+                },
+            )
+        else:
+            self.send_json(404, {"status": 404, "error": "Postcode not found"})
+
+    def send_json(self, status, body):
+        content = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting (read timeout)
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PostcodeClientTests(SimpleTestCase):
+    """Postcode Client Tests (against a local stub HTTP server)"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), StubPostcodesHandler
+        )
+        self.server.request_count = 0
+        self.server.client_ports = set()
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        self.client = PostcodeClient(
+            base_url=f"http://127.0.0.1:{self.server.server_port}",
+            connect_timeout=0.5,
+            read_timeout=0.2,
+            retries=2,
+            retry_backoff=0.01,
+            pool_size=2,
+            failure_threshold=2,
+            reset_timeout=60,
+        )
+
+    def tearDown(self):
+        self.client.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        """Test consecutive requests share a keep-alive connection"""
+        for _ in range(3):
+            result = self.client.get_postcode("W1A1AA")
+        self.assertEqual(result["latitude"], 51.518561)
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_invalid_postcode_raises_postcode_invalid(self):
+        """Test a not found postcode raises PostCodeInvalid without retrying"""
+        with self.assertRaises(PostCodeInvalid):
+            self.client.get_postcode("ZZ11ZZ")
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_transient_server_errors_are_retried(self):
+        """Test a failed request is retried"""
+        result = self.client.get_postcode("FLAKY")
+        self.assertEqual(result["postcode"], "W1A 1AA")
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_slow_responses_time_out(self):
+        """Test a slow response is abandoned after the read timeout and
+        retried a bounded number of times
+        """
+        start = time.monotonic()
+        with self.assertRaises(ExternalAPIUnavailable):
+            self.client.get_postcode("SLOW")
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    def test_circuit_breaker_fails_fast(self):
+        """Test requests fail fast without reaching the API once the circuit
+        breaker opens, and are allowed again after the reset timeout
+        """
+        for _ in range(2):
+            with self.assertRaises(ExternalAPIUnavailable):
+                self.client.get_postcode("ERROR")
+        self.assertEqual(self.server.request_count, 6)
+        self.assertTrue(self.client.circuit_breaker.is_open)
+
+        with self.assertRaises(ExternalAPIUnavailable):
+            self.client.get_postcode("W1A1AA")
+        self.assertEqual(self.server.request_count, 6)
+
+        self.client.circuit_breaker.reset_timeout = 0
+        result = self.client.get_postcode("W1A1AA")
+        self.assertEqual(result["postcode"], "W1A 1AA")
+        self.assertFalse(self.client.circuit_breaker.is_open)
+
+    def test_malformed_responses_are_failures(self):
+        """Test JSON responses that are not objects are retried and recorded
+        as failures, including by a half-open circuit's trial request
+        """
+        for _ in range(2):
+            with self.assertRaises(ExternalAPIUnavailable):
+                self.client.get_postcode("LIST")
+        self.assertEqual(self.server.request_count, 6)
+        self.assertTrue(self.client.circuit_breaker.is_open)
+
+        self.client.circuit_breaker.reset_timeout = 0
+        with self.assertRaises(ExternalAPIUnavailable):
+            self.client.get_postcode("LIST")
+        self.assertFalse(self.client.circuit_breaker.trial_in_progress)
+        result = self.client.get_postcode("W1A1AA")
+        self.assertEqual(result["postcode"], "W1A 1AA")
+        self.assertFalse(self.client.circuit_breaker.is_open)
+
+    def test_unexpected_errors_end_the_trial_request(self):
+        """Test an unexpected exception during a half-open circuit's trial
+        request is recorded as a failure, so later trials are allowed
+        """
+        breaker = self.client.circuit_breaker
+        breaker.opened_at = time.monotonic()
+        breaker.reset_timeout = 0
+        with mock.patch.object(
+            self.client.session, "request", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                self.client.get_postcode("W1A1AA")
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.trial_in_progress)
+        result = self.client.get_postcode("W1A1AA")
+        self.assertEqual(result["postcode"], "W1A 1AA")
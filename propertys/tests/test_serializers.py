@@ -3,15 +3,22 @@ import unittest.mock as mock
 
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
+from jobs.models import Job
 from PIL import Image
 from requests.models import Response
+from rest_framework import status
 from rest_framework.serializers import ValidationError
 from rest_framework.test import APITestCase
 
+from ..cache import postcode_cache
+
 
 class PropertySerializersTests(APITestCase):
     def setUp(self):
 
+        # Clear cached postcode lookups from previous tests
+        postcode_cache.clear()
+
         # Create users
         self.shared_password = "testingPa$$w0rd!"
 
@@ -78,31 +85,29 @@ class PropertySerializersTests(APITestCase):
             "num_bathrooms": 1,
         }
 
-    @mock.patch("requests.get")
-    def test_postcode_validation_failure_response(self, mock_get):
-        """Test Postcode Validation Failure Response Raises Validation Error"""
-        # Mock request to simulate external API call
-        the_response = mock.Mock(spec=Response)
-        the_response.json.return_value = {
-            "status": 404,
-            "error": "Invalid postcode",
-        }
-        mock_get.return_value = the_response
-
+    @mock.patch("requests.Session.request")
+    def test_postcode_validation_failure_response(self, mock_request):
+        """Test Postcode Validation Failure Response Raises Validation Error
+        (without calling the external API)
+        """
         self.client.login(
             username="test_seller", password=self.shared_password
         )
-        response = self.client.post("/property/create/", self.property_obj)
+        response = self.client.post(
+            "/property/create/",
+            {**self.property_obj, "postcode": "12345"},
+        )
         self.assertRaises(ValidationError)
         self.assertEqual(
             "Please enter a valid UK postcode",
             response.data["postcode"][0],
         )
+        mock_request.assert_not_called()
 
-    @mock.patch("requests.get")
-    def test_postcode_validation_api_unavailable_response(self, mock_get):
-        """Test Postcode Validation Service Unavaliable Response Raises
-        Validation Error
+    @mock.patch("requests.Session.request")
+    def test_postcode_validation_api_unavailable_response(self, mock_request):
+        """Test a property is created (and queued for geocoding) while the
+        postcode verification service is unavailable
         """
         # Mock request to simulate external API call
         the_response = mock.Mock(spec=Response)
@@ -110,23 +115,22 @@ class PropertySerializersTests(APITestCase):
             "status": 404,
             "error": "Resource not found",
         }
-        mock_get.return_value = the_response
+        mock_request.return_value = the_response
 
         self.client.login(
             username="test_seller", password=self.shared_password
         )
         response = self.client.post("/property/create/", self.property_obj)
-        self.assertRaises(ValidationError)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["geocode_status"], "pending")
+        self.assertIsNone(response.data["latitude"])
+        mock_request.assert_not_called()
         self.assertEqual(
-            (
-                "Postcode verification service temporarily unavailable, "
-                "please report this and try again later."
-            ),
-            response.data["postcode"][0],
+            Job.objects.get().payload, {"property_id": response.data["id"]}
         )
 
-    @mock.patch("requests.get")
-    def test_image_validation_failure_response(self, mock_get):
+    @mock.patch("requests.Session.request")
+    def test_image_validation_failure_response(self, mock_request):
         """Test oversized images and non-image files produce Validation Failure
         Response
         """
@@ -140,7 +144,7 @@ class PropertySerializersTests(APITestCase):
                 "latitude": 51.518561,
             },
         }
-        mock_get.return_value = the_response
+        mock_request.return_value = the_response
 
         self.client.login(
             username="test_seller", password=self.shared_password
@@ -0,0 +1,309 @@
+import tempfile
+import unittest.mock as mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from property_direct_api.exceptions import PostCodeInvalid, RadiusInvalid
+from requests.models import Response
+
+from ..cache import postcode_cache
+from ..geohash import covering_cells, encode
+from ..models import Postcode, Property
+from ..utils import (
+    convert_radius_to_float,
+    get_postcode_details,
+    get_postcode_details_bulk,
+)
+
+
+class PostcodeLookupTests(TestCase):
+    """Postcode Lookup (Local Geocoding Index) Tests"""
+
+    def setUp(self):
+        postcode_cache.clear()
+        Postcode.objects.create(
+            postcode="W1A1AA", latitude=51.518561, longitude=-0.143799
+        )
+
+    @mock.patch("requests.Session.request")
+    def test_indexed_postcode_is_resolved_locally(self, mock_request):
+        """Test a postcode in the local index is resolved without calling the
+        external API, regardless of case and spacing
+        """
+        postcode_details = get_postcode_details(" w1a1aa ")
+        self.assertEqual(postcode_details["postcode"], "W1A 1AA")
+        self.assertEqual(postcode_details["latitude"], 51.518561)
+        self.assertEqual(postcode_details["longitude"], -0.143799)
+        mock_request.assert_not_called()
+
+    @mock.patch("requests.Session.request")
+    def test_missing_postcode_falls_back_to_external_api(self, mock_request):
+        """Test a postcode missing from the local index is fetched from the
+        external API (mocking postcode API response)
+        """
+        the_response = mock.Mock(spec=Response)
+        the_response.json.return_value = {
+            "status": 200,
+            "result": {
+                "postcode": "W12 7RU",
+                "longitude": -0.223397,
+                "latitude": 51.513735,
+            },
+        }
+        mock_request.return_value = the_response
+
+        postcode_details = get_postcode_details("W12 7RU")
+        self.assertEqual(postcode_details["latitude"], 51.513735)
+        mock_request.assert_called_once()
+
+
+class PostcodeCacheTests(TestCase):
+    """Postcode Lookup Cache Tests"""
+
+    def setUp(self):
+        postcode_cache.clear()
+        postcode_cache.reset_stats()
+
+    @mock.patch("requests.Session.request")
+    def test_repeated_lookups_are_served_from_cache(self, mock_request):
+        """Test a postcode is only fetched from the external API once"""
+        the_response = mock.Mock(spec=Response)
+        the_response.json.return_value = {
+            "status": 200,
+            "result": {
+                "postcode": "W12 7RU",
+                "longitude": -0.223397,
+                "latitude": 51.513735,
+            },
+        }
+        mock_request.return_value = the_response
+
+        get_postcode_details("W12 7RU")
+        postcode_details = get_postcode_details("w127ru")
+        self.assertEqual(postcode_details["longitude"], -0.223397)
+        mock_request.assert_called_once()
+        self.assertEqual(postcode_cache.stats()["hits"], 1)
+        self.assertEqual(postcode_cache.stats()["misses"], 1)
+
+    @mock.patch("requests.Session.request")
+    def test_invalid_postcodes_are_cached(self, mock_request):
+        """Test a postcode found to be invalid is not fetched again"""
+        the_response = mock.Mock(spec=Response)
+        the_response.json.return_value = {
+            "status": 404,
+            "error": "Postcode not found",
+        }
+        mock_request.return_value = the_response
+
+        for _ in range(3):
+            with self.assertRaises(PostCodeInvalid):
+                get_postcode_details("ZZ1 1ZZ")
+        mock_request.assert_called_once()
+        self.assertEqual(postcode_cache.stats()["negative_hits"], 2)
+
+    @mock.patch("requests.Session.request")
+    def test_malformed_postcodes_are_rejected_without_lookup(
+        self, mock_request
+    ):
+        """Test postcodes not in a valid UK format never reach the external
+        API
+        """
+        with self.assertRaises(PostCodeInvalid):
+            get_postcode_details("not a postcode")
+        mock_request.assert_not_called()
+
+    @override_settings(
+        CACHES={
+            "postcodes": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "postcodes-eviction-test",
+                "OPTIONS": {"MAX_ENTRIES": 2, "CULL_FREQUENCY": 2},
+            }
+        }
+    )
+    def test_least_recently_used_postcodes_are_evicted(self):
+        """Test the least recently used entry is evicted and counted once the
+        cache is full
+        """
+        for postcode in ("W1A1AA", "W127RU", "SW1A1AA"):
+            postcode_cache.set(postcode, {"postcode": postcode})
+        self.assertIsNone(postcode_cache.get("W1A1AA"))
+        self.assertIsNotNone(postcode_cache.get("SW1A1AA"))
+        self.assertEqual(postcode_cache.stats()["evictions"], 1)
+
+
+class BulkPostcodeLookupTests(TestCase):
+    """Bulk Postcode Lookup Tests"""
+
+    def setUp(self):
+        postcode_cache.clear()
+        Postcode.objects.create(
+            postcode="W1A1AA", latitude=51.518561, longitude=-0.143799
+        )
+
+        # Mock request to simulate external API bulk lookup
+        self.the_response = mock.Mock(spec=Response)
+        self.the_response.json.return_value = {
+            "status": 200,
+            "result": [
+                {
+                    "query": "W127RU",
+                    "result": {
+                        "postcode": "W12 7RU",
+                        "longitude": -0.223397,
+                        "latitude": 51.513735,
+                    },
+                },
+                {"query": "ZZ11ZZ", "result": None},
+            ],
+        }
+
+    @mock.patch("requests.Session.request")
+    def test_postcodes_are_deduplicated_and_resolved_in_bulk(
+        self, mock_request
+    ):
+        """Test postcodes in the local index are resolved locally and the
+        remaining unique postcodes are fetched in a single request
+        """
+        mock_request.return_value = self.the_response
+
+        postcode_details = get_postcode_details_bulk(
+            ["w1a 1aa", "W12 7RU", "w127ru", "ZZ1 1ZZ", "not a postcode"]
+        )
+        self.assertEqual(postcode_details["w1a 1aa"]["latitude"], 51.518561)
+        self.assertEqual(postcode_details["W12 7RU"]["latitude"], 51.513735)
+        self.assertEqual(postcode_details["w127ru"]["latitude"], 51.513735)
+        self.assertIsNone(postcode_details["ZZ1 1ZZ"])
+        self.assertIsNone(postcode_details["not a postcode"])
+
+        mock_request.assert_called_once()
+        self.assertEqual(
+            sorted(mock_request.call_args.kwargs["json"]["postcodes"]),
+            ["W127RU", "ZZ11ZZ"],
+        )
+
+    @mock.patch("requests.Session.request")
+    def test_geocode_properties_command_backfills_coordinates(
+        self, mock_request
+    ):
+        """Test properties without coordinates are geocoded"""
+        mock_request.return_value = self.the_response
+        test_seller = get_user_model().objects.create_user(
+            username="test_seller", is_seller=True
+        )
+        for postcode in ("W1A 1AA", "W12 7RU", "ZZ1 1ZZ"):
+            Property.objects.create(
+                owner=test_seller,
+                street_name="test street name",
+                locality="test locality",
+                city="test city",
+                postcode=postcode,
+                description="test description",
+                price=100000,
+                property_type="apartment",
+                num_bedrooms=1,
+                num_bathrooms=1,
+            )
+
+        call_command("geocode_properties", stdout=mock.Mock())
+
+        self.assertEqual(
+            Property.objects.get(postcode="W12 7RU").latitude, 51.513735
+        )
+        self.assertEqual(
+            Property.objects.filter(latitude__isnull=True).count(), 1
+        )
+
+
+class GeohashTests(TestCase):
+    """Geohash Encoding and Property Geohash Tests"""
+
+    def test_encode_point(self):
+        """Test a point is encoded to the expected geohash"""
+        self.assertEqual(encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(encode(51.518561, -0.143799), "gcpvh")
+
+    def test_covering_cells_include_every_point_in_bounding_box(self):
+        """Test the cells covering a bounding box include the cell of every
+        point inside it
+        """
+        cells = covering_cells(51.50, 51.60, -0.20, -0.05)
+        for latitude in (51.50, 51.53, 51.57, 51.60):
+            for longitude in (-0.20, -0.13, -0.07, -0.05):
+                self.assertIn(encode(latitude, longitude), cells)
+
+    def test_covering_cells_are_limited(self):
+        """Test None is returned for bounding boxes needing too many cells"""
+        self.assertIsNone(covering_cells(50.0, 53.0, -3.0, 1.0))
+
+    def test_covering_cells_of_huge_bounding_boxes(self):
+        """Test huge and infinite bounding boxes return None without sampling
+        them
+        """
+        with mock.patch("propertys.geohash.sample") as sample:
+            self.assertIsNone(covering_cells(-1e7, 1e7, -1e7, 1e7))
+            self.assertIsNone(
+                covering_cells(
+                    float("-inf"), float("inf"), float("-inf"), float("inf")
+                )
+            )
+        sample.assert_not_called()
+
+    def test_radius_is_validated(self):
+        """Test radii that are not finite numbers within the limit are
+        rejected
+        """
+        self.assertEqual(convert_radius_to_float("1.25"), 1.2)
+        for radius in ("x", "inf", "nan", "-1", "1e12"):
+            with self.assertRaises(RadiusInvalid):
+                convert_radius_to_float(radius)
+
+    def test_property_geohash_is_set_when_saved(self):
+        """Test a property geohash is kept up to date with its location"""
+        test_seller = get_user_model().objects.create_user(
+            username="test_seller", is_seller=True
+        )
+        property = Property.objects.create(
+            owner=test_seller,
+            street_name="test street name",
+            locality="test locality",
+            city="test city",
+            postcode="W1A 1AA",
+            description="test description",
+            price=100000,
+            property_type="apartment",
+            num_bedrooms=1,
+            num_bathrooms=1,
+        )
+        self.assertEqual(property.geohash, "")
+
+        property.latitude = 51.518561
+        property.longitude = -0.143799
+        property.save(update_fields=["latitude", "longitude"])
+        property.refresh_from_db()
+        self.assertEqual(property.geohash, "gcpvh")
+
+
+class LoadPostcodesCommandTests(TestCase):
+    """Load Postcodes Management Command Tests"""
+
+    def test_command_loads_ons_postcode_directory_csv(self):
+        """Test postcodes are loaded from an ONS style CSV file, skipping
+        terminated postcodes and postcodes without a grid reference
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as csv_file:
+            csv_file.write(
+                "pcd,pcds,doterm,lat,long\n"
+                "W1A 1AA,W1A 1AA,,51.518561,-0.143799\n"
+                "W127RU ,W12 7RU,,51.513735,-0.223397\n"
+                "W1A 0AX,W1A 0AX,201001,51.518000,-0.143000\n"
+                "ZZ9 9ZZ,ZZ9 9ZZ,,99.999999,0.000000\n"
+            )
+            csv_file.flush()
+            call_command("load_postcodes", csv_file.name, stdout=mock.Mock())
+
+        self.assertEqual(
+            sorted(Postcode.objects.values_list("postcode", flat=True)),
+            ["W127RU", "W1A1AA"],
+        )
@@ -1,11 +1,20 @@
+import tempfile
 import unittest.mock as mock
 
+from bookmarks.models import Bookmark
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from jobs.models import Job
+from jobs.worker import run_worker
 from requests.models import Response
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from ..models import Property
+from ..cache import postcode_cache, property_response_cache
+from ..filters import CustomPropertyFilters
+from ..models import Postcode, Property
 
 
 class PropertyListViewTests(APITestCase):
@@ -43,12 +52,329 @@ class PropertyListViewTests(APITestCase):
         self.assertEqual(count, 1)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_list_query_count_does_not_grow_with_results(self):
+        """Test the number of queries made to list properties (including
+        owner, profile and bookmark information) does not depend on the
+        number of properties listed
+        """
+        test_user = get_user_model().objects.create_user(
+            username="test_user", password=self.shared_password
+        )
+        self.client.login(username="test_user", password=self.shared_password)
+
+        with CaptureQueriesContext(connection) as single_property_queries:
+            self.client.get("/property/")
+
+        for property in Property.objects.all():
+            Bookmark.objects.create(owner=test_user, property=property)
+        for street_name in ("second", "third", "fourth"):
+            property = Property.objects.create(
+                owner=self.test_seller,
+                street_name=street_name,
+                locality="test locality",
+                city="test city",
+                postcode="test postcode",
+                description="test description",
+                price=100000,
+                property_type="apartment",
+                num_bedrooms=1,
+                num_bathrooms=1,
+            )
+            Bookmark.objects.create(owner=test_user, property=property)
+
+        with CaptureQueriesContext(connection) as many_property_queries:
+            response = self.client.get("/property/")
+
+        self.assertEqual(len(response.data["results"]), 4)
+        self.assertIsNotNone(response.data["results"][0]["bookmark_id"])
+        self.assertEqual(
+            len(many_property_queries), len(single_property_queries)
+        )
+
+    def test_filter_by_profile(self):
+        """Test properties can be filtered by the profile id of their owner,
+        validated without loading every user or profile
+        """
+        url = (
+            "/property/?properties_listed_by_profile="
+            f"{self.test_seller.profile.id}"
+        )
+        with CaptureQueriesContext(connection) as few_users_queries:
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        for number in range(10):
+            get_user_model().objects.create_user(
+                username=f"other_user_{number}",
+                password=self.shared_password,
+            )
+        with CaptureQueriesContext(connection) as many_users_queries:
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(len(many_users_queries), len(few_users_queries))
+        for query in many_users_queries:
+            self.assertNotIn("other_user", str(query))
+
+        other_user = get_user_model().objects.get(username="other_user_0")
+        response = self.client.get(
+            f"/property/?properties_listed_by_profile={other_user.profile.id}"
+        )
+        self.assertEqual(len(response.data["results"]), 0)
+
+    def test_filter_form_does_not_load_profiles(self):
+        """Test rendering the filter form (e.g. in the browsable API) does
+        not load every profile as choices
+        """
+        filterset = CustomPropertyFilters(queryset=Property.objects.all())
+        with CaptureQueriesContext(connection) as queries:
+            html = filterset.form.as_p()
+        self.assertEqual(len(queries), 0)
+        self.assertIn(
+            'type="number" name="properties_listed_by_profile"', html
+        )
+
+        # Bound forms only look up the profile given
+        filterset = CustomPropertyFilters(
+            data={"properties_listed_by_profile": self.test_seller.profile.id},
+            queryset=Property.objects.all(),
+        )
+        with CaptureQueriesContext(connection) as queries:
+            filterset.form.as_p()
+        self.assertEqual(len(queries), 1)
+        self.assertIn('WHERE "profiles_profile"."id" =', queries[0]["sql"])
+
+    def test_filter_by_profile_that_does_not_exist(self):
+        """Test filtering by a profile id that does not exist is rejected"""
+        response = self.client.get("/property/?properties_listed_by_profile=0")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PropertySearchViewTests(APITestCase):
+    """Property Search (List View with postcode and radius) Tests"""
+
+    def setUp(self):
+
+        postcode_cache.clear()
+        Postcode.objects.create(
+            postcode="W1A1AA", latitude=51.518561, longitude=-0.143799
+        )
+
+        # Create Users
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password="testingPa$$w0rd!",
+            is_seller=True,
+        )
+
+        # Create Properties, relative to the search point of origin
+        for street_name, latitude, longitude in [
+            ("near", 51.523561, -0.143799),  # ~0.35 miles
+            ("further", 51.528561, -0.143799),  # ~0.69 miles
+            ("corner", 51.531561, -0.122799),  # ~1.27 miles, in bounding box
+            ("far", 51.618561, -0.143799),  # ~6.9 miles
+        ]:
+            Property.objects.create(
+                owner=self.test_seller,
+                street_name=street_name,
+                locality="test locality",
+                city="test city",
+                postcode="test postcode",
+                description="test description",
+                price=100000,
+                property_type="apartment",
+                num_bedrooms=1,
+                num_bathrooms=1,
+                latitude=latitude,
+                longitude=longitude,
+            )
+
+    def test_search_excludes_properties_outside_radius(self):
+        """Test properties in the corners of the bounding box, but outside of
+        the search radius, are not returned
+        """
+        response = self.client.get(
+            "/property/", {"postcode": "W1A 1AA", "radius": 1}
+        )
+        street_names = {
+            result["street_name"] for result in response.data["results"]
+        }
+        self.assertEqual(street_names, {"near", "further"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_search_can_be_ordered_by_distance(self):
+        """Test search results can be ordered by distance, and include the
+        distance from the search point of origin
+        """
+        response = self.client.get(
+            "/property/",
+            {"postcode": "W1A 1AA", "radius": 10, "ordering": "distance"},
+        )
+        results = response.data["results"]
+        self.assertEqual(
+            [result["street_name"] for result in results],
+            ["near", "further", "corner", "far"],
+        )
+        self.assertAlmostEqual(results[0]["distance"], 0.345, places=2)
+
+    def test_distance_ordering_is_ignored_without_postcode(self):
+        """Test ordering by distance without a postcode (so no distance is
+        calculated) is ignored, with either pagination
+        """
+        for params in ({}, {"pagination": "cursor"}):
+            response = self.client.get(
+                "/property/", {"ordering": "distance", **params}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), 4)
+            self.assertNotIn("distance", response.data["results"][0])
+
+    def test_search_with_invalid_radius(self):
+        """Test searches with an infinite, negative or huge radius are
+        rejected
+        """
+        for radius in ("inf", "-1", "1e12"):
+            response = self.client.get(
+                "/property/", {"postcode": "W1A 1AA", "radius": radius}
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("radius", response.data)
+
+    def test_search_with_large_radius(self):
+        """Test searches covering too many geohash cells return results
+        filtered by bounding box and distance alone
+        """
+        response = self.client.get(
+            "/property/", {"postcode": "W1A 1AA", "radius": 100}
+        )
+        self.assertEqual(response.data["count"], 4)
+
+
+class PropertyKeywordSearchViewTests(APITestCase):
+    """Property Keyword Search (List View with 'q') Tests"""
+
+    def setUp(self):
+
+        postcode_cache.clear()
+        Postcode.objects.create(
+            postcode="W1A1AA", latitude=51.518561, longitude=-0.143799
+        )
+
+        # Create Users
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password="testingPa$$w0rd!",
+            is_seller=True,
+        )
+
+        # Create Properties
+        for street_name, description, price, latitude in [
+            ("mill lane", "Cottage with a large garden", 300000, 51.523561),
+            ("station road", "Flat near the station", 200000, 51.523561),
+            ("high street", "Cottage by the high street", 250000, 51.618561),
+            ("park view", "Apartment overlooking the park", 400000, 51.5236),
+        ]:
+            Property.objects.create(
+                owner=self.test_seller,
+                street_name=street_name,
+                locality="test locality",
+                city="test city",
+                postcode="test postcode",
+                description=description,
+                price=price,
+                property_type="apartment",
+                num_bedrooms=1,
+                num_bathrooms=1,
+                latitude=latitude,
+                longitude=-0.143799,
+            )
+
+    def get_street_names(self, params):
+        response = self.client.get("/property/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [result["street_name"] for result in response.data["results"]]
+
+    def test_search_matches_any_keyword(self):
+        """Test properties matching any keyword are returned"""
+        street_names = self.get_street_names(
+            {"q": "garden cottage near station"}
+        )
+        self.assertCountEqual(
+            street_names, ["mill lane", "station road", "high street"]
+        )
+
+    def test_search_is_ranked_by_relevance(self):
+        """Test properties matching the most keywords are returned first"""
+        self.assertEqual(
+            self.get_street_names({"q": "large garden cottage"}),
+            ["mill lane", "high street"],
+        )
+
+    def test_search_is_stemmed_and_case_insensitive(self):
+        """Test keywords match other forms of the same word"""
+        self.assertEqual(
+            self.get_street_names({"q": "COTTAGES Gardens"})[0], "mill lane"
+        )
+
+    def test_search_composes_with_filters_and_radius(self):
+        """Test keyword search can be combined with the range filters and a
+        radius search
+        """
+        self.assertEqual(
+            self.get_street_names({"q": "cottage", "price_max": 260000}),
+            ["high street"],
+        )
+        self.assertEqual(
+            self.get_street_names(
+                {"q": "cottage", "postcode": "W1A 1AA", "radius": 1}
+            ),
+            ["mill lane"],
+        )
+
+    def test_search_can_be_ordered(self):
+        """Test an ordering replaces the relevance ordering"""
+        self.assertEqual(
+            self.get_street_names(
+                {"q": "cottage station", "ordering": "price"}
+            ),
+            ["station road", "high street", "mill lane"],
+        )
+
+    def test_search_without_keywords_returns_no_results(self):
+        """Test a search with no keywords (only punctuation) matches nothing,
+        while an empty search is ignored
+        """
+        self.assertEqual(self.get_street_names({"q": "!!!"}), [])
+        self.assertEqual(len(self.get_street_names({"q": ""})), 4)
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """Test the search index is updated when properties are updated or
+        deleted
+        """
+        property = Property.objects.get(street_name="park view")
+        property.description = "Cottage overlooking the park"
+        property.save()
+        self.assertIn("park view", self.get_street_names({"q": "cottage"}))
+
+        property.delete()
+        self.assertNotIn("park view", self.get_street_names({"q": "park"}))
+
+    def test_search_does_not_scan_with_like(self):
+        """Test the search uses the full-text index rather than a LIKE scan"""
+        with CaptureQueriesContext(connection) as queries:
+            self.get_street_names({"q": "cottage"})
+        sql = " ".join(query["sql"] for query in queries).upper()
+        self.assertNotIn(" LIKE ", sql)
+        self.assertIn("MATCH", sql)
+
 
 class PropertyCreateViewTests(APITestCase):
     """Property Create View Tests"""
 
     def setUp(self):
 
+        # Clear cached postcode lookups from previous tests
+        postcode_cache.clear()
+
         # Create Users
         self.shared_password = "testingPa$$w0rd!"
 
@@ -83,8 +409,8 @@ class PropertyCreateViewTests(APITestCase):
     # CREDIT: Create a functioning Response object (mocking a response)
     # AUTHOR: jonrsharpe - StackOverflow
     # URL:    https://stackoverflow.com/a/40361593
-    @mock.patch("requests.get")
-    def test_seller_user_can_create_property(self, mock_get):
+    @mock.patch("requests.Session.request")
+    def test_seller_user_can_create_property(self, mock_request):
         """Test a user (seller) can create a property (mocking postcode API
         response)
         """
@@ -98,7 +424,7 @@ class PropertyCreateViewTests(APITestCase):
                 "latitude": 51.518561,
             },
         }
-        mock_get.return_value = the_response
+        mock_request.return_value = the_response
 
         initial_count = Property.objects.count()
         self.client.login(
@@ -121,11 +447,184 @@ class PropertyCreateViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class PropertyGeocodingTests(APITestCase):
+    """Property Background Geocoding Tests"""
+
+    def setUp(self):
+
+        postcode_cache.clear()
+        property_response_cache.clear()
+        Postcode.objects.create(
+            postcode="W1A1AA", latitude=51.518561, longitude=-0.143799
+        )
+
+        self.shared_password = "testingPa$$w0rd!"
+        get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+        self.client.login(
+            username="test_seller", password=self.shared_password
+        )
+
+        self.property_obj = {
+            "street_name": "test street name",
+            "locality": "test locality",
+            "city": "test city",
+            "postcode": "W12 7RU",
+            "description": "test description",
+            "price": 100000,
+            "property_type": "apartment",
+            "num_bedrooms": 1,
+            "num_bathrooms": 1,
+        }
+
+        # Mock response of the postcode API bulk lookup
+        self.the_response = mock.Mock(spec=Response)
+        self.the_response.json.return_value = {
+            "status": 200,
+            "result": [
+                {
+                    "query": "W127RU",
+                    "result": {
+                        "postcode": "W12 7RU",
+                        "longitude": -0.143799,
+                        "latitude": 51.523561,
+                    },
+                }
+            ],
+        }
+
+    def search(self):
+        self.client.logout()
+        response = self.client.get(
+            "/property/", {"postcode": "W1A 1AA", "radius": 1}
+        )
+        return [result["id"] for result in response.data["results"]]
+
+    @mock.patch("requests.Session.request")
+    def test_known_postcode_is_geocoded_on_create(self, mock_request):
+        """Test a property with a postcode in the local index is geocoded
+        without a background job
+        """
+        response = self.client.post(
+            "/property/create/", {**self.property_obj, "postcode": "w1a1aa"}
+        )
+        self.assertEqual(response.data["geocode_status"], "geocoded")
+        self.assertEqual(response.data["latitude"], 51.518561)
+        self.assertFalse(Job.objects.exists())
+        mock_request.assert_not_called()
+
+    @mock.patch("requests.Session.request")
+    def test_unknown_postcode_is_geocoded_by_worker(self, mock_request):
+        """Test a property with an unknown postcode is created without
+        waiting for the postcode API, and appears in radius searches once
+        geocoded by a worker
+        """
+        mock_request.return_value = self.the_response
+        response = self.client.post("/property/create/", self.property_obj)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["geocode_status"], "pending")
+        mock_request.assert_not_called()
+        property_id = response.data["id"]
+        self.assertNotIn(property_id, self.search())
+
+        self.assertEqual(run_worker(once=True), 1)
+        mock_request.assert_called_once()
+        property = Property.objects.get(pk=property_id)
+        self.assertEqual(property.geocode_status, Property.GEOCODED)
+        self.assertEqual(property.latitude, 51.523561)
+        self.assertIn(property_id, self.search())
+        self.assertFalse(Job.objects.exists())
+
+    @mock.patch("requests.Session.request")
+    def test_invalid_postcode_is_marked_as_failed(self, mock_request):
+        """Test a property whose postcode the API cannot resolve is marked
+        as failed (and the job is not retried)
+        """
+        self.the_response.json.return_value["result"][0]["result"] = None
+        mock_request.return_value = self.the_response
+        response = self.client.post("/property/create/", self.property_obj)
+
+        run_worker(once=True)
+        property = Property.objects.get(pk=response.data["id"])
+        self.assertEqual(property.geocode_status, Property.GEOCODE_FAILED)
+        self.assertIsNone(property.latitude)
+        self.assertFalse(Job.objects.exists())
+
+    @mock.patch("requests.Session.request")
+    def test_failed_property_is_geocoded_after_postcode_update(
+        self, mock_request
+    ):
+        """Test a property whose geocoding failed is geocoded again when its
+        postcode is changed to another unknown postcode
+        """
+        self.the_response.json.return_value["result"][0]["result"] = None
+        mock_request.return_value = self.the_response
+        response = self.client.post(
+            "/property/create/", {**self.property_obj, "postcode": "ZZ1 1ZZ"}
+        )
+        property_id = response.data["id"]
+        Property.objects.filter(pk=property_id).update(
+            geocode_status=Property.GEOCODE_FAILED
+        )
+        Job.objects.all().delete()
+
+        self.the_response.json.return_value = {
+            "status": 200,
+            "result": [
+                {
+                    "query": "W127RU",
+                    "result": {
+                        "postcode": "W12 7RU",
+                        "longitude": -0.143799,
+                        "latitude": 51.523561,
+                    },
+                }
+            ],
+        }
+        response = self.client.patch(
+            f"/property/{property_id}/", {"postcode": "W12 7RU"}
+        )
+        self.assertEqual(response.data["geocode_status"], "pending")
+
+        self.assertEqual(run_worker(once=True), 1)
+        mock_request.assert_called_once()
+        property = Property.objects.get(pk=property_id)
+        self.assertEqual(property.geocode_status, Property.GEOCODED)
+        self.assertEqual(property.latitude, 51.523561)
+
+    @mock.patch("requests.Session.request")
+    def test_geocoding_is_retried_when_api_unavailable(self, mock_request):
+        """Test the geocoding job is retried later while the postcode API is
+        unavailable
+        """
+        self.the_response.json.return_value = {
+            "status": 404,
+            "error": "Resource not found",
+        }
+        mock_request.return_value = self.the_response
+        response = self.client.post("/property/create/", self.property_obj)
+
+        with self.assertLogs("jobs.worker", "WARNING"):
+            run_worker(once=True)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("ExternalAPIUnavailable", job.last_error)
+        property = Property.objects.get(pk=response.data["id"])
+        self.assertEqual(property.geocode_status, Property.GEOCODE_PENDING)
+
+
 class PropertyDetailViewTests(APITestCase):
     """Property Retrieve, Update and Deletion Tests"""
 
     def setUp(self):
 
+        # Clear cached postcode lookups from previous tests
+        postcode_cache.clear()
+
         # Create Users
         self.shared_password = "testingPa$$w0rd!"
 
@@ -204,23 +703,28 @@ class PropertyDetailViewTests(APITestCase):
         response = self.client.get("/property/99/")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
-    @mock.patch("requests.get")
-    def test_seller_can_update_own_property_with_put(self, mock_get):
+    @mock.patch("requests.Session.request")
+    def test_seller_can_update_own_property_with_put(self, mock_request):
         """Test a user (seller) can update a property they own using a PUT
-        request (mocking postcode API response which tests postcode details
-        change)
+        request (mocking the postcode API bulk lookup made by the background
+        geocoding job when the postcode changes)
         """
         # Mock request to simulate external API call
         the_response = mock.Mock(spec=Response)
         the_response.json.return_value = {
             "status": 200,
-            "result": {
-                "postcode": "W12 7RU",
-                "longitude": -0.223397,
-                "latitude": 51.513735,
-            },
+            "result": [
+                {
+                    "query": "W127RU",
+                    "result": {
+                        "postcode": "W12 7RU",
+                        "longitude": -0.223397,
+                        "latitude": 51.513735,
+                    },
+                }
+            ],
         }
-        mock_get.return_value = the_response
+        mock_request.return_value = the_response
 
         self.client.login(
             username="test_seller_1", password=self.shared_password
@@ -231,9 +735,17 @@ class PropertyDetailViewTests(APITestCase):
         )
         property = Property.objects.get(pk=self.test_seller_1_property.id)
         self.assertEqual(property.street_name, "test street name, put")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # The new postcode is geocoded in the background
+        self.assertIsNone(property.latitude)
+        self.assertEqual(property.geocode_status, Property.GEOCODE_PENDING)
+        mock_request.assert_not_called()
+        run_worker(once=True)
+        property.refresh_from_db()
         self.assertEqual(property.longitude, -0.223397)
         self.assertEqual(property.latitude, 51.513735)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(property.geocode_status, Property.GEOCODED)
 
     def test_seller_can_update_own_property_with_patch(self):
         """Test a user (seller) can update a property they own using a PATCH
@@ -321,3 +833,566 @@ class PropertyDetailViewTests(APITestCase):
             f"/property/{self.test_seller_1_property.id}/"
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PropertyCursorPaginationTests(APITestCase):
+    """Property List View Cursor Pagination Tests"""
+
+    def setUp(self):
+
+        postcode_cache.clear()
+        Postcode.objects.create(
+            postcode="W1A1AA", latitude=51.518561, longitude=-0.143799
+        )
+
+        # Create Users
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password="testingPa$$w0rd!",
+            is_seller=True,
+        )
+
+        # Create Properties, with repeated prices to test tie-breaking
+        for number in range(25):
+            Property.objects.create(
+                owner=self.test_seller,
+                property_number=number,
+                street_name="test street name",
+                locality="test locality",
+                city="test city",
+                postcode="test postcode",
+                description="test description",
+                price=100000 + 1000 * (number % 3),
+                property_type="apartment",
+                num_bedrooms=1,
+                num_bathrooms=1,
+                latitude=51.518561 + 0.001 * (number % 5),
+                longitude=-0.143799,
+            )
+
+    def get_all_pages(self, params):
+        """Follow 'next' links from the first page, returning the results of
+        each page and the last response
+        """
+        pages = []
+        response = self.client.get(
+            "/property/", {"pagination": "cursor", **params}
+        )
+        pages.append(response.data["results"])
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            pages.append(response.data["results"])
+        return pages, response
+
+    def test_cursor_pages_cover_all_properties_once(self):
+        """Test following cursors returns every property exactly once, in
+        the default (newest first) order
+        """
+        pages, _ = self.get_all_pages({})
+        ids = [result["id"] for page in pages for result in page]
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(
+            ids,
+            list(
+                Property.objects.order_by("-created_at", "-id").values_list(
+                    "id", flat=True
+                )
+            ),
+        )
+
+    def test_cursor_pages_ordered_by_price(self):
+        """Test cursor pagination by a non-unique field (price) does not skip
+        or repeat properties with the same price
+        """
+        pages, _ = self.get_all_pages({"ordering": "price"})
+        ids = [result["id"] for page in pages for result in page]
+        self.assertEqual(
+            ids,
+            list(
+                Property.objects.order_by("price", "id").values_list(
+                    "id", flat=True
+                )
+            ),
+        )
+
+    def test_cursor_pages_ordered_by_distance(self):
+        """Test cursor pagination of a search ordered by distance"""
+        pages, _ = self.get_all_pages(
+            {"postcode": "W1A 1AA", "radius": 10, "ordering": "distance"}
+        )
+        results = [result for page in pages for result in page]
+        self.assertEqual(len({result["id"] for result in results}), 25)
+        distances = [result["distance"] for result in results]
+        self.assertEqual(distances, sorted(distances))
+
+    def test_previous_link_returns_previous_page(self):
+        """Test the previous link of a page returns the page before it"""
+        first_page = self.client.get("/property/", {"pagination": "cursor"})
+        self.assertIsNone(first_page.data["previous"])
+        second_page = self.client.get(first_page.data["next"])
+        previous_page = self.client.get(second_page.data["previous"])
+        self.assertEqual(
+            previous_page.data["results"], first_page.data["results"]
+        )
+        self.assertIsNone(previous_page.data["previous"])
+        self.assertEqual(
+            self.client.get(previous_page.data["next"]).data["results"],
+            second_page.data["results"],
+        )
+
+    def test_unsupported_ordering_is_rejected(self):
+        """Test orderings without a keyset index are rejected"""
+        response = self.client.get(
+            "/property/",
+            {"pagination": "cursor", "ordering": "bookmarks__created_at"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_cursor(self):
+        """Test an invalid cursor returns not found"""
+        response = self.client.get(
+            "/property/", {"pagination": "cursor", "cursor": "invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_is_the_default(self):
+        """Test properties are paginated by page number unless cursor
+        pagination is requested
+        """
+        response = self.client.get("/property/")
+        self.assertEqual(response.data["count"], 25)
+
+
+class PropertyResponseCacheTests(APITestCase):
+    """Property List and Detail View Response Cache Tests"""
+
+    def setUp(self):
+
+        postcode_cache.clear()
+        property_response_cache.clear()
+        property_response_cache.reset_stats()
+        Postcode.objects.create(
+            postcode="W1A1AA", latitude=51.518561, longitude=-0.143799
+        )
+
+        # Create Users
+        self.shared_password = "testingPa$$w0rd!"
+
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+        self.test_user = get_user_model().objects.create_user(
+            username="test_user",
+            password=self.shared_password,
+        )
+
+        # Create Property
+        self.property = Property.objects.create(
+            owner=self.test_seller,
+            street_name="test street name",
+            locality="test locality",
+            city="test city",
+            postcode="W1A 1AA",
+            description="test description",
+            price=100000,
+            property_type="apartment",
+            num_bedrooms=1,
+            num_bathrooms=1,
+            latitude=51.518561,
+            longitude=-0.143799,
+        )
+
+    def test_anonymous_responses_are_cached(self):
+        """Test repeated anonymous requests are served from the cache without
+        querying the database
+        """
+        for url in ("/property/", f"/property/{self.property.id}/"):
+            response = self.client.get(url)
+            self.assertEqual(response["X-Cache"], "MISS")
+            with CaptureQueriesContext(connection) as queries:
+                cached_response = self.client.get(url)
+            self.assertEqual(cached_response["X-Cache"], "HIT")
+            self.assertEqual(cached_response.data, response.data)
+            print(queries.captured_queries)
+            self.assertEqual(len(queries), 0)
+
+        stats = property_response_cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_equivalent_searches_share_a_response(self):
+        """Test searches for the same postcode, formatted differently or with
+        query parameters in a different order, share a cached response
+        """
+        self.client.get("/property/", {"postcode": "W1A 1AA", "radius": 1})
+        response = self.client.get("/property/?radius=1&postcode=w1a1aa")
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(len(response.data["results"]), 1)
+
+        response = self.client.get("/property/?radius=2&postcode=w1a1aa")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_authenticated_responses_are_not_cached(self):
+        """Test responses to authenticated users (including per-user fields)
+        are not cached
+        """
+        self.client.login(username="test_user", password=self.shared_password)
+        self.client.get("/property/")
+        response = self.client.get("/property/")
+        self.assertFalse(response.has_header("X-Cache"))
+
+    def test_errors_are_not_cached(self):
+        """Test unsuccessful responses are not cached"""
+        self.client.get("/property/", {"postcode": "invalid"})
+        response = self.client.get("/property/", {"postcode": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotEqual(response.get("X-Cache"), "HIT")
+
+    def test_bookmark_writes_invalidate_cached_responses(self):
+        """Test creating or deleting a bookmark invalidates cached responses
+        (which include bookmark counts)
+        """
+        url = f"/property/{self.property.id}/"
+        self.client.get(url)
+        bookmark = Bookmark.objects.create(
+            owner=self.test_user, property=self.property
+        )
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["bookmarks_count"], 1)
+
+        bookmark.delete()
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["bookmarks_count"], 0)
+
+    def test_property_writes_invalidate_cached_responses(self):
+        """Test updating or deleting a property invalidates cached
+        responses
+        """
+        self.client.get("/property/")
+        self.property.price = 200000
+        self.property.save()
+        response = self.client.get("/property/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["price"], 200000)
+
+        self.property.delete()
+        response = self.client.get("/property/")
+        self.assertEqual(response.data["results"], [])
+
+    def test_file_based_cache_backend(self):
+        """Test responses can be cached with the file based cache backend"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            caches_setting = {
+                **settings.CACHES,
+                "responses": {
+                    "BACKEND": (
+                        "django.core.cache.backends.filebased.FileBasedCache"
+                    ),
+                    "LOCATION": cache_dir,
+                },
+            }
+            with self.settings(CACHES=caches_setting):
+                self.client.get("/property/")
+                response = self.client.get("/property/")
+                self.assertEqual(response["X-Cache"], "HIT")
+                self.property.save()
+                response = self.client.get("/property/")
+                self.assertEqual(response["X-Cache"], "MISS")
+
+
+class PropertyConditionalGetTests(APITestCase):
+    """Property List and Detail View Conditional GET Tests"""
+
+    def setUp(self):
+
+        property_response_cache.clear()
+
+        # Create Users
+        self.shared_password = "testingPa$$w0rd!"
+
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+        self.test_user = get_user_model().objects.create_user(
+            username="test_user",
+            password=self.shared_password,
+        )
+
+        # Create Property
+        self.property = Property.objects.create(
+            owner=self.test_seller,
+            street_name="test street name",
+            locality="test locality",
+            city="test city",
+            postcode="W1A 1AA",
+            description="test description",
+            price=100000,
+            property_type="apartment",
+            num_bedrooms=1,
+            num_bathrooms=1,
+            latitude=51.518561,
+            longitude=-0.143799,
+        )
+        self.urls = ("/property/", f"/property/{self.property.id}/")
+
+    def test_responses_include_validators(self):
+        """Test list and detail responses include ETag and Last-Modified
+        headers
+        """
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.has_header("ETag"))
+            self.assertTrue(response.has_header("Last-Modified"))
+
+    def test_matching_etag_returns_not_modified(self):
+        """Test a request with a matching If-None-Match header returns 304
+        Not Modified, without a body, for anonymous and authenticated users
+        """
+        for login in (False, True):
+            if login:
+                self.client.login(
+                    username="test_user", password=self.shared_password
+                )
+            for url in self.urls:
+                etag = self.client.get(url)["ETag"]
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(
+                    response.status_code, status.HTTP_304_NOT_MODIFIED
+                )
+                self.assertEqual(response["ETag"], etag)
+                self.assertEqual(response.content, b"")
+
+    def test_not_modified_anonymous_response_makes_no_queries(self):
+        """Test validators for anonymous users need no database queries"""
+        etag = self.client.get("/property/")["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/property/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        print(queries.captured_queries)
+        self.assertEqual(len(queries), 0)
+
+    def test_if_modified_since_returns_not_modified(self):
+        """Test a request with an If-Modified-Since header no earlier than
+        Last-Modified returns 304 Not Modified
+        """
+        for url in self.urls:
+            last_modified = self.client.get(url)["Last-Modified"]
+            response = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_304_NOT_MODIFIED
+            )
+
+    def test_etag_changes_when_property_or_bookmark_changes(self):
+        """Test the ETag changes when a property is updated, or bookmarked
+        (which changes the bookmark count but not the property)
+        """
+        self.client.login(username="test_user", password=self.shared_password)
+        for url in self.urls:
+            etag = self.client.get(url)["ETag"]
+            self.property.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            etag = response["ETag"]
+            bookmark = Bookmark.objects.create(
+                owner=self.test_user, property=self.property
+            )
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            bookmark.delete()
+
+    def test_etag_differs_between_users(self):
+        """Test ETags of responses with per-user fields differ by user"""
+        anonymous_etag = self.client.get("/property/")["ETag"]
+        self.client.login(username="test_user", password=self.shared_password)
+        response = self.client.get(
+            "/property/", HTTP_IF_NONE_MATCH=anonymous_etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], anonymous_etag)
+
+    def test_etag_differs_between_queries(self):
+        """Test ETags differ for different query strings"""
+        etag = self.client.get("/property/")["ETag"]
+        response = self.client.get(
+            "/property/", {"ordering": "price"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class PropertySparseFieldsetTests(APITestCase):
+    """Property List and Detail View Sparse Fieldset Tests"""
+
+    def setUp(self):
+
+        property_response_cache.clear()
+
+        # Create Users
+        self.shared_password = "testingPa$$w0rd!"
+
+        self.test_seller = get_user_model().objects.create_user(
+            username="test_seller",
+            password=self.shared_password,
+            is_seller=True,
+        )
+        self.test_user = get_user_model().objects.create_user(
+            username="test_user",
+            password=self.shared_password,
+        )
+
+        # Create Property
+        self.property = Property.objects.create(
+            owner=self.test_seller,
+            street_name="test street name",
+            locality="test locality",
+            city="test city",
+            postcode="W1A 1AA",
+            description="test description",
+            price=100000,
+            property_type="apartment",
+            num_bedrooms=1,
+            num_bathrooms=1,
+            latitude=51.518561,
+            longitude=-0.143799,
+        )
+        self.bookmark = Bookmark.objects.create(
+            owner=self.test_user, property=self.property
+        )
+
+    def get_list_query(self, params):
+        """Return the first result of a list request, and the SQL of the
+        query listing the properties.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/property/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        (sql,) = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "propertys_property"."id"')
+        ]
+        return response.data["results"][0], sql
+
+    def test_fields_returns_only_the_fields_and_columns_requested(self):
+        """Test only the requested fields are returned, loading only their
+        columns without joining the owner and profile
+        """
+        result, sql = self.get_list_query({"fields": "id,latitude,longitude"})
+        self.assertEqual(
+            result,
+            {
+                "id": self.property.id,
+                "latitude": 51.518561,
+                "longitude": -0.143799,
+            },
+        )
+        self.assertNotIn("description", sql)
+        self.assertNotIn("JOIN", sql)
+
+    def test_omit_returns_all_other_fields(self):
+        """Test omitted fields are not returned or loaded"""
+        result, sql = self.get_list_query(
+            {"omit": "description,profile_email"}
+        )
+        self.assertNotIn("description", result)
+        self.assertNotIn("profile_email", result)
+        self.assertEqual(
+            result["profile_image"], self.test_seller.profile.image.url
+        )
+        self.assertEqual(result["street_name"], "test street name")
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"profiles_profile"."email"', sql)
+        self.assertIn('"profiles_profile"."image"', sql)
+
+    def test_related_and_method_fields_are_joined_only_when_requested(self):
+        """Test fields of the owner's profile join it, and per-user method
+        fields are computed only when requested
+        """
+        self.client.login(username="test_user", password=self.shared_password)
+        result, sql = self.get_list_query(
+            {"fields": "id,profile_id,is_owner,bookmark_id"}
+        )
+        self.assertEqual(
+            result,
+            {
+                "id": self.property.id,
+                "is_owner": False,
+                "profile_id": self.test_seller.profile.id,
+                "bookmark_id": self.bookmark.id,
+            },
+        )
+        self.assertIn("profiles_profile", sql)
+        self.assertNotIn('"accounts_customuser"."username"', sql)
+
+        result, sql = self.get_list_query({"fields": "id,price"})
+        self.assertNotIn("bookmarks_bookmark", sql)
+        self.assertNotIn("JOIN", sql)
+
+    def test_method_fields_not_requested_are_not_called(self):
+        """Test SerializerMethodField methods of unrequested fields are not
+        called
+        """
+        with mock.patch(
+            "propertys.serializers.PropertySerializer.get_is_owner"
+        ) as get_is_owner:
+            self.client.get("/property/", {"fields": "id"})
+            self.client.get(
+                f"/property/{self.property.id}/", {"omit": "is_owner"}
+            )
+        get_is_owner.assert_not_called()
+
+    def test_detail_and_search_fields(self):
+        """Test the detail view and search results (with distance) support
+        sparse fieldsets
+        """
+        response = self.client.get(
+            f"/property/{self.property.id}/", {"fields": "id,owner"}
+        )
+        self.assertEqual(
+            response.data, {"id": self.property.id, "owner": "test_seller"}
+        )
+
+        postcode_cache.clear()
+        Postcode.objects.create(
+            postcode="W1A1AA", latitude=51.518561, longitude=-0.143799
+        )
+        response = self.client.get(
+            "/property/", {"postcode": "W1A 1AA", "fields": "id,distance"}
+        )
+        result = response.data["results"][0]
+        self.assertEqual(set(result), {"id", "distance"})
+        self.assertAlmostEqual(result["distance"], 0)
+
+    def test_unknown_fields_are_rejected(self):
+        """Test unknown field names return 400 Bad Request"""
+        response = self.client.get("/property/", {"fields": "id,unknown"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+        response = self.client.get(
+            f"/property/{self.property.id}/", {"omit": "unknown"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("omit", response.data)
+
+    def test_sparse_fieldsets_do_not_affect_updates(self):
+        """Test updates return all fields, whatever the query parameters"""
+        self.client.login(
+            username="test_seller", password=self.shared_password
+        )
+        response = self.client.patch(
+            f"/property/{self.property.id}/?fields=id",
+            {"price": 200000},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["price"], 200000)
+        self.assertIn("description", response.data)
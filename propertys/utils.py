@@ -1,12 +1,262 @@
-import requests
-from property_direct_api.exceptions import (
-    ExternalAPIUnavailable,
-    PostCodeInvalid,
-    RadiusInvalid,
+import re
+from concurrent.futures import ThreadPoolExecutor
+from math import radians
+
+from django.conf import settings
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import (
+    ASin,
+    Cos,
+    Least,
+    Power,
+    Radians,
+    Sin,
+    Sqrt,
 )
+from property_direct_api.exceptions import PostCodeInvalid, RadiusInvalid
+from property_direct_api.instrumentation import timer
+
+from .cache import INVALID_POSTCODE, postcode_cache
+from .clients import postcode_client
+from .models import Postcode
+
+# UK postcode format (outward code followed by inward code), applied to
+# normalised postcodes.
+POSTCODE_FORMAT = re.compile(r"^[A-Z]{1,2}[0-9][A-Z0-9]?[0-9][A-Z]{2}$")
+
+# Postcode information returned (and cached) by get_postcode_details.
+POSTCODE_DETAIL_FIELDS = ("postcode", "latitude", "longitude")
+
+# Maximum number of postcodes accepted by the external API bulk lookup.
+BULK_LOOKUP_LIMIT = 100
+
+# Maximum number of postcodes looked up in the local index per query (kept
+# below the SQLite query parameter limit).
+LOCAL_LOOKUP_LIMIT = 500
+
+
+def normalize_postcode(postcode):
+    """Normalise a postcode for use as a lookup key.
+
+    Args:
+        postcode (string): Postcode information.
+
+    Returns:
+        string: Postcode in upper case with all whitespace removed.
+    """
+    return "".join(postcode.split()).upper()
+
+
+def format_postcode(postcode):
+    """Format a normalised postcode with a space before the inward code.
+
+    Args:
+        postcode (string): Normalised postcode.
+
+    Returns:
+        string: Postcode formatted for display (e.g. 'W1A 1AA').
+    """
+    return f"{postcode[:-3]} {postcode[-3:]}"
+
+
+def get_local_postcode_details(postcode):
+    """Fetches postcode information from the local geocoding index.
+
+    Args:
+        postcode (string): Postcode information.
+
+    Returns:
+        dict: Postcode information matching the subset of fields used from
+        the external API, or None if the postcode is not in the index.
+    """
+    normalized_postcode = normalize_postcode(postcode)
+    location = (
+        Postcode.objects.filter(pk=normalized_postcode)
+        .values_list("latitude", "longitude")
+        .first()
+    )
+    if location is None:
+        return None
+    return {
+        "postcode": format_postcode(normalized_postcode),
+        "latitude": location[0],
+        "longitude": location[1],
+    }
+
+
+def get_known_postcode_details(postcode):
+    """Fetches postcode information already known, without the external API.
+
+    - Postcodes not in a valid UK format are rejected.
+    - The postcode cache is checked first, including postcodes previously
+      found to be invalid (negative caching).
+    - The local geocoding index (Postcode model) is checked next.
+
+    Args:
+        postcode (string): Postcode information.
+
+    Raises:
+        PostCodeInvalid: Raised when postcode invalid.
+
+    Returns:
+        dict: Postcode information (see POSTCODE_DETAIL_FIELDS), or None if
+        the postcode is not known.
+    """
+    normalized_postcode = normalize_postcode(postcode)
+    if not POSTCODE_FORMAT.match(normalized_postcode):
+        raise PostCodeInvalid
+
+    cached_postcode_details = postcode_cache.get(normalized_postcode)
+    if cached_postcode_details == INVALID_POSTCODE:
+        raise PostCodeInvalid
+    elif cached_postcode_details is not None:
+        return cached_postcode_details
+
+    postcode_details = get_local_postcode_details(normalized_postcode)
+    if postcode_details is not None:
+        postcode_cache.set(normalized_postcode, postcode_details)
+    return postcode_details
 
 
 def get_postcode_details(postcode):
+    """Fetches postcode information (e.g. Longitude, Latitude).
+
+    - Known postcodes are returned without a lookup (see
+      get_known_postcode_details).
+    - Other postcodes are fetched from the external API.
+
+    Args:
+        postcode (string): Postcode information.
+
+    Raises:
+        PostCodeInvalid: Raised when postcode invalid.
+        ExternalAPIUnavailable: Raised when external API unavailable.
+
+    Returns:
+        dict: Postcode information (see POSTCODE_DETAIL_FIELDS).
+    """
+    postcode_details = get_known_postcode_details(postcode)
+    if postcode_details is not None:
+        return postcode_details
+
+    normalized_postcode = normalize_postcode(postcode)
+    try:
+        postcode_details = select_postcode_details(
+            fetch_postcode_details(normalized_postcode)
+        )
+    except PostCodeInvalid:
+        postcode_cache.set_invalid(normalized_postcode)
+        raise
+    postcode_cache.set(normalized_postcode, postcode_details)
+    return postcode_details
+
+
+def get_postcode_details_bulk(postcodes):
+    """Fetches postcode information for many postcodes.
+
+    - Postcodes are de-duplicated after normalisation.
+    - The postcode cache and local geocoding index are checked first.
+    - Remaining postcodes are fetched from the external API bulk lookup in
+      chunks of up to 100, with chunks requested in parallel.
+
+    Args:
+        postcodes (iterable): Postcodes to look up.
+
+    Raises:
+        ExternalAPIUnavailable: Raised when external API unavailable.
+
+    Returns:
+        dict: Postcode information (see POSTCODE_DETAIL_FIELDS) keyed by each
+        postcode as given, or None for invalid postcodes.
+    """
+    postcode_details = {}
+    normalized_postcodes = {}
+    for postcode in postcodes:
+        normalized_postcode = normalize_postcode(postcode)
+        normalized_postcodes[postcode] = normalized_postcode
+        if not POSTCODE_FORMAT.match(normalized_postcode):
+            postcode_details[normalized_postcode] = None
+
+    # Postcode cache
+    remaining = []
+    for normalized_postcode in set(normalized_postcodes.values()):
+        if normalized_postcode in postcode_details:
+            continue
+        cached_postcode_details = postcode_cache.get(normalized_postcode)
+        if cached_postcode_details == INVALID_POSTCODE:
+            postcode_details[normalized_postcode] = None
+        elif cached_postcode_details is not None:
+            postcode_details[normalized_postcode] = cached_postcode_details
+        else:
+            remaining.append(normalized_postcode)
+
+    # Local geocoding index
+    for chunk in chunked(remaining, LOCAL_LOOKUP_LIMIT):
+        for normalized_postcode, latitude, longitude in (
+            Postcode.objects.filter(pk__in=chunk)
+            .values_list("postcode", "latitude", "longitude")
+            .iterator()
+        ):
+            postcode_details[normalized_postcode] = {
+                "postcode": format_postcode(normalized_postcode),
+                "latitude": latitude,
+                "longitude": longitude,
+            }
+            postcode_cache.set(
+                normalized_postcode, postcode_details[normalized_postcode]
+            )
+    remaining = [
+        normalized_postcode
+        for normalized_postcode in remaining
+        if normalized_postcode not in postcode_details
+    ]
+
+    # External API
+    if remaining:
+        # Timed here rather than in the worker threads, which do not share
+        # the request's instrumentation context.
+        with timer("postcode"), ThreadPoolExecutor(
+            max_workers=settings.POSTCODES_API_POOL_SIZE
+        ) as executor:
+            for api_results in executor.map(
+                postcode_client.get_postcodes,
+                chunked(remaining, BULK_LOOKUP_LIMIT),
+            ):
+                for query, api_result in api_results.items():
+                    normalized_postcode = normalize_postcode(query)
+                    if api_result is None:
+                        postcode_details[normalized_postcode] = None
+                        postcode_cache.set_invalid(normalized_postcode)
+                    else:
+                        postcode_details[
+                            normalized_postcode
+                        ] = select_postcode_details(api_result)
+                        postcode_cache.set(
+                            normalized_postcode,
+                            postcode_details[normalized_postcode],
+                        )
+
+    return {
+        postcode: postcode_details.get(normalized_postcode)
+        for postcode, normalized_postcode in normalized_postcodes.items()
+    }
+
+
+def select_postcode_details(api_result):
+    """Select the postcode information used by the API from an external API
+    result.
+    """
+    return {field: api_result[field] for field in POSTCODE_DETAIL_FIELDS}
+
+
+def chunked(items, size):
+    """Split a list into lists of at most 'size' items."""
+    for start in range(0, len(items), size):
+        end = start + size
+        yield items[start:end]
+
+
+def fetch_postcode_details(postcode):
     """Fetches postcode information from external API (e.g. Longitude,
     Latitude).
 
@@ -22,23 +272,45 @@ def get_postcode_details(postcode):
     Returns:
         dict: Postcode information from external API.
     """
-    api_response = requests.get(
-        f"https://api.postcodes.io/postcodes/{postcode}"
-    )
-    response_obj = api_response.json()
+    with timer("postcode"):
+        return postcode_client.get_postcode(postcode)
 
-    if response_obj["status"] == 404 and (
-        response_obj["error"] == "Postcode not found"
-        or response_obj["error"] == "Invalid postcode"
-    ):
-        raise PostCodeInvalid
-    elif (
-        response_obj["status"] == 404
-        and response_obj["error"] == "Resource not found"
-    ):
-        raise ExternalAPIUnavailable
 
-    return response_obj["result"]
+# Earth's mean radius in Miles
+EARTH_RADIUS_MILES = 3958.8
+
+# Largest search radius accepted, in miles (more than covers the UK)
+MAX_SEARCH_RADIUS = 1000
+
+
+def distance_in_miles(latitude, longitude):
+    """Build a database expression for the distance of each property from a
+    point, for use in queryset annotations.
+
+    Uses the Haversine Formula, with the result of the square root capped at 1
+    to guard against floating point rounding for antipodal points.
+
+    Args:
+        latitude (float): Latitude of the point of origin.
+        longitude (float): Longitude of the point of origin.
+
+    Returns:
+        Func: Expression evaluating to the distance in miles.
+    """
+    origin_latitude = Value(radians(latitude), output_field=FloatField())
+    origin_longitude = Value(radians(longitude), output_field=FloatField())
+    delta_latitude = Radians(F("latitude")) - origin_latitude
+    delta_longitude = Radians(F("longitude")) - origin_longitude
+
+    haversine = Power(Sin(delta_latitude / 2), 2) + Cos(origin_latitude) * Cos(
+        Radians(F("latitude"))
+    ) * Power(Sin(delta_longitude / 2), 2)
+
+    return (
+        2
+        * EARTH_RADIUS_MILES
+        * ASin(Least(Sqrt(haversine), Value(1.0, output_field=FloatField())))
+    )
 
 
 def convert_radius_to_float(input_string):
@@ -48,7 +320,8 @@ def convert_radius_to_float(input_string):
         input_string (string): Input parameter.
 
     Raises:
-        RadiusInvalid: Custom API Exception.
+        RadiusInvalid: Custom API Exception, raised when the input is not a
+            number, or not between 0 and MAX_SEARCH_RADIUS (e.g. "inf").
 
     Returns:
         float: Explicitly converted input.
@@ -57,4 +330,14 @@ def convert_radius_to_float(input_string):
         radius_float = round(float(input_string), 1)
     except ValueError:
         raise RadiusInvalid
+    # Not (0 <= radius <= max), so NaN is also rejected
+    if not 0 <= radius_float <= MAX_SEARCH_RADIUS:
+        raise RadiusInvalid(
+            {
+                "radius": [
+                    f"Radius should be between 0 and {MAX_SEARCH_RADIUS} "
+                    "miles"
+                ]
+            }
+        )
     return radius_float
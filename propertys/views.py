@@ -1,7 +1,11 @@
 from math import cos, pi
 
-from django.db.models import Count
 from django_filters.rest_framework import DjangoFilterBackend
+from property_direct_api.mixins import (
+    AnonymousResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsetsMixin,
+)
 from property_direct_api.permissions import IsOwnerOrReadOnly, IsSeller
 from rest_framework.filters import OrderingFilter
 from rest_framework.generics import (
@@ -10,21 +14,42 @@ from rest_framework.generics import (
     RetrieveUpdateDestroyAPIView,
 )
 
+from .cache import property_response_cache
 from .filters import CustomPropertyFilters
+from .geohash import covering_cells
 from .models import Property
+from .pagination import PropertyCursorPagination, PropertyPagination
 from .serializers import PropertySearchSerializer, PropertySerializer
-from .utils import convert_radius_to_float, get_postcode_details
+from .tasks import geocode_property
+from .utils import (
+    EARTH_RADIUS_MILES,
+    convert_radius_to_float,
+    distance_in_miles,
+    get_postcode_details,
+    normalize_postcode,
+)
 
 
-class PropertyListView(ListAPIView):
-    """Property List View"""
+class PropertyListView(
+    ConditionalGetMixin,
+    AnonymousResponseCacheMixin,
+    SparseFieldsetsMixin,
+    ListAPIView,
+):
+    """Property List View
+
+    - Paginated by page number, or by cursor when requested with the
+      'pagination=cursor' query parameter (for infinite scrolling).
+    - Responses to anonymous users are cached (see
+      AnonymousResponseCacheMixin).
+    - Supports conditional requests (see ConditionalGetMixin).
+    - Supports sparse fieldsets (see SparseFieldsetsMixin).
+    """
 
     filter_backends = [OrderingFilter, DjangoFilterBackend]
-    ordering_fields = [
-        "bookmarks_count",
-        "bookmarks__created_at",
-    ]
     filterset_class = CustomPropertyFilters
+    pagination_class = PropertyPagination
+    response_cache = property_response_cache
 
     # Class variables to hold query information
     search_point_of_origin_lat = ""
@@ -37,7 +62,6 @@ class PropertyListView(ListAPIView):
         """Performs initial checks for search functionality
 
         - Checks for query parameters of 'postcode' and 'radius'.
-        - If 'postcode' query parameter is populated, validate and geocode
         - If 'radius' is present, convert to float to validate, otherwise set
           to 0.5
         """
@@ -48,17 +72,6 @@ class PropertyListView(ListAPIView):
         )
         self.query_param_radius = self.request.query_params.get("radius", "")
 
-        # Validate and Geocode Postcode
-        if self.query_param_postcode:
-            query_postcode_details = get_postcode_details(
-                self.query_param_postcode
-            )
-            self.search_point_of_origin_lat = query_postcode_details[
-                "latitude"
-            ]
-            self.search_point_of_origin_lon = query_postcode_details[
-                "longitude"
-            ]
         # Validate or Set Radius
         if self.query_param_radius:
             self.query_param_radius = convert_radius_to_float(
@@ -68,22 +81,64 @@ class PropertyListView(ListAPIView):
             self.query_param_radius = 0.5
         return super().initial(request, *args, **kwargs)
 
+    @property
+    def ordering_fields(self):
+        """Return the fields the list can be ordered by (see OrderingFilter).
+
+        The distance is only annotated by area searches, so is only a valid
+        ordering when a postcode is given; otherwise it is ignored.
+        """
+        ordering_fields = ["bookmarks_count", "bookmarks__created_at", "price"]
+        if self.query_param_postcode:
+            ordering_fields.append("distance")
+        return ordering_fields
+
     def get_queryset(self):
-        """Filters the queryset using a bounding box
+        """Fetch the owner, profile and current user's bookmark of each
+        property with the queryset, so serializing a page makes no further
+        queries. The bookmark is only annotated if 'bookmark_id' is
+        requested.
+        """
+        queryset = self.get_search_queryset().with_owner_profile()
+        if self.is_field_requested("bookmark_id"):
+            queryset = queryset.with_bookmark_id(self.request.user)
+        return queryset
+
+    def get_validator_queryset(self):
+        """Return the properties matching the search and filters."""
+        return self.filter_queryset(self.get_search_queryset())
+
+    def get_search_queryset(self):
+        """Filters the queryset using a bounding box and exact distance
 
         If a 'postcode' and 'radius' are supplied as query parameters, the
         minimum and maximum longitude and latitude are calculated to form a
-        bounding box. This is then used to filter property objects and form the
-        queryset.
+        bounding box. The geohash cells covering the bounding box and the
+        bounding box itself are then used to filter property objects, before
+        the distance of each is calculated by the database and used to exclude
+        properties outside of the radius (the corners of the bounding box).
+
+        The postcode is validated and geocoded here, rather than in initial(),
+        so responses served from the cache need no postcode lookup.
         """
 
         if self.query_param_postcode:
+            query_postcode_details = get_postcode_details(
+                self.query_param_postcode
+            )
+            self.search_point_of_origin_lat = query_postcode_details[
+                "latitude"
+            ]
+            self.search_point_of_origin_lon = query_postcode_details[
+                "longitude"
+            ]
+
             # CREDIT: Adapted from "Selecting points within a bounding
             #         circle"
             # AUTHOR: Chris Veness
             # URL:    https://www.movable-type.co.uk/scripts/latlong-db.html
 
-            R = 3958.8  # Earth's mean radius in Miles
+            R = EARTH_RADIUS_MILES
 
             search_area_min_lat = self.search_point_of_origin_lat - (
                 self.query_param_radius / R * 180 / pi
@@ -106,46 +161,70 @@ class PropertyListView(ListAPIView):
                 / cos(self.search_point_of_origin_lat * pi / 180)
             )
 
+            # The geohash cells covering the bounding box (indexed) narrow the
+            # candidates, which are then filtered by the bounding box and
+            # their exact distance from the point of origin.
+            queryset = Property.objects.all()
+            search_area_cells = covering_cells(
+                search_area_min_lat,
+                search_area_max_lat,
+                search_area_min_lon,
+                search_area_max_lon,
+            )
+            if search_area_cells is not None:
+                queryset = queryset.filter(geohash__in=search_area_cells)
+
             queryset = (
-                Property.objects.filter(
+                queryset.filter(
                     latitude__gte=search_area_min_lat,
                     latitude__lte=search_area_max_lat,
                     longitude__gte=search_area_min_lon,
                     longitude__lte=search_area_max_lon,
                 )
                 .annotate(
-                    bookmarks_count=Count("bookmarks", distinct=True),
+                    distance=distance_in_miles(
+                        self.search_point_of_origin_lat,
+                        self.search_point_of_origin_lon,
+                    )
                 )
+                .filter(distance__lte=self.query_param_radius)
                 .order_by("-created_at")
             )
         else:
-            queryset = Property.objects.annotate(
-                bookmarks_count=Count("bookmarks", distinct=True),
-            ).order_by("-created_at")
+            queryset = Property.objects.order_by("-created_at")
         return queryset
 
-    # CREDIT: Adapted from Pass extra arguments to Serializer Class in Django
-    #         Rest Framework.
-    # AUTHOR: M.Void - StackOverflow
-    # URL:    https://stackoverflow.com/a/38723709
-    def get_serializer_context(self):
-        """Update the context passed to the serializer.
+    def get_response_cache_params(self):
+        """Return the query parameters identifying a cached response, with
+        the postcode normalised so equivalent searches share a response.
+        """
+        return [
+            (
+                name,
+                [normalize_postcode(value) for value in values]
+                if name == "postcode"
+                else values,
+            )
+            for name, values in super().get_response_cache_params()
+        ]
 
-        Include the longitude and latitude of the search's point of origin
-        (POO), so the distance from the POO can be calculated for each object
-        in the serializer.
+    @property
+    def paginator(self):
+        """Return the paginator instance, using cursor pagination if
+        requested.
         """
-        context = super(PropertyListView, self).get_serializer_context()
-        if self.query_param_postcode:
-            context["point_of_origin_lat"] = self.search_point_of_origin_lat
-            context["point_of_origin_lon"] = self.search_point_of_origin_lon
-        return context
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = PropertyCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_serializer_class(self, *args, **kwargs):
         """Return serializer class to be used.
 
         If query parameters exist for an area search, then use the serializer
-        that calculates distance from the search's point of origin.
+        that includes the distance from the search's point of origin.
         """
         if bool(self.query_param_postcode):
             serializer_class = PropertySearchSerializer  # inc distance
@@ -168,38 +247,64 @@ class PropertyCreateView(CreateAPIView):
     def perform_create(self, serializer):
         """Add extra information before the object is saved (created).
 
-        - Fetch postcode information and add the Longitude and Latitude
-          of the postcode before the model object is created.
+        - Add the Longitude and Latitude of the postcode before the model
+          object is created, if the postcode is already known (found when
+          the postcode was validated). Otherwise the property is saved
+          without a location, and geocoded in the background.
         - Add an owner before the model object is created.
         """
-        postcode = serializer.validated_data["postcode"]
-        postcode_details = get_postcode_details(postcode)
-        latitude = postcode_details["latitude"]
-        longitude = postcode_details["longitude"]
-        serializer.save(
-            owner=self.request.user, latitude=latitude, longitude=longitude
-        )
+        postcode_details = serializer.postcode_details
+        if postcode_details is None:
+            property = serializer.save(owner=self.request.user)
+            geocode_property.enqueue(property_id=property.pk)
+        else:
+            serializer.save(
+                owner=self.request.user,
+                latitude=postcode_details["latitude"],
+                longitude=postcode_details["longitude"],
+            )
 
 
-class PropertyDetailView(RetrieveUpdateDestroyAPIView):
+class PropertyDetailView(
+    ConditionalGetMixin,
+    AnonymousResponseCacheMixin,
+    SparseFieldsetsMixin,
+    RetrieveUpdateDestroyAPIView,
+):
     """Property Detail (Retrieve, Update and Destroy) View
 
     - Retrieve a property by id and allow the owner to update or delete the
       object.
+    - Responses to anonymous users are cached (see
+      AnonymousResponseCacheMixin).
+    - Supports conditional requests (see ConditionalGetMixin).
+    - Supports sparse fieldsets (see SparseFieldsetsMixin).
     """
 
     serializer_class = PropertySerializer
     permission_classes = [IsOwnerOrReadOnly]
-    queryset = Property.objects.annotate(
-        bookmarks_count=Count("bookmarks", distinct=True),
-    ).order_by("-created_at")
+    response_cache = property_response_cache
+
+    def get_validator_queryset(self):
+        return Property.objects.filter(pk=self.kwargs["pk"])
+
+    def get_queryset(self):
+        """Fetch the owner, profile and current user's bookmark (if
+        requested) with the property.
+        """
+        queryset = Property.objects.with_owner_profile()
+        if self.is_field_requested("bookmark_id"):
+            queryset = queryset.with_bookmark_id(self.request.user)
+        return queryset.order_by("-created_at")
 
     def perform_update(self, serializer):
         """Add extra information before the object is saved (updated).
 
-        - Fetch postcode information and add the Longitude and Latitude of the
-          postcode to the model object instance, if the postcode has been
-          updated.
+        - If the postcode has been updated, add the Longitude and Latitude of
+          the postcode to the model object instance if the postcode is
+          already known. Otherwise the location is cleared (so the property
+          is not found at its old location) and the property is marked as
+          pending and geocoded in the background.
         - If KeyError then PATCH request rather than PUT 'postcode' not updated
           rather than PUT
         """
@@ -215,7 +320,16 @@ class PropertyDetailView(RetrieveUpdateDestroyAPIView):
             # the property objects current postcode, a change has been made and
             # the longitude and latitude should be updated.
             if updated_postcode != obj.postcode:
-                result = get_postcode_details(updated_postcode)
+                result = serializer.postcode_details
+                if result is None:
+                    # Pending whatever the previous status (e.g. failed), as
+                    # the geocoding job only geocodes pending properties
+                    obj.latitude = None
+                    obj.longitude = None
+                    obj.geocode_status = Property.GEOCODE_PENDING
+                    serializer.save()
+                    geocode_property.enqueue(property_id=obj.pk)
+                    return
                 obj.latitude = result["latitude"]
                 obj.longitude = result["longitude"]
             serializer.save()